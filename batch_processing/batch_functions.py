@@ -0,0 +1,184 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+import numpy as np
+
+from ..las_io import (
+    OUTPUT_SUFFIXES, PARTIAL_MARKER, filter_points, is_derived_output, read_header, read_las, write_las
+)
+from ..memory_planner import estimate_footprint
+from ..processing_pipeline.pipeline_functions import run_pipeline
+from ..tile_index import LIDAR_EXTENSIONS
+
+# -------------------------------------
+# --- Batch Processing (Processing) ---
+# -------------------------------------
+
+MANIFEST_NAME = "mylidar_batch.json"
+COMMANDS = ("outliers", "overlap", "vegetation")
+DONE = "done"
+FAILED = "failed"
+
+def batch_inputs(folder):
+    """
+    Every LAS/LAZ of the folder, except the outputs of the batch and of the
+    interactive commands saved beside their inputs, and partial outputs.
+    """
+    return [
+        os.path.join(folder, name) for name in sorted(os.listdir(folder))
+        if name.lower().endswith(LIDAR_EXTENSIONS) and not is_derived_output(name)
+    ]
+
+def _stem(name):
+    for suffix in (".copc.laz", ".laz", ".las"):
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def output_path_for(path, output_dir, command):
+    return os.path.join(output_dir, f"{_stem(os.path.basename(path))}{OUTPUT_SUFFIXES[command]}.laz")
+
+def file_checksum(path, block_size=8 * 1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def process_tile(path, output_path, command, params, options=None):
+    """
+    Run one command over a whole tile, in a worker process. `params` is the
+    (radius, min_neighbors) or (low_thresh, high_thresh) pair of the outlier
+    and vegetation commands, None for the overlap removal. The output is written next to its final name and renamed once
+    complete, so an interrupted run never leaves a truncated tile behind.
+    Returns the tile record of the manifest.
+    """
+    las = read_las(path)
+    keep, summary = run_pipeline(
+        las,
+        outliers=params if command == "outliers" else None,
+        overlap=command == "overlap",
+        vegetation=params if command == "vegetation" else None,
+    )
+    num_kept = int(np.count_nonzero(keep))
+    if num_kept == 0:
+        raise ValueError("All points were removed — no data would remain.")
+    result = filter_points(las, keep) if num_kept < len(keep) else las
+
+    root, extension = os.path.splitext(output_path)
+    partial_path = f"{root}{PARTIAL_MARKER}{extension.lstrip('.')}"
+    write_las(result, partial_path, options)
+    os.replace(partial_path, output_path)
+    return {
+        "points_in": len(keep),
+        "points_out": num_kept,
+        "summary": summary,
+        "output": os.path.basename(output_path),
+        "sha256": file_checksum(output_path),
+    }
+
+class BatchManifest:
+    """
+    Status of every tile of a batch run, kept as JSON in the output folder
+    and rewritten atomically after each tile, so a crash loses at most the
+    tiles in flight. A tile is complete when its record was made with the same
+    command and parameters and its output still has the recorded checksum.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.tiles = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.tiles = json.load(f).get("tiles", {})
+
+    def is_complete(self, path, command, params, output_path, verify=True):
+        record = self.tiles.get(os.path.basename(path))
+        if record is None or record.get("status") != DONE:
+            return False
+        if record.get("command") != command or record.get("params") != _json_params(params):
+            return False
+        if not os.path.exists(output_path):
+            return False
+        return not verify or file_checksum(output_path) == record.get("sha256")
+
+    def record(self, path, command, params, status, **fields):
+        self.tiles[os.path.basename(path)] = {
+            "status": status,
+            "command": command,
+            "params": _json_params(params),
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **fields,
+        }
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tiles": self.tiles}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def _json_params(params):
+    # Tuples become lists in JSON, compare the parameters in their JSON form
+    return json.loads(json.dumps(params))
+
+def batch_workers(paths, command, budget):
+    """Worker processes whose largest tiles fit in the memory budget together, at least one."""
+    if not paths:
+        return 1
+    largest = max(estimate_footprint(read_header(path), command) for path in paths)
+    return int(max(1, min(os.cpu_count() or 1, len(paths), budget // max(largest, 1))))
+
+def _process_context():
+    # Inside QGIS sys.executable is the application, workers need the bundled interpreter
+    context = multiprocessing.get_context("spawn")
+    if os.path.basename(sys.executable).lower().startswith("qgis"):
+        for name in ("pythonw.exe", "python.exe", "python3", "python"):
+            candidate = os.path.join(sys.exec_prefix, name)
+            if os.path.exists(candidate):
+                context.set_executable(candidate)
+                break
+    return context
+
+def run_batch(paths, output_dir, command, params, options=None, workers=1, verify=True, on_progress=None):
+    """
+    Process `paths` on a pool of `workers` processes, skipping the tiles the
+    manifest records as complete. `on_progress(done, total)` is called as
+    tiles finish. Returns the manifest and the lists of processed, skipped
+    and failed tile paths.
+    """
+    manifest = BatchManifest(output_dir)
+    pending_paths = []
+    skipped = []
+    for path in paths:
+        if manifest.is_complete(path, command, params, output_path_for(path, output_dir, command), verify):
+            skipped.append(path)
+        else:
+            pending_paths.append(path)
+
+    processed, failed = [], []
+    total = len(pending_paths)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_process_context()) as executor:
+        futures = {
+            executor.submit(process_tile, path, output_path_for(path, output_dir, command), command, params, options): path
+            for path in pending_paths
+        }
+        remaining = set(futures)
+        while remaining:
+            done, remaining = wait(remaining, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = futures[future]
+                try:
+                    manifest.record(path, command, params, DONE, **future.result())
+                    processed.append(path)
+                except Exception as e:
+                    manifest.record(path, command, params, FAILED, error=str(e))
+                    failed.append(path)
+            if on_progress is not None:
+                on_progress(len(processed) + len(failed), total)
+    return manifest, processed, skipped, failed
@@ -0,0 +1,90 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from .batch_processing_dialog import BatchProcessingDialog
+from .batch_functions import batch_inputs, batch_workers, run_batch
+
+# ------------------------
+# --- Batch Processing ---
+# ------------------------
+
+COMMAND_NAMES = {"outliers": "Outlier removal", "overlap": "Overlap removal", "vegetation": "Vegetation classification"}
+
+def run_batch_processing(self):
+    input_dir = QFileDialog.getExistingDirectory(
+        self.iface.mainWindow(),
+        'Select Folder of LiDAR Tiles to Process'
+    )
+    if not input_dir:
+        return
+
+    dialog = BatchProcessingDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    command, params = dialog.get_command()
+    workers = dialog.get_workers()
+    verify = dialog.verify_checksums()
+
+    # Rerunning into the same output folder resumes the batch from its manifest
+    output_dir = QFileDialog.getExistingDirectory(
+        self.iface.mainWindow(),
+        'Select Output Folder (an interrupted batch resumes in its folder)',
+        input_dir
+    )
+    if not output_dir:
+        return
+
+    paths = batch_inputs(input_dir)
+    if not paths:
+        QMessageBox.warning(self.iface.mainWindow(), "No Tiles Found", "No LAS/LAZ files found in the selected folder.")
+        return
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Batch Processing")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        # Every process holds a whole tile, the count is bounded by the memory budget unless set by hand
+        workers = workers or batch_workers(paths, command, self.memory_budget)
+        with profiler.stage(f"{COMMAND_NAMES[command]} on {len(paths)} tiles"):
+            manifest, processed, skipped, failed = run_batch(
+                paths, output_dir, command, params, self.output_options, workers, verify,
+                on_progress=lambda done, total: QApplication.processEvents()
+            )
+
+        failures = "".join(
+            f"\n  {os.path.basename(path)}: {manifest.tiles[os.path.basename(path)]['error']}" for path in failed
+        )
+        message = (
+            f"{COMMAND_NAMES[command]} on {len(paths):,} tiles with {workers} worker processes\n\n"
+            f"Processed: {len(processed):,}\n"
+            f"Skipped (already complete): {len(skipped):,}\n"
+            f"Failed: {len(failed):,}{failures}\n\n"
+            f"Outputs saved to:\n{output_dir}\n\n"
+            f"Manifest:\n{manifest.path}"
+        )
+        if failed:
+            QMessageBox.warning(self.iface.mainWindow(), "Batch Completed With Errors", message + "\n\nRun the batch again to retry the failed tiles.")
+        else:
+            QMessageBox.information(self.iface.mainWindow(), "Batch Complete", message)
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Batch Processing",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
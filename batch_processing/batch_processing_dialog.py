@@ -0,0 +1,32 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './batch_processing_form.ui'))
+
+class BatchProcessingDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.radioOutliers.toggled.connect(self.groupOutliers.setEnabled)
+        self.radioVegetation.toggled.connect(self.groupVegetation.setEnabled)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_command(self):
+        # The command and its fixed parameters, applied to every tile
+        if self.radioOutliers.isChecked():
+            return "outliers", (self.spinRadius.value(), self.spinMinNeighbors.value())
+        if self.radioVegetation.isChecked():
+            return "vegetation", (self.spinLow.value(), self.spinHigh.value())
+        return "overlap", None
+
+    def get_workers(self):
+        # None lets the memory budget decide
+        return self.spinWorkers.value() or None
+
+    def verify_checksums(self):
+        return self.checkVerify.isChecked()
@@ -1,15 +1,23 @@
-from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtWidgets import QApplication, QMessageBox
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtTest import QTest
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
 import numpy as np
 from sklearn.cluster import DBSCAN
 
 from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import local_coords, read_header, read_las
+from ..memory_planner import IN_MEMORY, plan_clustering, plan_execution
+from ..processing_region.processing_region import region_for_file
+from ..tile_index import load_adjacent_points
 from .building_count_dialog import BuildingParamsDialog
+from .building_sweep_dialog import BuildingSweepDialog
+from .building_functions import (
+    BUILDING_CLASS, TILE_BUFFER, BuildingSweepModel, cluster_centroids, count_clusters_tiled, in_bounds,
+    read_class_xy
+)
 
 # ---------------------
 # --- Builing Count ---
@@ -30,8 +38,12 @@ def count_buildings(self):
         return
 
     eps, min_samples = param_dialog.get_params()
+    tile_buffer = param_dialog.get_tile_buffer()
+    sweep = param_dialog.get_sweep()
 
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Building Count")
+    self.last_profiler = profiler
 
     try:
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -39,14 +51,26 @@ def count_buildings(self):
         QApplication.processEvents()
         QTest.qWait(100)
 
-        las = laspy.read(filename, laz_backend=LazBackend.Lazrs)
-
-        # Filter building-classified points
-        building_class_code = 6
-        classifications = las.classification
-        is_building = classifications == building_class_code
-
-        if np.sum(is_building) == 0:
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        plan = plan_execution(header, "buildings", self.memory_budget)
+
+        if plan.strategy == IN_MEMORY:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las = read_las(filename, region)
+                stage.points = len(las.points)
+
+            # Filter building-classified points
+            is_building = las.classification == BUILDING_CLASS
+            num_building = int(np.count_nonzero(is_building))
+        else:
+            # Only the building XY is kept while reading
+            with profiler.stage("Read building points") as stage:
+                coords, origin = read_class_xy(filename, BUILDING_CLASS, region, plan.chunk_size)
+                stage.points = len(coords)
+            num_building = len(coords)
+
+        if num_building == 0:
             QMessageBox.information(
                 self.iface.mainWindow(),
                 "No Buildings Found",
@@ -54,21 +78,89 @@ def count_buildings(self):
             )
             return
 
-        # Extract X and Y for clustering
-        coords = np.vstack((las.x[is_building], las.y[is_building])).T
+        if plan.strategy == IN_MEMORY:
+            # Extract X and Y for clustering, relative to a local origin and scaled from the selected integers only
+            with profiler.stage("Extract building points", points=num_building):
+                coords, origin = local_coords(las, "xy", mask=is_building)
 
-        # DBSCAN clustering
-        db = DBSCAN(eps=eps, min_samples=min_samples).fit(coords)
-        labels = db.labels_
+        # The tile owns the clusters whose centroid lies within its file bounds, whichever way it was read
+        tile_bounds = (
+            header.x_min - origin[0], header.y_min - origin[1],
+            header.x_max - origin[0], header.y_max - origin[1]
+        )
 
-        # Count clusters (excluding noise points labeled -1)
-        num_buildings = len(set(labels)) - (1 if -1 in labels else 0)
+        if tile_buffer is not None:
+            # Building points of neighboring tiles, so buildings cut by the tile edge form a single cluster
+            with profiler.stage("Read adjacent tiles") as stage:
+                buffer_coords, _ = load_adjacent_points(filename, tile_buffer, classes={BUILDING_CLASS})
+                stage.points = len(buffer_coords)
+            coords = np.vstack((coords, buffer_coords[:, :2] - origin))
+
+        # DBSCAN neighborhoods grow with the density, so clustering gets its own plan
+        cluster_bounds = (*coords.min(axis=0), *coords.max(axis=0))
+        count_bounds = tile_bounds if tile_buffer is not None else None
+        model = None
+        sweep_note = ""
+
+        if sweep is not None:
+            eps_values, min_samples_values = sweep
+            # The neighbor graph of the largest eps serves every parameter pair of the sweep
+            sweep_plan = plan_clustering(len(coords), cluster_bounds, eps_values[-1], self.memory_budget)
+            if sweep_plan.strategy == IN_MEMORY:
+                with profiler.stage("Build sweep neighbor graph", points=len(coords)):
+                    model = BuildingSweepModel(coords, eps_values[-1])
+                with profiler.stage("Parameter sweep", points=len(coords)):
+                    counts = model.sweep(eps_values, min_samples_values, count_bounds)
+
+                loading_dialog.hide()
+                QApplication.restoreOverrideCursor()
+                sweep_dialog = BuildingSweepDialog(
+                    model, eps_values, min_samples_values, counts, eps, min_samples, count_bounds,
+                    self.iface.mainWindow()
+                )
+                accepted = sweep_dialog.exec_() == QDialog.Accepted
+                QApplication.setOverrideCursor(Qt.WaitCursor)
+                if not accepted:
+                    return
+                eps, min_samples = sweep_dialog.get_params()
+                loading_dialog.show()
+                QApplication.processEvents()
+            else:
+                sweep_note = "The parameter sweep needs in-memory clustering at its largest epsilon and was skipped.\n"
+
+        if model is not None:
+            # The sweep graph already holds every neighborhood of the chosen eps: no DBSCAN run needed
+            cluster_plan = sweep_plan
+            with profiler.stage("Count clusters", points=len(coords)):
+                num_buildings = model.count(eps, min_samples, count_bounds)
+        else:
+            cluster_plan = plan_clustering(len(coords), cluster_bounds, eps, self.memory_budget, TILE_BUFFER)
+            if cluster_plan.strategy != IN_MEMORY:
+                with profiler.stage("DBSCAN (tiled)", points=len(coords)):
+                    num_buildings = count_clusters_tiled(
+                        coords, eps, min_samples, cluster_bounds, cluster_plan.grid,
+                        count_bounds=count_bounds
+                    )
+            else:
+                # DBSCAN clustering
+                with profiler.stage("DBSCAN", points=len(coords)):
+                    db = DBSCAN(eps=eps, min_samples=min_samples).fit(coords)
+                    labels = db.labels_
+
+                if tile_buffer is None:
+                    # Count clusters (excluding noise points labeled -1)
+                    num_buildings = len(set(labels)) - (1 if -1 in labels else 0)
+                else:
+                    # Count only the clusters whose centroid falls in this tile, so each building is counted once per mosaic
+                    num_buildings = int(np.sum(in_bounds(cluster_centroids(coords, labels), tile_bounds)))
 
         QMessageBox.information(
             self.iface.mainWindow(),
             "Building Detection Complete",
-            f"Building points detected: {np.sum(is_building):,}\n"
-            f"Approximate number of building detected: {num_buildings:,}"
+            f"Building points detected: {num_building:,}\n"
+            f"Approximate number of building detected: {num_buildings:,}\n\n"
+            f"{sweep_note}{plan.describe()}\n"
+            f"{cluster_plan.describe('Clustering')}"
         )
 
     except Exception as e:
@@ -81,3 +173,4 @@ def count_buildings(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QDialog
 from PyQt5 import uic
 import os
 
+import numpy as np
+
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
     os.path.dirname(__file__), './building_count_form.ui'))
 
@@ -12,8 +14,30 @@ class BuildingParamsDialog(QDialog, FORM_CLASS):
 
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
+        self.checkAdjacentTiles.toggled.connect(self.bufferSpin.setEnabled)
+        for widget in (self.sweepEpsMinSpin, self.sweepEpsMaxSpin, self.sweepStepsSpin, self.sweepMinSamplesEdit):
+            self.checkSweep.toggled.connect(widget.setEnabled)
 
     def get_params(self):
         eps = self.epsSpin.value()
         min_samples = self.minSamplesSpin.value()
         return eps, min_samples
+
+    def get_tile_buffer(self):
+        # None when adjacent tiles should not be read
+        if not self.checkAdjacentTiles.isChecked():
+            return None
+        return self.bufferSpin.value()
+
+    def get_sweep(self):
+        # None when no sweep is wanted, otherwise the eps values and the min samples values to count
+        if not self.checkSweep.isChecked():
+            return None
+        eps_min = self.sweepEpsMinSpin.value()
+        eps_max = max(self.sweepEpsMaxSpin.value(), eps_min)
+        eps_values = np.linspace(eps_min, eps_max, self.sweepStepsSpin.value())
+        min_samples_values = sorted({
+            int(value) for value in self.sweepMinSamplesEdit.text().replace(";", ",").split(",")
+            if value.strip().isdigit() and int(value) > 0
+        }) or [self.minSamplesSpin.value()]
+        return eps_values, min_samples_values
@@ -0,0 +1,131 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+from sklearn.cluster import DBSCAN
+
+from ..las_io import iter_chunks, local_coords
+from ..memory_planner import tile_bounds, tile_ids
+
+# ----------------------------------
+# --- Building Count (Processing) ---
+# ----------------------------------
+
+BUILDING_CLASS = 6
+TILE_BUFFER = 100.0     # Overlap between DBSCAN tiles, larger than most building footprints
+
+def read_class_xy(path, class_code, region=None, chunk_size=1_000_000):
+    """
+    Local XY of a single class read chunk by chunk, the other points are never
+    held in memory. Returns the coordinates and their origin.
+    """
+    parts = []
+    origin = None
+    for points in iter_chunks(path, region, chunk_size):
+        selected = points.classification == class_code
+        if np.any(selected):
+            # The first selected chunk fixes the origin shared by all the others
+            coords, origin = local_coords(points, "xy", mask=selected, origin=origin)
+            parts.append(coords)
+    if not parts:
+        return np.empty((0, 2), dtype=np.float64), np.zeros(2)
+    return np.concatenate(parts), origin
+
+def cluster_centroids(coords, labels):
+    # Centroid of every cluster, noise (-1) excluded
+    clustered = labels >= 0
+    if not np.any(clustered):
+        return np.empty((0, 2), dtype=np.float64)
+    _, cluster_idx = np.unique(labels[clustered], return_inverse=True)
+    sizes = np.bincount(cluster_idx)
+    centroid_x = np.bincount(cluster_idx, weights=coords[clustered, 0]) / sizes
+    centroid_y = np.bincount(cluster_idx, weights=coords[clustered, 1]) / sizes
+    return np.column_stack((centroid_x, centroid_y))
+
+def in_bounds(xy, bounds):
+    xmin, ymin, xmax, ymax = bounds
+    return (xy[:, 0] >= xmin) & (xy[:, 0] <= xmax) & (xy[:, 1] >= ymin) & (xy[:, 1] <= ymax)
+
+def count_clusters_tiled(coords, eps, min_samples, bounds, grid, buffer=TILE_BUFFER, count_bounds=None):
+    """
+    DBSCAN over a (columns, rows) grid of overlapping tiles, for building points
+    whose neighborhoods exceed the memory budget. Each cluster is counted by
+    the tile holding its centroid, and only when the centroid lies within
+    `count_bounds` if given.
+    """
+    num_clusters = 0
+    for tile, (xmin, ymin, xmax, ymax) in enumerate(tile_bounds(bounds, grid)):
+        selected = in_bounds(coords, (xmin - buffer, ymin - buffer, xmax + buffer, ymax + buffer))
+        if np.sum(selected) < min_samples:
+            continue
+        tile_coords = coords[selected]
+        labels = DBSCAN(eps=eps, min_samples=min_samples).fit(tile_coords).labels_
+        centroids = cluster_centroids(tile_coords, labels)
+        counted = tile_ids(centroids[:, 0], centroids[:, 1], bounds, grid) == tile
+        if count_bounds is not None:
+            counted &= in_bounds(centroids, count_bounds)
+        num_clusters += int(np.sum(counted))
+    return num_clusters
+
+# --- Parameter sweep ---
+
+class BuildingSweepModel:
+    """
+    Neighborhood graph built once at the largest epsilon of a sweep, from
+    which the DBSCAN clusters of any smaller (eps, min_samples) pair follow
+    without another neighbor search.
+
+    Every pair of points closer than `max_eps` is stored once, sorted by
+    distance. For a given eps the core points are the ones with at least
+    min_samples points (themselves included) within eps, and the clusters are
+    the connected components of the core points joined by edges within eps,
+    border points taking the cluster of one of their core neighbors, exactly
+    like DBSCAN.
+    """
+
+    def __init__(self, coords, max_eps):
+        self.coords = coords
+        self.max_eps = max_eps
+        pairs = cKDTree(coords).query_pairs(max_eps, output_type="ndarray")
+        distances = np.hypot(*(coords[pairs[:, 0]] - coords[pairs[:, 1]]).T)
+        order = np.argsort(distances, kind="stable")
+        self.first = pairs[order, 0].astype(np.int32)
+        self.second = pairs[order, 1].astype(np.int32)
+        self.distances = distances[order]
+
+    def labels(self, eps, min_samples):
+        """DBSCAN labels at (eps, min_samples), -1 for noise. `eps` may not exceed `max_eps`."""
+        num_points = len(self.coords)
+        k = int(np.searchsorted(self.distances, eps, side="right"))
+        first, second = self.first[:k], self.second[:k]
+        degree = 1 + np.bincount(first, minlength=num_points) + np.bincount(second, minlength=num_points)
+        core = degree >= min_samples
+
+        core_edges = core[first] & core[second]
+        graph = coo_matrix(
+            (np.ones(int(np.sum(core_edges)), dtype=np.int8), (first[core_edges], second[core_edges])),
+            shape=(num_points, num_points)
+        )
+        _, components = connected_components(graph, directed=False)
+
+        labels = np.full(num_points, -1, dtype=np.int64)
+        _, labels[core] = np.unique(components[core], return_inverse=True)
+        # Border points join the cluster of a core neighbor
+        for source, target in ((first, second), (second, first)):
+            border = core[source] & ~core[target]
+            labels[target[border]] = labels[source[border]]
+        return labels
+
+    def count(self, eps, min_samples, count_bounds=None):
+        """Number of clusters, only the ones whose centroid lies within `count_bounds` if given."""
+        labels = self.labels(eps, min_samples)
+        if count_bounds is not None:
+            return int(np.sum(in_bounds(cluster_centroids(self.coords, labels), count_bounds)))
+        return len(np.unique(labels[labels >= 0]))
+
+    def sweep(self, eps_values, min_samples_values, count_bounds=None):
+        """Cluster counts as a (len(min_samples_values), len(eps_values)) array."""
+        return np.array([
+            [self.count(eps, min_samples, count_bounds) for eps in eps_values]
+            for min_samples in min_samples_values
+        ], dtype=np.int64)
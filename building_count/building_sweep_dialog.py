@@ -0,0 +1,70 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './building_sweep_form.ui'))
+
+class BuildingSweepDialog(QDialog, FORM_CLASS):
+    def __init__(self, model, eps_values, min_samples_values, counts, eps, min_samples,
+                 count_bounds=None, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+        self.model = model
+        self.count_bounds = count_bounds
+
+        # Any eps up to the one of the neighbor graph can be evaluated, not only the swept ones
+        self.spinEps.setMaximum(model.max_eps)
+        self.spinEps.setValue(min(eps, model.max_eps))
+        self.spinMinSamples.setValue(min_samples)
+
+        # Count-vs-eps curve of every min samples value, the current choice marked on top
+        self.figure = Figure(figsize=(6, 4))
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.plotLayout.addWidget(self.canvas)
+        self.ax = self.figure.add_subplot(111)
+        for min_samples_value, row in zip(min_samples_values, counts):
+            self.ax.plot(eps_values, row, marker="o", markersize=3, label=f"min samples = {min_samples_value}")
+        self.selection, = self.ax.plot([], [], marker="x", markersize=10, color="#D62728", linestyle="none")
+        self.ax.set_xlabel("Epsilon")
+        self.ax.set_ylabel("Buildings")
+        self.ax.grid(True, alpha=0.3)
+        self.ax.legend(loc="upper right")
+        self.figure.tight_layout()
+
+        self.eps_values = np.asarray(eps_values)
+        self.min_samples_values = list(min_samples_values)
+        self.counts = counts
+        self.canvas.mpl_connect("button_press_event", self.pick_point)
+
+        self.spinEps.valueChanged.connect(self.update_count)
+        self.spinMinSamples.valueChanged.connect(self.update_count)
+        self.update_count()
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def pick_point(self, event):
+        # Clicking the plot selects the swept point closest to the click
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        col = int(np.argmin(np.abs(self.eps_values - event.xdata)))
+        row = int(np.argmin(np.abs(self.counts[:, col] - event.ydata)))
+        self.spinMinSamples.setValue(self.min_samples_values[row])
+        self.spinEps.setValue(self.eps_values[col])
+
+    def update_count(self):
+        eps, min_samples = self.get_params()
+        count = self.model.count(eps, min_samples, self.count_bounds)
+        self.labelCount.setText(f"Approximate number of buildings: {count:,}")
+        self.selection.set_data([eps], [count])
+        self.canvas.draw_idle()
+
+    def get_params(self):
+        eps = self.spinEps.value()
+        min_samples = self.spinMinSamples.value()
+        return eps, min_samples
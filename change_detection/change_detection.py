@@ -0,0 +1,140 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    LIDAR_FILTER, OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, Region, format_output_notes, local_coords,
+    read_header, read_las, resolve_output_path, write_las
+)
+from ..memory_planner import IN_MEMORY, header_bounds, plan_pair
+from ..processing_region.processing_region import region_for_file
+from .change_detection_dialog import ChangeDetectionDialog
+from .change_functions import (
+    DISTANCE_DIMENSION, ChangeStatistics, change_distances, distance_header, distance_params,
+    tiled_change_detection
+)
+
+# ------------------------
+# --- Change Detection ---
+# ------------------------
+
+METHOD_NAMES = {"nearest": "nearest neighbor", "plane": "local plane"}
+
+def detect_changes(self):
+    reference_path, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select Reference Epoch (A)',
+        '',
+        LIDAR_FILTER
+    )
+    if not reference_path:
+        return
+    compared_path, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select Compared Epoch (B)',
+        os.path.dirname(reference_path),
+        LIDAR_FILTER
+    )
+    if not compared_path:
+        return
+
+    dialog = ChangeDetectionDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    method, k, max_distance, threshold = dialog.get_values()
+
+    output_path = _ask_output_path(self, compared_path)
+    if not output_path:
+        return
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Change Detection")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region_b = region_for_file(self, compared_path)
+        # Reference points just outside the region still serve the compared points on its edge
+        region_a = None
+        if region_b is not None:
+            xmin, ymin, xmax, ymax = region_b.bbox
+            region_a = Region((xmin - max_distance, ymin - max_distance, xmax + max_distance, ymax + max_distance))
+
+        header_a = read_header(reference_path)
+        header_b = read_header(compared_path)
+        output_header = distance_header(header_b)
+        stats = ChangeStatistics(threshold)
+        # Tile pairs are compared in parallel, each worker gets its share of the memory budget
+        workers = os.cpu_count() or 1
+        plan = plan_pair(header_a, header_b, "change", self.memory_budget)
+        if plan.strategy != IN_MEMORY:
+            plan = plan_pair(header_a, header_b, "change", self.memory_budget // workers, max_distance)
+
+        if plan.strategy == IN_MEMORY:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las_a = read_las(reference_path, region_a)
+                las_b = read_las(compared_path, region_b)
+                stage.points = len(las_a.points) + len(las_b.points)
+
+            # Both epochs share the local origin of the reference
+            coords_a, origin = local_coords(las_a)
+            coords_b, _ = local_coords(las_b, origin=origin)
+            with profiler.stage("Compute distances", points=len(coords_b)):
+                distances = change_distances(coords_a, coords_b, method, k, max_distance)
+            stats.update(distances)
+
+            with profiler.stage("Write output", points=len(coords_b)):
+                if DISTANCE_DIMENSION not in las_b.point_format.dimension_names:
+                    las_b.add_extra_dim(distance_params())
+                las_b[DISTANCE_DIMENSION] = distances
+                output_notes = write_las(las_b, output_path, self.output_options)
+        else:
+            (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = header_bounds(header_a), header_bounds(header_b)
+            bounds = (min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1))
+            with profiler.stage("Tiled distances", points=header_a.point_count + header_b.point_count):
+                with PointStreamWriter(output_path, output_header, self.output_options) as writer:
+                    tiled_change_detection(
+                        reference_path, compared_path, writer, output_header, stats, bounds, plan.grid,
+                        method, k, max_distance, region_a, region_b, workers=workers
+                    )
+            output_notes = writer.notes
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Change Detection Complete",
+            f"Distance: {METHOD_NAMES[method]} from B to A, stored as '{DISTANCE_DIMENSION}'\n"
+            + "\n".join(stats.summary(signed=method == "plane"))
+            + f"\n\nOutput saved to:\n{output_path}\n\n"
+            f"{plan.describe()}"
+            f"{format_output_notes(output_notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Change Detection",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Compared Epoch with Distances',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["change"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
@@ -0,0 +1,27 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+from .change_functions import METHODS
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './change_detection_form.ui'))
+
+class ChangeDetectionDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.comboMethod.currentIndexChanged.connect(
+            lambda index: self.spinNeighbors.setEnabled(METHODS[index] == "plane")
+        )
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_values(self):
+        method = METHODS[self.comboMethod.currentIndex()]
+        k = self.spinNeighbors.value()
+        max_distance = self.spinMaxDistance.value()
+        threshold = self.spinThreshold.value()
+        return method, k, max_distance, threshold
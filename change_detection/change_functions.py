@@ -0,0 +1,185 @@
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import laspy
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..las_io import local_coords
+from ..report_generation.report_statistics import QuantileSketch
+from ..retiling.retiling_functions import TileScheme, write_tiles
+from ..tile_index import split_tile_path
+
+# ------------------------------------
+# --- Change Detection (Processing) ---
+# ------------------------------------
+
+DISTANCE_DIMENSION = "c2c_distance"
+METHODS = ("nearest", "plane")
+PLANE_SLICE = 100_000     # Compared points fitted at once by the local plane method
+
+def distance_params():
+    return laspy.ExtraBytesParams(name=DISTANCE_DIMENSION, type=np.float32, description="Distance to the reference epoch")
+
+def distance_header(header):
+    """Copy of `header` with the float32 distance extra-bytes dimension."""
+    header = header.copy()
+    if DISTANCE_DIMENSION not in header.point_format.dimension_names:
+        header.add_extra_dims([distance_params()])
+    return header
+
+def with_distances(points, header, distances):
+    # Records of `header` (the distance dimension included) holding `points` and their distances
+    out = laspy.ScaleAwarePointRecord.zeros(len(points), header=header)
+    for name in points.array.dtype.names:
+        out.array[name] = points.array[name]
+    out[DISTANCE_DIMENSION] = distances
+    return out
+
+def change_distances(reference, compared, method="nearest", k=10, max_distance=5.0, workers=-1):
+    """
+    Distance from every `compared` point to the `reference` cloud, both (n, 3)
+    local coordinates of the same origin. "nearest" is the unsigned distance to
+    the closest reference point, "plane" the signed distance to the plane fitted
+    to the k nearest reference points (positive above the surface). NaN where
+    no reference point (or fewer than 3 for the plane) lies within max_distance.
+    """
+    distances = np.full(len(compared), np.nan, dtype=np.float32)
+    if len(reference) == 0 or len(compared) == 0:
+        return distances
+    tree = cKDTree(reference)
+
+    if method == "nearest":
+        found, _ = tree.query(compared, k=1, distance_upper_bound=max_distance, workers=workers)
+        valid = np.isfinite(found)
+        distances[valid] = found[valid]
+        return distances
+
+    k = min(k, tree.n)
+    for start in range(0, len(compared), PLANE_SLICE):
+        points = compared[start:start + PLANE_SLICE]
+        found, idx = tree.query(points, k=k, distance_upper_bound=max_distance, workers=workers)
+        found, idx = found.reshape(len(points), k), idx.reshape(len(points), k)
+        valid = np.isfinite(found)
+        counts = valid.sum(axis=1)
+        fitted = counts >= 3
+        if not np.any(fitted):
+            continue
+
+        # Neighborhoods padded with their own centroid, which leaves the covariance unchanged
+        neighbors = reference[np.where(valid, idx, 0)[fitted]]
+        weights = valid[fitted, :, None]
+        centroids = (neighbors * weights).sum(axis=1) / counts[fitted, None]
+        centered = np.where(weights, neighbors - centroids[:, None, :], 0.0)
+        covariance = np.einsum("nki,nkj->nij", centered, centered)
+        normals = np.linalg.eigh(covariance)[1][:, :, 0]    # Eigenvector of the smallest eigenvalue
+        normals *= np.where(normals[:, 2] < 0, -1.0, 1.0)[:, None]
+        distances[start + np.flatnonzero(fitted)] = np.einsum("ni,ni->n", points[fitted] - centroids, normals)
+    return distances
+
+class ChangeStatistics:
+    """Running summary of the distances of every compared point, merged tile by tile."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.num_points = 0
+        self.num_valid = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.num_gain = 0
+        self.num_loss = 0
+        self.sketch = QuantileSketch()
+
+    def update(self, distances):
+        self.num_points += len(distances)
+        valid = distances[np.isfinite(distances)].astype(np.float64)
+        self.num_valid += len(valid)
+        self.total += float(valid.sum())
+        self.total_squares += float(np.square(valid).sum())
+        self.num_gain += int(np.count_nonzero(valid > self.threshold))
+        self.num_loss += int(np.count_nonzero(valid < -self.threshold))
+        self.sketch.update(valid)
+
+    def summary(self, signed):
+        lines = [f"Compared points: {self.num_points:,}"]
+        if self.num_valid == 0:
+            return lines + ["No compared point has a reference point within the maximum distance."]
+        mean = self.total / self.num_valid
+        std = math.sqrt(max(self.total_squares / self.num_valid - mean * mean, 0.0))
+        rms = math.sqrt(self.total_squares / self.num_valid)
+        quantiles = self.sketch.quantiles((5, 50, 95))
+        changed = self.num_gain + self.num_loss
+        lines += [
+            f"Points without reference within the maximum distance: {self.num_points - self.num_valid:,}",
+            f"Mean: {mean:.3f}  Std: {std:.3f}  RMS: {rms:.3f}",
+            f"Median: {quantiles[50]:.3f}  P5: {quantiles[5]:.3f}  P95: {quantiles[95]:.3f}",
+            f"Changed points (|d| > {self.threshold:g}): {changed:,} ({changed / self.num_valid:.2%})",
+        ]
+        if signed:
+            lines.append(f"Gain above the reference: {self.num_gain:,}  Loss below the reference: {self.num_loss:,}")
+        return lines
+
+# --- Tiled execution ---
+
+def tiled_change_detection(path_a, path_b, writer, header, stats, bounds, grid, method="nearest", k=10,
+                           max_distance=5.0, region_a=None, region_b=None, chunk_size=1_000_000, workers=None):
+    """
+    Change detection for epochs exceeding the memory budget. Both files are
+    spilled into the same square tiles over `bounds`, about a (columns, rows)
+    `grid`, the reference tiles holding a `max_distance` buffer, then the tile
+    pairs are compared in parallel with at most `workers` pairs in memory.
+    Compared points with their distance are streamed to `writer` (of `header`)
+    and summarized into `stats`.
+    """
+    workers = workers or os.cpu_count() or 1
+    tile_size = max((bounds[2] - bounds[0]) / grid[0], (bounds[3] - bounds[1]) / grid[1])
+    reference_scheme = TileScheme(bounds, tile_size, max_distance)
+    compared_scheme = TileScheme(bounds, tile_size)
+    origin = np.array([bounds[0], bounds[1], 0.0])
+
+    tmp_dir = tempfile.mkdtemp(prefix="mylidar_change_")
+    try:
+        folder_a = os.path.join(tmp_dir, "reference")
+        folder_b = os.path.join(tmp_dir, "compared")
+        os.makedirs(folder_a)
+        os.makedirs(folder_b)
+        reference_tiles = write_tiles(
+            path_a, reference_scheme, lambda tile: split_tile_path(folder_a, tile), region_a, chunk_size
+        )
+        compared_tiles = write_tiles(
+            path_b, compared_scheme, lambda tile: split_tile_path(folder_b, tile), region_b, chunk_size
+        )
+
+        def compare_tile(tile):
+            compared = laspy.read(compared_tiles[tile][0])
+            coords_b, _ = local_coords(compared, origin=origin)
+            if tile in reference_tiles:
+                coords_a, _ = local_coords(laspy.read(reference_tiles[tile][0]), origin=origin)
+            else:
+                coords_a = np.empty((0, 3))
+            # Tiles already run in parallel, each query keeps to its own thread
+            distances = change_distances(coords_a, coords_b, method, k, max_distance, workers=1)
+            return with_distances(compared.points, header, distances), distances
+
+        def collect(done):
+            for future in done:
+                points, distances = future.result()
+                writer.write(points)
+                stats.update(distances)
+
+        # cKDTree queries and laspy decoding release the GIL, threads are enough to use every core
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for tile in compared_tiles:
+                if len(pending) >= workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(executor.submit(compare_tile, tile))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
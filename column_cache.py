@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import laspy
+from laspy import LazBackend
+from laspy.point.dims import get_sub_fields_dict
+import numpy as np
+
+# ----------------------------
+# --- Decoded Column Cache ---
+# ----------------------------
+
+CACHE_VERSION = 1
+MANIFEST_NAME = "columns.json"
+CACHED_EXTENSIONS = (".laz",)   # LAS records are stored uncompressed already
+SCALED_AXES = {"x": ("X", 0), "y": ("Y", 1), "z": ("Z", 2)}
+
+def default_cache_folder():
+    return os.path.join(tempfile.gettempdir(), "mylidar_column_cache")
+
+def folder_size(folder):
+    total = 0
+    for root, _, names in os.walk(folder):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+    return total
+
+class ColumnCache:
+    """
+    LAZ files decoded once into one uncompressed .npy file per raw field of
+    their point records (X, Y, Z, intensity, bit_fields, classification,
+    gps_time, extra bytes...), then memory-mapped by every later read.
+    An entry stays valid while the size and modification time of its source
+    are unchanged. Its manifest is written last, so an interrupted decode is
+    never used.
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder or default_cache_folder()
+        self._lock = threading.Lock()
+
+    def handles(self, path):
+        # Temporary tiles are read once, caching them would only cost a copy
+        path = os.path.abspath(path)
+        return path.lower().endswith(CACHED_EXTENSIONS) and not path.startswith(
+            os.path.abspath(tempfile.gettempdir()) + os.sep
+        )
+
+    def entry_folder(self, path):
+        path = os.path.abspath(path)
+        key = hashlib.sha1(os.path.normcase(path).encode("utf-8")).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.folder, f"{stem}_{key}")
+
+    def lookup(self, path):
+        """Cached columns of `path`, None when the file was never decoded or changed since."""
+        folder = self.entry_folder(path)
+        try:
+            with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        stat = os.stat(path)
+        if (
+            manifest.get("version") != CACHE_VERSION
+            or manifest.get("size") != stat.st_size
+            or manifest.get("mtime_ns") != stat.st_mtime_ns
+        ):
+            return None
+        return CachedColumns(folder, manifest)
+
+    def build(self, path, chunk_size=1_000_000):
+        """Decode `path` chunk by chunk straight into its column files, replacing any previous entry."""
+        folder = self.entry_folder(path)
+        partial = folder + ".partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        os.makedirs(partial)
+        stat = os.stat(path)
+        try:
+            with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+                header = reader.header
+                count = header.point_count
+                dtype = header.point_format.dtype()
+                files = {name: f"{i:02d}.npy" for i, name in enumerate(dtype.names)}
+                columns = {}
+                for name in dtype.names:
+                    field = dtype.fields[name][0]
+                    columns[name] = np.lib.format.open_memmap(
+                        os.path.join(partial, files[name]), mode="w+", dtype=field.base, shape=(count,) + field.shape
+                    )
+                start = 0
+                for points in reader.chunk_iterator(chunk_size):
+                    end = start + len(points)
+                    for name, column in columns.items():
+                        column[start:end] = points.array[name]
+                    start = end
+                for column in columns.values():
+                    column.flush()
+                del columns
+            if start != count:
+                raise ValueError(f"The header announces {count:,} points but {start:,} were decoded.")
+
+            manifest = {
+                "version": CACHE_VERSION,
+                "source": os.path.abspath(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "point_count": count,
+                "point_format": header.point_format.id,
+                "scales": [float(v) for v in header.scales],
+                "offsets": [float(v) for v in header.offsets],
+                "files": files,
+            }
+            with open(os.path.join(partial, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            shutil.rmtree(folder, ignore_errors=True)
+            os.replace(partial, folder)
+        except BaseException:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        return CachedColumns(folder, manifest)
+
+    def get(self, path, chunk_size=1_000_000):
+        """Cached columns of `path`, decoding the file first when needed."""
+        with self._lock:
+            return self.lookup(path) or self.build(path, chunk_size)
+
+    def size(self):
+        return folder_size(self.folder) if os.path.isdir(self.folder) else 0
+
+    def clear(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+class CachedColumns:
+    """
+    Read-only memory maps of the columns of one cached file. Columns are
+    opened on first use and only the pages actually read are loaded.
+    """
+
+    def __init__(self, folder, manifest):
+        self.folder = folder
+        self.manifest = manifest
+        self.point_count = manifest["point_count"]
+        self.scales = np.asarray(manifest["scales"], dtype=np.float64)
+        self.offsets = np.asarray(manifest["offsets"], dtype=np.float64)
+        self._columns = {}
+
+    def column(self, name):
+        """Zero-copy memory map of one raw record field."""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.folder, self.manifest["files"][name]), mmap_mode="r")
+        return self._columns[name]
+
+    def dimension(self, name, selection=None):
+        """
+        Values of a raw field, of a packed sub-field (return_number,
+        classification...) or of a scaled x/y/z axis, for all the points or
+        the `selection` (slice, indices or boolean mask). Raw fields of all
+        the points are returned as the memory map itself.
+        """
+        selection = slice(None) if selection is None else selection
+        if name in SCALED_AXES:
+            raw, i = SCALED_AXES[name]
+            return self.column(raw)[selection] * self.scales[i] + self.offsets[i]
+        if name in self.manifest["files"]:
+            return self.column(name)[selection]
+        sub_fields = get_sub_fields_dict(self.manifest["point_format"])
+        if name not in sub_fields:
+            raise KeyError(f"The cached file has no dimension named '{name}'.")
+        composed, sub_field = sub_fields[name]
+        shift = (sub_field.mask & -sub_field.mask).bit_length() - 1
+        return (np.asarray(self.column(composed)[selection]) & sub_field.mask) >> shift
+
+    def region_mask(self, region, chunk_size=1_000_000):
+        """Points inside `region`, tested chunk by chunk from the X and Y columns only."""
+        mask = np.zeros(self.point_count, dtype=bool)
+        for start in range(0, self.point_count, chunk_size):
+            window = slice(start, start + chunk_size)
+            mask[window] = region.contains(self.dimension("x", window), self.dimension("y", window))
+        return mask
+
+    def records(self, header, selection=None):
+        """
+        Point records of all the points or the `selection`, assembled column
+        by column: a memory copy instead of a LAZ decode.
+        """
+        columns = {name: self.column(name) for name in self.manifest["files"]}
+        if selection is None:
+            count = self.point_count
+        elif isinstance(selection, slice):
+            count = len(range(*selection.indices(self.point_count)))
+        elif selection.dtype == bool:
+            count = int(np.count_nonzero(selection))
+        else:
+            count = len(selection)
+        array = np.empty(count, dtype=header.point_format.dtype())
+        for name, column in columns.items():
+            array[name] = column if selection is None else column[selection]
+        return laspy.ScaleAwarePointRecord(array, header.point_format, header.scales, header.offsets)
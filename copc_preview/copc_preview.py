@@ -0,0 +1,96 @@
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+import laspy
+import matplotlib.pyplot as plt
+
+from ..utils import create_loading_dialog, canvas_extent_bounds
+from ..profiling import StageProfiler
+from ..las_io import header_wkt, is_copc_file, read_copc_region
+from .copc_preview_dialog import CopcPreviewDialog
+
+# --------------------
+# --- COPC Preview ---
+# --------------------
+
+def preview_copc(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select COPC File to Preview',
+        '',
+        'COPC Files (*.copc.laz);;LiDAR Files (*.laz)'
+    )
+    if not filename:
+        return
+
+    if not is_copc_file(filename):
+        QMessageBox.warning(
+            self.iface.mainWindow(),
+            "Not a COPC File",
+            "The selected file has no COPC octree. Save it as COPC from the cleaning commands first."
+        )
+        return
+
+    dialog = CopcPreviewDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+
+    level, use_canvas_extent = dialog.get_values()
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("COPC Preview")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        bounds = None
+        if use_canvas_extent:
+            with laspy.open(filename) as reader:
+                bounds = canvas_extent_bounds(self, header_wkt(reader.header))
+
+        # Only the octree nodes intersecting the box, down to the requested level, are decompressed
+        with profiler.stage("Query COPC nodes") as stage:
+            points, header = read_copc_region(filename, bounds=bounds, level=range(0, level + 1))
+            stage.points = len(points)
+
+        if len(points) == 0:
+            QMessageBox.information(
+                self.iface.mainWindow(),
+                "No Points",
+                "No points were found in the requested region."
+            )
+            return
+
+        plt.figure(figsize=(7, 6))
+        plt.scatter(points.x, points.y, c=points.z, s=1, cmap='viridis')
+        plt.title(f"COPC Preview (levels 0-{level})", fontweight='bold')
+        plt.gcf().canvas.manager.set_window_title("COPC Preview")
+        plt.xlabel("X")
+        plt.ylabel("Y")
+        plt.colorbar(label="Z")
+        plt.axis('equal')
+        plt.tight_layout()
+        plt.show()
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "COPC Preview",
+            f"Points in file: {header.point_count:,}\n"
+            f"Points fetched: {len(points):,} ({len(points) / header.point_count:.1%})"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Previewing COPC File",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
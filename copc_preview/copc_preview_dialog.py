@@ -0,0 +1,19 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './copc_preview_form.ui'))
+
+class CopcPreviewDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_values(self):
+        level = self.spinLevel.value()
+        use_canvas_extent = self.checkCanvasExtent.isChecked()
+        return level, use_canvas_extent
@@ -0,0 +1,153 @@
+from collections import deque
+
+import numpy as np
+
+from ..las_io import iter_chunks
+
+# --------------------------------------
+# --- Duplicate Removal (Processing) ---
+# --------------------------------------
+
+RECENT_KEYS = 4_000_000     # Keys of the previous chunks checked by the chunked removal
+
+class DuplicateKeys:
+    """
+    Sortable keys of the integer X, Y and Z records, optionally snapped to a
+    `tolerance` grid (in CRS units) and optionally extended with the GPS time.
+
+    The quantized coordinates are packed into a single int64 when their ranges
+    fit in 63 bits, which makes the sorts plain integer sorts. Otherwise (and
+    with the GPS time) the keys are structured arrays sorted field by field.
+    Points snapped to the same tolerance cell are duplicates, so two points
+    closer than the tolerance but on each side of a cell edge are both kept.
+    Points outside the header bounds (stale headers) switch the builder to
+    the structured keys for the rest of the file, see normalize().
+    """
+
+    def __init__(self, header, tolerance=0.0, use_gps_time=False):
+        scales = np.asarray(header.scales, dtype=np.float64)
+        offsets = np.asarray(header.offsets, dtype=np.float64)
+        self.steps = np.maximum(1, np.round(tolerance / scales)).astype(np.int64)
+        mins = np.floor((np.asarray(header.mins) - offsets) / scales).astype(np.int64) // self.steps
+        maxs = np.ceil((np.asarray(header.maxs) - offsets) / scales).astype(np.int64) // self.steps
+        self.mins = mins
+        self.spans = maxs - mins + 1
+        self.bits = [int(span).bit_length() for span in self.spans]
+        self.shifts = (self.bits[1] + self.bits[2], self.bits[2], 0) if sum(self.bits) <= 63 else None
+        self.use_gps_time = use_gps_time and "gps_time" in header.point_format.dimension_names
+
+    def keys(self, points):
+        columns = [
+            np.asarray(points[dim]).astype(np.int64) // step - minimum
+            for dim, step, minimum in zip("XYZ", self.steps, self.mins)
+        ]
+        if self.shifts is not None and any(
+            len(column) and (column.min() < 0 or column.max() >= span) for column, span in zip(columns, self.spans)
+        ):
+            # The header bounds are stale, packed keys would collide: the coordinates stay separate from now on
+            self.shifts = None
+        if self.shifts is not None:
+            columns = [(columns[0] << self.shifts[0]) | (columns[1] << self.shifts[1]) | columns[2]]
+        if self.use_gps_time:
+            # Bit pattern of the float64: only identical times are equal
+            columns.append(np.asarray(points.gps_time, dtype=np.float64).view(np.int64))
+        return self._combine(columns)
+
+    def normalize(self, keys):
+        """
+        Keys built before the switch to structured keys, converted to them so
+        they compare with the newer ones. Their sort order is unchanged, and
+        keys already in the current form are returned as they are.
+        """
+        packed = keys.dtype.names is None or len(keys.dtype.names) < 3
+        if self.shifts is not None or not packed:
+            return keys
+        extra = []
+        if keys.dtype.names is not None:
+            keys, extra = keys["k0"], [keys[name] for name in keys.dtype.names[1:]]
+        columns = [
+            keys >> (self.bits[1] + self.bits[2]),
+            (keys >> self.bits[2]) & ((1 << self.bits[1]) - 1),
+            keys & ((1 << self.bits[2]) - 1),
+        ]
+        return self._combine(columns + extra)
+
+    def _combine(self, columns):
+        if len(columns) == 1:
+            return columns[0]
+        keys = np.empty(len(columns[0]), dtype=[(f"k{i}", np.int64) for i in range(len(columns))])
+        for i, column in enumerate(columns):
+            keys[f"k{i}"] = column
+        return keys
+
+def first_occurrence_mask(keys):
+    # True for the first point of every key, in file order (the stable sort keeps equal keys in file order)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    mask = np.zeros(len(keys), dtype=bool)
+    mask[order[first]] = True
+    return mask
+
+def duplicate_mask(points, key_builder, chunk_size=1_000_000):
+    """Mask of the points to keep over a whole in-memory file: every duplicate but the first is dropped."""
+    num_points = len(points)
+    if num_points <= chunk_size:
+        return first_occurrence_mask(key_builder.keys(points))
+    # Keys built per slice keep the temporary int64 columns bounded by the chunk size
+    parts = [key_builder.keys(points[start:start + chunk_size]) for start in range(0, num_points, chunk_size)]
+    return first_occurrence_mask(np.concatenate([key_builder.normalize(part) for part in parts]))
+
+class RecentKeys:
+    """
+    Sorted unique keys of the last chunks, dropped oldest first beyond
+    `capacity`. Spatially sorted files (tiles, flightlines) keep their
+    duplicates close in file order, so a bounded history finds them without
+    holding the keys of the whole file.
+    """
+
+    def __init__(self, capacity=RECENT_KEYS):
+        self.capacity = capacity
+        self.chunks = deque()
+        self.size = 0
+
+    def seen(self, keys):
+        found = np.zeros(len(keys), dtype=bool)
+        for past in self.chunks:
+            pos = np.minimum(np.searchsorted(past, keys), len(past) - 1)
+            found |= past[pos] == keys
+        return found
+
+    def add(self, keys):
+        if len(keys) == 0:
+            return
+        self.chunks.append(np.sort(keys))
+        self.size += len(keys)
+        while self.size > self.capacity and len(self.chunks) > 1:
+            self.size -= len(self.chunks.popleft())
+
+    def normalize(self, key_builder):
+        self.chunks = deque(key_builder.normalize(past) for past in self.chunks)
+
+def stream_duplicate_removal(path, writer, key_builder, region=None, chunk_size=1_000_000, history=RECENT_KEYS):
+    """
+    Chunked duplicate removal for files exceeding the memory budget: duplicates
+    within a chunk are always removed, duplicates of earlier chunks only while
+    their keys are still in the `history`. Returns the number of points read
+    and of duplicates removed.
+    """
+    recent = RecentKeys(history)
+    num_points = 0
+    num_duplicates = 0
+    for points in iter_chunks(path, region, chunk_size):
+        keys = key_builder.keys(points)
+        recent.normalize(key_builder)
+        keep = first_occurrence_mask(keys)
+        keep[keep] = ~recent.seen(keys[keep])
+        recent.add(keys[keep])
+
+        num_points += len(points)
+        num_duplicates += len(points) - int(np.count_nonzero(keep))
+        writer.write(points[keep])
+    return num_points, num_duplicates
@@ -0,0 +1,127 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+import numpy as np
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, filter_points, format_output_notes, read_header, read_las,
+    resolve_output_path, write_las
+)
+from ..memory_planner import IN_MEMORY, plan_execution
+from ..processing_region.processing_region import region_for_file
+from .duplicate_removal_dialog import DuplicateRemovalDialog
+from .duplicate_functions import DuplicateKeys, duplicate_mask, stream_duplicate_removal
+
+# -------------------------
+# --- Duplicate Removal ---
+# -------------------------
+
+def remove_duplicates(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Remove Duplicate Points',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dialog = DuplicateRemovalDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    tolerance, use_gps_time = dialog.get_values()
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Duplicate Removal")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        key_builder = DuplicateKeys(header, tolerance, use_gps_time)
+        plan = plan_execution(header, "duplicates", self.memory_budget)
+
+        if plan.strategy != IN_MEMORY:
+            # Too large for the memory budget: duplicates are searched within each chunk and the recent ones
+            loading_dialog.hide()
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+            loading_dialog.show()
+            QApplication.processEvents()
+
+            with profiler.stage("Chunked duplicate removal") as stage:
+                with PointStreamWriter(output_path, header, self.output_options) as writer:
+                    num_points, num_duplicates = stream_duplicate_removal(
+                        filename, writer, key_builder, region, plan.chunk_size
+                    )
+                stage.points = num_points
+            num_remaining = writer.points_written
+            output_notes = writer.notes
+        else:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las = read_las(filename, region)
+                stage.points = len(las.points)
+
+            with profiler.stage("Find duplicates", points=len(las.points)):
+                keep = duplicate_mask(las.points, key_builder)
+            num_points = len(las.points)
+            num_remaining = int(np.count_nonzero(keep))
+            num_duplicates = num_points - num_remaining
+
+            with profiler.stage("Filter points", points=num_remaining):
+                las_filtered = filter_points(las, keep) if num_duplicates else las
+
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+
+            with profiler.stage("Write output", points=num_remaining):
+                output_notes = write_las(las_filtered, output_path, self.output_options)
+
+        criterion = "identical coordinates" if tolerance == 0 else f"same {tolerance:g} unit cell"
+        if key_builder.use_gps_time:
+            criterion += " and GPS time"
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Duplicate Removal Complete",
+            f"Original points: {num_points:,}\n"
+            f"Duplicate points removed ({criterion}): {num_duplicates:,} "
+            f"({num_duplicates / max(num_points, 1):.2%})\n"
+            f"Remaining points: {num_remaining:,}\n\n"
+            f"Filtered file saved to:\n{output_path}\n\n"
+            f"{plan.describe()}"
+            f"{format_output_notes(output_notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Duplicate Removal",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Deduplicated LiDAR File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["duplicates"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
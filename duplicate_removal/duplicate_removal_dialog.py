@@ -0,0 +1,19 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './duplicate_removal_form.ui'))
+
+class DuplicateRemovalDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_values(self):
+        tolerance = self.spinTolerance.value()
+        use_gps_time = self.checkGpsTime.isChecked()
+        return tolerance, use_gps_time
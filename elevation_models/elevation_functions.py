@@ -0,0 +1,118 @@
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from ..las_io import iter_chunks, scaled_axis
+from ..raster_grid import cell_maximum, cell_minimum, fill_nearest
+from ..tile_index import split_into_tiles, split_tile_path
+from ..vegetation_classification.vegetation_functions import GROUND_CLASS
+
+# -------------------------------------
+# --- Elevation Models (Processing) ---
+# -------------------------------------
+
+MODELS = ("dtm", "dsm", "chm")
+NODATA = -9999.0
+
+def update_elevation_grids(dtm, dsm, grid, points):
+    """Lower the DTM cells to their lowest ground point and raise the DSM cells to their highest first return."""
+    for values, selected, reduce in (
+        (dtm, points.classification == GROUND_CLASS, cell_minimum),
+        (dsm, points.return_number == 1, cell_maximum),
+    ):
+        if np.any(selected):
+            x, y, z = (scaled_axis(points, axis, mask=selected) for axis in "xyz")
+            reduce(values.ravel(), grid.cells(x, y), z)
+
+def elevation_grids(path, grid, region=None, chunk_size=1_000_000):
+    # Raw minimum ground and maximum first return grids, NaN where a cell holds no such point
+    dtm = np.full(grid.shape, np.nan)
+    dsm = np.full(grid.shape, np.nan)
+    for points in iter_chunks(path, region, chunk_size):
+        update_elevation_grids(dtm, dsm, grid, points)
+    return dtm, dsm
+
+def finish_models(dtm, dsm):
+    """
+    DTM gaps (under buildings, dense canopy or water) are filled from the
+    nearest ground cell, the DSM keeps its gaps and the CHM is the DSM height
+    above the DTM, never negative. Returns float32 rasters with NODATA gaps.
+    """
+    dtm = fill_nearest(dtm)
+    chm = np.maximum(dsm - dtm, 0.0)
+    return {
+        name: np.nan_to_num(model, nan=NODATA).astype(np.float32)
+        for name, model in zip(MODELS, (dtm, dsm, chm))
+    }
+
+def elevation_models(path, grid, region=None, chunk_size=1_000_000):
+    """DTM, DSM and CHM of the whole grid, from a single streaming pass."""
+    return finish_models(*elevation_grids(path, grid, region, chunk_size))
+
+# --- Tiled execution ---
+
+def aligned_tiling(grid, tiles):
+    """
+    Bounds and (row slice, column slice) windows of a (columns, rows) tiling
+    whose tile edges fall on cell edges, so every cell gets its points from
+    a single tile. Windows are listed in tile_ids() order.
+    """
+    tile_cols, tile_rows = tiles
+    cells_per_col = math.ceil(grid.cols / tile_cols)
+    cells_per_row = math.ceil(grid.rows / tile_rows)
+    bounds = (
+        grid.xmin, grid.ymax - tile_rows * cells_per_row * grid.cell_size,
+        grid.xmin + tile_cols * cells_per_col * grid.cell_size, grid.ymax,
+    )
+    windows = []
+    for col in range(tile_cols):
+        for row in range(tile_rows):
+            north_row = tile_rows - 1 - row     # tile_ids() counts rows from the south
+            rows = slice(min(north_row * cells_per_row, grid.rows), min((north_row + 1) * cells_per_row, grid.rows))
+            cols = slice(min(col * cells_per_col, grid.cols), min((col + 1) * cells_per_col, grid.cols))
+            windows.append((rows, cols))
+    return bounds, windows
+
+def tiled_elevation_models(path, grid, tiles, region=None, chunk_size=1_000_000, workers=None):
+    """
+    Spill the points into a (columns, rows) grid of temporary tiles, then grid
+    the tiles in parallel. Yields (row slice, column slice, models) per tile
+    as soon as it is done, with at most `workers` tiles of grids in memory at
+    once. DTM gaps are filled within their tile.
+    """
+    bounds, windows = aligned_tiling(grid, tiles)
+    workers = workers or os.cpu_count() or 1
+
+    tmp_dir = tempfile.mkdtemp(prefix="mylidar_tiles_")
+    try:
+        split_into_tiles(path, bounds, tiles, tmp_dir, region, chunk_size)
+
+        def tile_models(tile):
+            rows, cols = windows[tile]
+            models = elevation_models(split_tile_path(tmp_dir, tile), grid.window(rows, cols), chunk_size=chunk_size)
+            return rows, cols, models
+
+        tiles_with_points = [
+            tile for tile, (rows, cols) in enumerate(windows)
+            if rows.stop > rows.start and cols.stop > cols.start and os.path.exists(split_tile_path(tmp_dir, tile))
+        ]
+        # laspy decoding and the numpy sorts release the GIL, threads are enough to use every core.
+        # At most `workers` tiles are queued, finished grids are handed over before more are started.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for tile in tiles_with_points:
+                if len(pending) >= workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(tile_models, tile))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,111 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import header_wkt, read_header
+from ..memory_planner import TILED, plan_raster
+from ..processing_region.processing_region import region_for_file
+from ..raster_grid import RasterGrid
+from ..raster_io import GeoTiffWriter, write_geotiff
+from .elevation_models_dialog import ElevationModelsDialog
+from .elevation_functions import NODATA, elevation_models, tiled_elevation_models
+
+# ------------------------
+# --- Elevation Models ---
+# ------------------------
+
+MODEL_NAMES = {"dtm": "DTM", "dsm": "DSM", "chm": "CHM"}
+
+def generate_elevation_models(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select Classified LiDAR File',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dlg = ElevationModelsDialog(self.iface.mainWindow())
+    if dlg.exec_() != QDialog.Accepted:
+        return
+    cell_size = dlg.get_cell_size()
+    models = dlg.selected_models()
+
+    output_dir = QFileDialog.getExistingDirectory(
+        self.iface.mainWindow(),
+        'Select Output Folder for the Rasters',
+        os.path.dirname(filename)
+    )
+    if not output_dir:
+        return
+
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    paths = {model: os.path.join(output_dir, f"{stem}_{model}.tif") for model in models}
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Elevation Models")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        header = read_header(filename)
+        wkt = header_wkt(header)
+        region = region_for_file(self, filename)
+        grid = RasterGrid.for_header(header, cell_size, region)
+        # Tiles are gridded in parallel, each worker gets its share of the memory budget
+        workers = os.cpu_count() or 1
+        plan = plan_raster(grid.shape, self.memory_budget // workers)
+
+        if plan.strategy == TILED:
+            # Grids larger than the budget are written window by window as the tiles complete
+            writers = {
+                model: GeoTiffWriter(path, grid.shape, grid.geotransform, wkt, nodata=NODATA)
+                for model, path in paths.items()
+            }
+            try:
+                with profiler.stage("Tiled gridding", points=header.point_count):
+                    for rows, cols, rasters in tiled_elevation_models(
+                        filename, grid, plan.grid, region, workers=workers
+                    ):
+                        for model, writer in writers.items():
+                            writer.write(rasters[model], rows.start, cols.start)
+            finally:
+                for writer in writers.values():
+                    writer.close()
+        else:
+            with profiler.stage("Grid elevations", points=header.point_count):
+                rasters = elevation_models(filename, grid, region)
+            with profiler.stage("Write rasters"):
+                for model, path in paths.items():
+                    write_geotiff(path, rasters[model], grid.geotransform, wkt, nodata=NODATA)
+
+        for model, path in paths.items():
+            self.iface.addRasterLayer(path, f"{stem} {MODEL_NAMES[model]}")
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Elevation Models Complete",
+            f"Raster size: {grid.cols:,} x {grid.rows:,} cells of {cell_size:g} m\n\n"
+            + "\n".join(f"{MODEL_NAMES[model]}: {path}" for model, path in paths.items())
+            + f"\n\n{plan.describe('Grids')}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Generating Elevation Models",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
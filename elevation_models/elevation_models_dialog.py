@@ -0,0 +1,30 @@
+from PyQt5.QtWidgets import QDialog, QDialogButtonBox
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './elevation_models_form.ui'))
+
+class ElevationModelsDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+        self.checkboxes = {"dtm": self.checkDtm, "dsm": self.checkDsm, "chm": self.checkChm}
+        for checkbox in self.checkboxes.values():
+            checkbox.toggled.connect(self.update_ok_button)
+        self.update_ok_button()
+
+    def update_ok_button(self):
+        any_checked = bool(self.selected_models())
+        self.buttonBox.button(QDialogButtonBox.Ok).setEnabled(any_checked)
+        self.labelWarning.setText("" if any_checked else "No model selected.")
+
+    def selected_models(self):
+        return [name for name, checkbox in self.checkboxes.items() if checkbox.isChecked()]
+
+    def get_cell_size(self):
+        return self.spinCellSize.value()
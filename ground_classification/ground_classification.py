@@ -0,0 +1,144 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+import numpy as np
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, format_output_notes, read_header, read_las, resolve_output_path,
+    write_las
+)
+from ..memory_planner import IN_MEMORY, TILED, plan_execution, plan_raster
+from ..processing_region.processing_region import region_for_file
+from ..raster_grid import RasterGrid
+from .ground_classification_dialog import GroundClassificationDialog
+from .ground_functions import (
+    classify_ground_points, ground_surface, scan_minimum_grid, stream_ground_classification,
+    update_minimum_grid, window_sizes
+)
+
+# -----------------------------
+# --- Ground Classification ---
+# -----------------------------
+
+def classify_ground(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Classify Ground',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dlg = GroundClassificationDialog(self.iface.mainWindow())
+    if dlg.exec_() != QDialog.Accepted:
+        return
+    cell_size, slope, max_window, threshold = dlg.get_values()
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Ground Classification")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        grid = RasterGrid.for_header(header, cell_size, region)
+        # The points and the elevation grid get their own plans: the grid size depends on the cell size only
+        plan = plan_execution(header, "ground", self.memory_budget)
+        grid_plan = plan_raster(grid.shape, self.memory_budget, window_sizes(max_window, cell_size)[-1])
+        chunked = plan.strategy != IN_MEMORY
+
+        if chunked:
+            with profiler.stage("Scan minimum elevations", points=header.point_count):
+                minimum = scan_minimum_grid(filename, grid, region, plan.chunk_size)
+        else:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las = read_las(filename, region)
+                stage.points = len(las.points)
+
+            with profiler.stage("Grid minimum elevations", points=len(las.points)):
+                minimum = np.full(grid.shape, np.nan)
+                update_minimum_grid(minimum, grid, las.points)
+
+        if np.all(np.isnan(minimum)):
+            QMessageBox.warning(
+                self.iface.mainWindow(),
+                "No Candidate Points",
+                "No unclassified or ground points (classes 0, 1 and 2) found in the file."
+            )
+            return
+
+        with profiler.stage("Morphological filter"):
+            tiles = grid_plan.grid if grid_plan.strategy == TILED else None
+            surface = ground_surface(minimum, grid, cell_size, slope, max_window, tiles)
+
+        if chunked:
+            loading_dialog.hide()
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+            loading_dialog.show()
+            QApplication.processEvents()
+
+            with profiler.stage("Chunked classification") as stage:
+                with PointStreamWriter(output_path, header, self.output_options) as writer:
+                    num_ground = stream_ground_classification(
+                        filename, writer, grid, surface, threshold, region, plan.chunk_size
+                    )
+                stage.points = writer.points_written
+            num_points = writer.points_written
+            output_notes = writer.notes
+        else:
+            with profiler.stage("Classify points", points=len(las.points)):
+                num_ground = classify_ground_points(las.points, grid, surface, threshold)
+            num_points = len(las.points)
+
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+
+            with profiler.stage("Write output", points=num_points):
+                output_notes = write_las(las, output_path, self.output_options)
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Ground Classification Complete",
+            f"Total points: {num_points:,}\n"
+            f"Ground points (class 2): {num_ground:,} ({num_ground / max(num_points, 1):.1%})\n\n"
+            f"Updated file saved to:\n{output_path}\n\n"
+            f"{plan.describe('Points')}\n"
+            f"{grid_plan.describe('Elevation grid')}"
+            f"{format_output_notes(output_notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Classification",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Ground Classified File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["ground"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
@@ -0,0 +1,110 @@
+import numpy as np
+from scipy import ndimage
+
+from ..las_io import iter_chunks, scaled_axis
+from ..raster_grid import cell_minimum, fill_nearest
+from ..vegetation_classification.vegetation_functions import GROUND_CLASS
+
+# ------------------------------------------
+# --- Ground Classification (Processing) ---
+# ------------------------------------------
+
+UNCLASSIFIED_CLASS = 1
+# Never classified, unclassified and ground points are filtered, other classes (noise, buildings...) are left as they are
+CANDIDATE_CLASSES = (0, 1, 2)
+
+INITIAL_THRESHOLD = 0.5     # Elevation difference threshold of the smallest window (m)
+MAX_THRESHOLD = 3.0         # Cap of the elevation difference threshold (m)
+
+def window_sizes(max_window, cell_size):
+    # Exponentially growing odd windows, in cells: 3, 5, 9, 17... up to `max_window` meters
+    max_cells = max(3, int(max_window / cell_size))
+    sizes = []
+    k = 0
+    while 2 * 2 ** k + 1 <= max_cells:
+        sizes.append(2 * 2 ** k + 1)
+        k += 1
+    return sizes
+
+def morphological_ground(minimum, cell_size, slope, max_window):
+    """
+    Progressive morphological filter on a minimum elevation grid (NaN for the
+    empty cells). The surface is opened with growing square windows, cells
+    rising above the opened surface by more than the slope-dependent threshold
+    of the window are objects. Returns the ground surface: the minimum of the
+    ground cells, objects and empty cells filled from their nearest ground cell.
+    """
+    surface = fill_nearest(minimum)
+    if np.all(np.isnan(surface)):
+        return surface
+
+    objects = np.zeros(surface.shape, dtype=bool)
+    sizes = window_sizes(max_window, cell_size)
+    previous = sizes[0]
+    for size in sizes:
+        threshold = min(slope * (size - previous) * cell_size + INITIAL_THRESHOLD, MAX_THRESHOLD)
+        # Square windows are separable min/max filters, far cheaper than disks on large grids
+        opened = ndimage.grey_opening(surface, size=(size, size))
+        objects |= (surface - opened) > threshold
+        surface = opened
+        previous = size
+
+    return fill_nearest(np.where(objects, np.nan, minimum))
+
+def ground_surface(minimum, grid, cell_size, slope, max_window, tiles=None):
+    """
+    Ground surface of the whole grid, filtered at once or over a (columns, rows)
+    tiling whose tiles overlap by the largest window, so the openings match
+    the untiled ones away from the empty areas.
+    """
+    if tiles is None:
+        return morphological_ground(minimum, cell_size, slope, max_window)
+
+    surface = np.empty_like(minimum)
+    buffer_cells = window_sizes(max_window, cell_size)[-1]
+    for core, buffered, core_in_buffered in grid.windows(tiles, buffer_cells):
+        surface[core] = morphological_ground(minimum[buffered], cell_size, slope, max_window)[core_in_buffered]
+    return surface
+
+def candidate_xyz(points):
+    # Absolute coordinates of the points the filter may classify, scaled from the selected integers only
+    candidates = np.isin(points.classification, CANDIDATE_CLASSES)
+    xyz = [scaled_axis(points, axis, mask=candidates) for axis in "xyz"]
+    return candidates, xyz
+
+def update_minimum_grid(minimum, grid, points):
+    candidates, (x, y, z) = candidate_xyz(points)
+    if np.any(candidates):
+        cell_minimum(minimum.ravel(), grid.cells(x, y), z)
+
+def classify_ground_points(points, grid, surface, threshold):
+    """
+    Candidates within `threshold` of the ground surface become ground (class 2),
+    former ground points off the surface become unclassified (class 1).
+    Returns the number of ground points.
+    """
+    candidates, (x, y, z) = candidate_xyz(points)
+    if not np.any(candidates):
+        return 0
+    is_ground = np.abs(z - grid.sample(surface, x, y)) <= threshold    # NaN surface (no data) is never ground
+    classes = np.asarray(points.classification[candidates])
+    classes = np.where(is_ground, GROUND_CLASS, np.where(classes == GROUND_CLASS, UNCLASSIFIED_CLASS, classes))
+    points.classification[candidates] = classes.astype(np.uint8)
+    return int(np.count_nonzero(is_ground))
+
+# --- Chunked execution ---
+
+def scan_minimum_grid(path, grid, region=None, chunk_size=1_000_000):
+    """First pass of the chunked classification: minimum candidate elevation of every cell."""
+    minimum = np.full(grid.shape, np.nan)
+    for points in iter_chunks(path, region, chunk_size):
+        update_minimum_grid(minimum, grid, points)
+    return minimum
+
+def stream_ground_classification(path, writer, grid, surface, threshold, region=None, chunk_size=1_000_000):
+    """Classify the points chunk by chunk against `surface` and stream them to `writer`. Returns the ground count."""
+    num_ground = 0
+    for points in iter_chunks(path, region, chunk_size):
+        num_ground += classify_ground_points(points, grid, surface, threshold)
+        writer.write(points)
+    return num_ground
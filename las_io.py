@@ -0,0 +1,521 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import laspy
+from laspy import DecompressionSelection, LazBackend
+from laspy.copc import Bounds, CopcReader
+import numpy as np
+
+# PDAL bindings are optional: COPC writing falls back to the pdal command line tool
+try:
+    import pdal
+except ImportError:
+    pdal = None
+
+# ---------------------------
+# --- LAS/LAZ/COPC I/O ---
+# ---------------------------
+
+COPC_SUFFIX = ".copc.laz"
+CHUNK_SIZE = 1_000_000
+LIDAR_FILTER = 'LiDAR Files (*.las *.laz)'
+OUTPUT_FILTER = 'LAZ Files (*.laz);;LAS Files (*.las);;COPC Files (*.copc.laz)'
+
+# Point formats sharing a record layout family, a format can only be narrowed within its family
+POINT_FORMAT_FAMILIES = ((0, 1, 2, 3, 4, 5), (6, 7, 8, 9, 10))
+
+# Suffixes the commands append to the input name for their default output file
+OUTPUT_SUFFIXES = {
+    "outliers": "_cleaned",
+    "overlap": "_non_overlap",
+    "vegetation": "_classified_vegetation",
+    "ground": "_ground",
+    "noise": "_noise",
+    "duplicates": "_dedup",
+    "thinning": "_thinned",
+    "change": "_c2c",
+    "pipeline": "_processed",
+}
+PARTIAL_MARKER = ".partial."    # Outputs still being written, renamed when complete
+
+def is_copc_path(path):
+    return path.lower().endswith(COPC_SUFFIX)
+
+def is_derived_output(path):
+    """True for the outputs of the commands (by their default name) and for partial outputs."""
+    name = os.path.basename(path).lower()
+    stem = name[:-len(COPC_SUFFIX)] if name.endswith(COPC_SUFFIX) else os.path.splitext(name)[0]
+    return PARTIAL_MARKER in name or stem.endswith(tuple(OUTPUT_SUFFIXES.values()))
+
+def resolve_output_path(path, selected_filter=""):
+    # The selected filter decides the format, whatever extension the user typed
+    base = path[:-len(COPC_SUFFIX)] if is_copc_path(path) else os.path.splitext(path)[0]
+    if selected_filter.startswith("COPC"):
+        return base + COPC_SUFFIX
+    if selected_filter.startswith("LAS"):
+        return base + ".las"
+    if selected_filter.startswith("LAZ"):
+        return base + ".laz"
+    return path
+
+def is_copc_file(path):
+    try:
+        with CopcReader.open(path):
+            return True
+    except Exception:
+        return False
+
+# --- Writing ---
+
+class OutputOptions:
+    def __init__(self, prune_dimensions=False, parallel_compression=True):
+        self.prune_dimensions = prune_dimensions            # Drop unused extra bytes and narrow the point format
+        self.parallel_compression = parallel_compression    # Compress LAZ chunks on all cores
+
+def write_las(las, path, options=None):
+    """Write `las` as LAS, LAZ or COPC depending on `path`. Returns notes about the size optimizations applied."""
+    options = options or OutputOptions()
+    notes = []
+    if options.prune_dimensions:
+        las, notes = prune_dimensions(las)
+
+    if is_copc_path(path):
+        write_copc(las, path)
+    elif path.lower().endswith(".laz"):
+        parallel = options.parallel_compression and LazBackend.LazrsParallel.is_available()
+        las.write(path, do_compress=True, laz_backend=LazBackend.LazrsParallel if parallel else LazBackend.Lazrs)
+    else:
+        las.write(path, do_compress=False)
+    return notes
+
+def prune_dimensions(las):
+    """
+    Drop the dimensions carrying no information: all-zero extra bytes, and
+    standard dimensions (GPS time, RGB, NIR, waveform) that can be removed by
+    narrowing the point format within its family without losing any value.
+    `las` is left as it is, the pruned points are a new LasData.
+    """
+    notes = []
+
+    empty_extra = [name for name in las.point_format.extra_dimension_names if not np.any(las[name])]
+    if empty_extra:
+        # A header copy sharing the records, removing the dimensions builds new records for it alone
+        las = laspy.LasData(las.header.copy(), las.points)
+        las.remove_extra_dims(empty_extra)
+        notes.append(f"Removed empty extra dimensions: {', '.join(empty_extra)}")
+
+    current = las.point_format
+    current_dims = set(current.standard_dimension_names)
+    family = next(f for f in POINT_FORMAT_FAMILIES if current.id in f)
+
+    best = current
+    zero_dims = {}
+    for format_id in family:
+        candidate = laspy.PointFormat(format_id)
+        candidate_dims = set(candidate.standard_dimension_names)
+        if not candidate_dims <= current_dims or candidate.size >= best.size:
+            continue
+        dropped = current_dims - candidate_dims
+        for name in dropped:
+            if name not in zero_dims:
+                zero_dims[name] = not np.any(las[name])
+        if all(zero_dims[name] for name in dropped):
+            best = candidate
+
+    if best.id != current.id:
+        extra_dims = [
+            laspy.ExtraBytesParams(name=dim.name, type=dim.dtype, description=dim.description)
+            for dim in current.extra_dimensions
+        ]
+        converted = laspy.convert(las, point_format_id=best.id)
+        if extra_dims and not list(converted.point_format.extra_dimension_names):
+            # Older laspy versions drop extra bytes on conversion
+            converted.add_extra_dims(extra_dims)
+            for dim in extra_dims:
+                converted[dim.name] = las[dim.name]
+        notes.append(
+            f"Point format {current.id} -> {best.id} "
+            f"({current.size} -> {converted.point_format.size} bytes per point)"
+        )
+        las = converted
+
+    return las, notes
+
+def format_output_notes(notes):
+    if not notes:
+        return ""
+    return "\n\nOutput optimizations:\n" + "\n".join(f" - {note}" for note in notes)
+
+def write_copc(las, path):
+    """Write `las` as an octree-organized COPC file through PDAL (laspy can only read COPC)."""
+    # PDAL needs a file to index, so the points go through a temporary uncompressed LAS
+    tmp_dir = tempfile.mkdtemp(prefix="mylidar_copc_")
+    tmp_path = os.path.join(tmp_dir, "input.las")
+    try:
+        las.write(tmp_path)
+        las_file_to_copc(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def las_file_to_copc(las_path, path):
+    if pdal is not None:
+        pipeline = pdal.Pipeline(json.dumps([
+            {"type": "readers.las", "filename": las_path},
+            {"type": "writers.copc", "filename": path, "forward": "all"},
+        ]))
+        pipeline.execute()
+        return
+
+    pdal_cli = shutil.which("pdal")
+    if pdal_cli is None:
+        raise RuntimeError(
+            "COPC output requires PDAL. Install the PDAL Python bindings or "
+            "make the 'pdal' command available on the PATH."
+        )
+    subprocess.run(
+        [pdal_cli, "translate", las_path, path, "--writer", "writers.copc"],
+        check=True, capture_output=True
+    )
+
+class PointStreamWriter:
+    """
+    Writes points chunk by chunk, for outputs that never exist in memory as a
+    whole. Header bounds and counts are updated by laspy as points arrive.
+    COPC outputs are streamed to a temporary LAS and indexed on close.
+    """
+
+    def __init__(self, path, header, options=None):
+        options = options or OutputOptions()
+        self.path = path
+        self.points_written = 0
+        self.notes = []
+        self._tmp_dir = None
+        if options.prune_dimensions:
+            # Pruning needs every value of a dimension before the point format is chosen
+            self.notes.append("Dimension pruning is not applied to streamed outputs")
+
+        header = header.copy()
+        header.point_count = 0
+        if is_copc_path(path):
+            self._tmp_dir = tempfile.mkdtemp(prefix="mylidar_copc_")
+            self._writer = laspy.open(os.path.join(self._tmp_dir, "input.las"), mode="w", header=header, do_compress=False)
+        elif path.lower().endswith(".laz"):
+            parallel = options.parallel_compression and LazBackend.LazrsParallel.is_available()
+            backend = LazBackend.LazrsParallel if parallel else LazBackend.Lazrs
+            self._writer = laspy.open(path, mode="w", header=header, do_compress=True, laz_backend=backend)
+        else:
+            self._writer = laspy.open(path, mode="w", header=header, do_compress=False)
+
+    def write(self, points):
+        if len(points) == 0:
+            return
+        self._writer.write_points(points)
+        self.points_written += len(points)
+
+    def close(self):
+        self._writer.close()
+        if self._tmp_dir is not None:
+            try:
+                las_file_to_copc(os.path.join(self._tmp_dir, "input.las"), self.path)
+            finally:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+                self._tmp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Do not index or keep a partial output
+            self._writer.close()
+            if self._tmp_dir is not None:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+# --- Region of interest ---
+
+class Region:
+    """
+    Processing region in the CRS of the data: a bounding box plus optional
+    polygons, each a list of rings (the exterior, then its holes).
+    """
+
+    def __init__(self, bbox, polygons=None):
+        self.bbox = tuple(float(v) for v in bbox)  # (xmin, ymin, xmax, ymax)
+        self.polygons = [
+            [np.asarray(ring, dtype=np.float64) for ring in polygon] for polygon in polygons or []
+        ]
+
+    @property
+    def key(self):
+        # Hashable identity of the region, the polygons by a digest of their rings and vertices
+        digest = hashlib.sha1()
+        for polygon in self.polygons:
+            digest.update(np.array([len(polygon)] + [len(ring) for ring in polygon], dtype=np.int64).tobytes())
+            for ring in polygon:
+                digest.update(ring.tobytes())
+        return self.bbox, digest.hexdigest()
+
+    def intersects_bbox(self, xmin, ymin, xmax, ymax):
+        return not (
+            xmax < self.bbox[0] or xmin > self.bbox[2] or
+            ymax < self.bbox[1] or ymin > self.bbox[3]
+        )
+
+    def contains(self, x, y):
+        inside = (x >= self.bbox[0]) & (x <= self.bbox[2]) & (y >= self.bbox[1]) & (y <= self.bbox[3])
+        if not self.polygons or not np.any(inside):
+            return inside
+        # Point-in-polygon only for the points passing the bounding box test
+        candidates = np.flatnonzero(inside)
+        inside[candidates] = points_in_polygons(x[candidates], y[candidates], self.polygons)
+        return inside
+
+def points_in_polygons(x, y, polygons):
+    # Inside any of the polygons, so the areas shared by overlapping polygons stay inside
+    inside = np.zeros(len(x), dtype=bool)
+    for rings in polygons:
+        inside |= points_in_rings(x, y, rings)
+    return inside
+
+def points_in_rings(x, y, rings):
+    """
+    Vectorized crossing-number test with the even-odd rule over the rings
+    of one polygon, so its holes are handled without special cases.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    inside = np.zeros(len(x), dtype=bool)
+    for ring in rings:
+        x1, y1 = ring[:, 0], ring[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        # One pass per edge, vectorized over all points
+        for ex1, ey1, ex2, ey2 in zip(x1, y1, x2, y2):
+            if ey1 == ey2:
+                continue
+            crosses = (ey1 > y) != (ey2 > y)
+            x_cross = ex1 + (y - ey1) * (ex2 - ex1) / (ey2 - ey1)
+            inside ^= crosses & (x < x_cross)
+    return inside
+
+# --- Reading ---
+
+# Decoded column cache consulted by every read, None when disabled (see column_cache.py)
+_column_cache = None
+
+def set_column_cache(cache):
+    global _column_cache
+    _column_cache = cache
+
+def cached_columns(path):
+    # Columns of `path` when the cache is enabled and handles the file, decoded on first use
+    if _column_cache is None or not _column_cache.handles(path):
+        return None
+    return _column_cache.get(path)
+
+def read_las(path, region=None):
+    """Read a whole file, or only the points inside `region` when one is given."""
+    columns = cached_columns(path)
+    if columns is not None:
+        header = read_header(path)
+        if region is None:
+            return laspy.LasData(header, points=columns.records(header))
+        _check_region(header, region)
+        mask = columns.region_mask(region)
+        if not np.any(mask):
+            raise ValueError("No points were found inside the processing region.")
+        return _las_from_points(header, columns.records(header, mask))
+
+    if region is None:
+        # COPC files are valid LAZ 1.4, a full read does not need the octree
+        return laspy.read(path, laz_backend=LazBackend.Lazrs)
+
+    with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+        header = reader.header
+        _check_region(header, region)
+
+    if is_copc_file(path):
+        points, header = read_copc_region(path, bounds=region.bbox)
+        points = points[region.contains(points.x, points.y)]
+    else:
+        points = _read_region_chunks(path, header, region)
+
+    if len(points) == 0:
+        raise ValueError("No points were found inside the processing region.")
+    return _las_from_points(header, points)
+
+def read_dimensions(path, names, region=None):
+    """
+    Only the named dimensions of a file: raw fields, sub-fields such as
+    return_number or classification, or scaled x/y/z. With the column cache
+    only those columns are touched, and raw fields of a whole file are
+    returned as memory maps without any copy.
+    """
+    columns = cached_columns(path)
+    if columns is None:
+        las = read_las(path, region)
+        return {name: scaled_axis(las, name) if name in AXES else np.asarray(las.points[name]) for name in names}
+
+    selection = None
+    if region is not None:
+        _check_region(read_header(path), region)
+        selection = columns.region_mask(region)
+        if not np.any(selection):
+            raise ValueError("No points were found inside the processing region.")
+    return {name: columns.dimension(name, selection) for name in names}
+
+def read_header(path):
+    # Header only: point count, record size, bounds and VLRs, no point is decoded
+    with laspy.open(path) as reader:
+        return reader.header
+
+def iter_chunks(path, region=None, chunk_size=CHUNK_SIZE):
+    """Yield the points of a file chunk by chunk, restricted to `region` when one is given."""
+    columns = cached_columns(path)
+    if columns is not None:
+        yield from _iter_cached_chunks(read_header(path), columns, region, chunk_size)
+        return
+
+    with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+        for points in reader.chunk_iterator(chunk_size):
+            if region is not None:
+                points = points[region.contains(points.x, points.y)]
+                if len(points) == 0:
+                    continue
+            yield points
+
+def _iter_cached_chunks(header, columns, region, chunk_size):
+    for start in range(0, columns.point_count, chunk_size):
+        window = slice(start, start + chunk_size)
+        if region is None:
+            yield columns.records(header, window)
+            continue
+        # Only the X and Y pages of the chunk are read to test the region
+        inside = np.flatnonzero(region.contains(columns.dimension("x", window), columns.dimension("y", window)))
+        if len(inside):
+            yield columns.records(header, inside + start)
+
+def _check_region(header, region):
+    if not region.intersects_bbox(header.x_min, header.y_min, header.x_max, header.y_max):
+        raise ValueError("The file does not intersect the processing region.")
+
+def _read_region_chunks(path, header, region):
+    scales, offsets = header.scales, header.offsets
+    # LAZ point formats 6+ are layered: the XY layer can be decoded alone to find the chunks worth reading
+    layered = header.point_format.id >= 6 and path.lower().endswith(".laz")
+    selection = DecompressionSelection.xy_returns_channel() if layered else DecompressionSelection.all()
+
+    kept = []
+    selected_chunks = []
+    with laspy.open(path, laz_backend=LazBackend.Lazrs, decompression_selection=selection) as reader:
+        start = 0
+        for points in reader.chunk_iterator(CHUNK_SIZE):
+            count = len(points)
+            # Chunk bounds from the raw integer coordinates, cheaper than scaling every point
+            X, Y = points.X, points.Y
+            if region.intersects_bbox(
+                X.min() * scales[0] + offsets[0], Y.min() * scales[1] + offsets[1],
+                X.max() * scales[0] + offsets[0], Y.max() * scales[1] + offsets[1],
+            ):
+                mask = region.contains(points.x, points.y)
+                if np.any(mask):
+                    if layered:
+                        selected_chunks.append((start, count, mask))
+                    else:
+                        kept.append(points[mask])
+            start += count
+
+    if layered:
+        # Second pass: seek to the selected chunks only and decode all their dimensions
+        with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+            for start, count, mask in selected_chunks:
+                reader.seek(start)
+                kept.append(reader.read_points(count)[mask])
+
+    if not kept:
+        return laspy.ScaleAwarePointRecord.zeros(0, header=header)
+    return laspy.ScaleAwarePointRecord(
+        np.concatenate([p.array for p in kept]), header.point_format, scales, offsets
+    )
+
+def _las_from_points(header, points):
+    las = laspy.LasData(header.copy())
+    las.points = points
+    las.update_header()
+    return las
+
+def read_copc_region(path, bounds=None, level=None, resolution=None):
+    """
+    Read only the COPC octree nodes intersecting `bounds` ((xmin, ymin, xmax, ymax)
+    or 3D (mins, maxs)) up to the requested octree `level` or point `resolution`.
+    Returns the points and the header of the file.
+    """
+    query_bounds = None
+    if bounds is not None:
+        if len(bounds) == 4:
+            xmin, ymin, xmax, ymax = bounds
+            query_bounds = Bounds(mins=np.array([xmin, ymin]), maxs=np.array([xmax, ymax]))
+        else:
+            query_bounds = Bounds(mins=np.asarray(bounds[0]), maxs=np.asarray(bounds[1]))
+
+    # Nodes not intersecting the box are never fetched, laspy trims the points of the partially covered ones
+    with CopcReader.open(path) as reader:
+        points = reader.query(bounds=query_bounds, level=level, resolution=resolution)
+        header = reader.header
+    return points, header
+
+def header_wkt(header):
+    # WKT of the coordinate system VLR, None for files without a WKT CRS (e.g. GeoTIFF keys)
+    for vlr in header.vlrs:
+        if isinstance(vlr, laspy.vlrs.known.WktCoordinateSystemVlr):
+            return vlr.string.strip("\x00")
+    return None
+
+def filter_points(las, mask):
+    """New LasData holding the points selected by the boolean `mask`, with updated header bounds and counts."""
+    return _las_from_points(las.header, las.points[mask])
+
+# --- Coordinate access ---
+
+AXES = {"x": "X", "y": "Y", "z": "Z"}
+
+def local_coords(points, axes="xyz", mask=None, origin=None):
+    """
+    C-contiguous float64 (n, len(axes)) coordinates relative to a local origin,
+    filled axis by axis from the raw integer X/Y/Z fields of the point records.
+    Unlike np.vstack((las.x, las.y, las.z)).T there is no scaled copy per axis
+    and no stacked temporary, and the result can be handed to cKDTree without
+    another copy. `mask` selects points on the raw fields before scaling.
+    Returns the coordinates and the origin they are relative to.
+    """
+    points = getattr(points, "points", points)     # LasData or point record
+    indices = ["xyz".index(axis) for axis in axes]
+    scales = np.asarray(points.scales, dtype=np.float64)[indices]
+    offsets = np.asarray(points.offsets, dtype=np.float64)[indices]
+    raw = [points.array[AXES[axis]] for axis in axes]
+    if origin is None:
+        # Scaled minimum of the raw integers, keeping the float64 offsets small
+        origin = np.array([r.min() if len(r) else 0 for r in raw], dtype=np.float64) * scales + offsets
+
+    count = len(raw[0]) if mask is None else int(np.count_nonzero(mask))
+    coords = np.empty((count, len(axes)), dtype=np.float64)
+    for i, values in enumerate(raw):
+        if mask is not None:
+            values = values[mask]   # int32 selection, half the size of a scaled float64 one
+        np.multiply(values, scales[i], out=coords[:, i])
+        coords[:, i] += offsets[i] - origin[i]
+    return coords, origin
+
+def scaled_axis(points, axis, mask=None):
+    # Absolute float64 values of one axis, scaling only the selected raw integers
+    points = getattr(points, "points", points)
+    i = "xyz".index(axis)
+    values = points.array[AXES[axis]]
+    if mask is not None:
+        values = values[mask]
+    return values * np.float64(points.scales[i]) + np.float64(points.offsets[i])
@@ -0,0 +1,199 @@
+import math
+
+import numpy as np
+
+# psutil ships with QGIS on most platforms, the default budget falls back to a fixed size without it
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# ------------------------------------
+# --- Memory-Aware Execution Plans ---
+# ------------------------------------
+
+IN_MEMORY = "in-memory"
+CHUNKED = "chunked"
+TILED = "tiled"
+
+DEFAULT_BUDGET = 2 * 1024 ** 3     # Used when the available memory cannot be queried
+BUDGET_FRACTION = 0.5              # Share of the available memory granted by default
+MIN_CHUNK_SIZE = 100_000
+MAX_CHUNK_SIZE = 1_000_000
+MAX_TILES = 256
+
+# Bytes per point allocated by each command on top of the decoded point records
+#   coords:   float64 XYZ (24) or XY (16) arrays
+#   kd-tree:  cKDTree copy of the data plus its index array and nodes
+#   filtered: the records selected by the output mask are copied once more
+COMMAND_FOOTPRINTS = {
+    "outliers": {"coords": 24, "kdtree": 24 + 8 + 8, "masks": 9, "filtered": True},
+    "overlap": {"coords": 0, "kdtree": 0, "masks": 25, "filtered": True},
+    "vegetation": {"coords": 24, "kdtree": 24 + 8 + 8, "masks": 17, "filtered": False},
+    "buildings": {"coords": 16, "kdtree": 16 + 8 + 8, "masks": 9, "filtered": False},
+    "ground": {"coords": 24, "kdtree": 0, "masks": 8 + 8 + 8 + 2, "filtered": False},
+    "duplicates": {"coords": 0, "kdtree": 0, "masks": 8 + 8 + 8 + 1, "filtered": True},
+    "change": {"coords": 24, "kdtree": 24 + 8 + 8, "masks": 8 + 8 + 4, "filtered": True},
+    "noise": {"coords": 8, "kdtree": 0, "masks": 8 + 8 + 8 + 8, "filtered": False},
+}
+
+# Commands whose points can be handled independently, chunk by chunk
+CHUNKED_COMMANDS = ("overlap", "vegetation", "buildings", "ground", "duplicates")
+# Commands needing neighbors, split into buffered tiles when they do not fit
+TILED_COMMANDS = ("outliers", "change", "noise")
+
+DBSCAN_NEIGHBOR_BYTES = 8       # One int64 index per neighbor stored by DBSCAN
+DBSCAN_POINT_OVERHEAD = 112     # numpy array object holding each point's neighborhood
+RASTER_CELL_BYTES = 64          # float64 surfaces, masks and nearest-fill indices of grid filters
+
+def default_memory_budget():
+    if psutil is None:
+        return DEFAULT_BUDGET
+    return int(psutil.virtual_memory().available * BUDGET_FRACTION)
+
+def format_size(num_bytes):
+    value = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if value < 1024 or unit == "TB":
+            return f"{value:,.1f} {unit}"
+        value /= 1024
+
+def header_bounds(header):
+    return header.x_min, header.y_min, header.x_max, header.y_max
+
+def estimate_footprint(header, command):
+    """Estimated peak bytes of `command` on the whole file, from the header alone."""
+    footprint = COMMAND_FOOTPRINTS[command]
+    record_size = header.point_format.size
+    per_point = record_size + footprint["coords"] + footprint["kdtree"] + footprint["masks"]
+    if footprint["filtered"]:
+        per_point += record_size
+    return int(header.point_count * per_point)
+
+def pipeline_footprint(header, commands):
+    # One decode for the whole chain, the stages run one after another so only the largest one's arrays are live
+    record_size = header.point_format.size
+    footprints = [COMMAND_FOOTPRINTS[command] for command in commands]
+    per_point = record_size + 1 + max(
+        (footprint["coords"] + footprint["kdtree"] + footprint["masks"] for footprint in footprints), default=0
+    )
+    if any(footprint["filtered"] for footprint in footprints):
+        per_point += record_size
+    return int(header.point_count * per_point)
+
+def dbscan_footprint(num_points, bounds, eps):
+    # DBSCAN keeps the whole eps-neighborhood of every point in memory at once
+    xmin, ymin, xmax, ymax = bounds
+    density = num_points / max((xmax - xmin) * (ymax - ymin), 1e-9)
+    neighbors = density * math.pi * eps * eps
+    per_point = COMMAND_FOOTPRINTS["buildings"]["kdtree"] + DBSCAN_POINT_OVERHEAD + DBSCAN_NEIGHBOR_BYTES * neighbors
+    return int(num_points * per_point)
+
+class ExecutionPlan:
+    def __init__(self, strategy, estimated_bytes, budget, chunk_size=None, grid=None):
+        self.strategy = strategy
+        self.estimated_bytes = estimated_bytes
+        self.budget = budget
+        self.chunk_size = chunk_size    # Points per chunk for the chunked strategy
+        self.grid = grid                # (columns, rows) for the tiled strategy
+
+    @property
+    def fits(self):
+        return self.estimated_bytes <= self.budget
+
+    @property
+    def num_tiles(self):
+        return self.grid[0] * self.grid[1] if self.grid else 1
+
+    def describe(self, label="Execution"):
+        detail = ""
+        if self.strategy == CHUNKED:
+            detail = f" ({self.chunk_size:,} points per chunk)"
+        elif self.strategy == TILED:
+            detail = f" ({self.grid[0]} x {self.grid[1]} tiles)"
+        return (
+            f"{label}: {self.strategy}{detail}, estimated in-memory footprint "
+            f"{format_size(self.estimated_bytes)} for a {format_size(self.budget)} budget"
+        )
+
+def plan_execution(header, command, budget, tile_buffer=0.0):
+    """
+    Choose how `command` runs on the file described by `header`: in memory when
+    its estimated footprint fits the budget, chunk by chunk when its points are
+    independent, or over a grid of buffered tiles when it needs neighbors.
+    """
+    estimated = estimate_footprint(header, command)
+    if estimated <= budget:
+        return ExecutionPlan(IN_MEMORY, estimated, budget)
+
+    per_point = max(estimated / max(header.point_count, 1), 1.0)
+    if command in CHUNKED_COMMANDS:
+        # Chunks are sized so a few of them (read, masked, written) fit in the budget
+        chunk_size = int(np.clip(budget / (4 * per_point), MIN_CHUNK_SIZE, MAX_CHUNK_SIZE))
+        return ExecutionPlan(CHUNKED, estimated, budget, chunk_size=chunk_size)
+
+    grid = tile_grid(header_bounds(header), estimated, budget, tile_buffer)
+    return ExecutionPlan(TILED, estimated, budget, grid=grid)
+
+def plan_pipeline(header, commands, budget):
+    """
+    In-memory plan of the processing pipeline chaining `commands`. The chain
+    shares a single decode and is never chunked or tiled, so the plan only
+    tells whether it fits the budget.
+    """
+    return ExecutionPlan(IN_MEMORY, pipeline_footprint(header, commands), budget)
+
+def plan_clustering(num_points, bounds, eps, budget, tile_buffer=0.0):
+    """In-memory or tiled DBSCAN for `num_points` points spread over `bounds`."""
+    estimated = dbscan_footprint(num_points, bounds, eps)
+    if estimated <= budget:
+        return ExecutionPlan(IN_MEMORY, estimated, budget)
+    return ExecutionPlan(TILED, estimated, budget, grid=tile_grid(bounds, estimated, budget, tile_buffer))
+
+def plan_pair(header_a, header_b, command, budget, tile_buffer=0.0):
+    """In-memory or tiled execution of `command` over two overlapping files read together."""
+    estimated = estimate_footprint(header_a, command) + estimate_footprint(header_b, command)
+    if estimated <= budget:
+        return ExecutionPlan(IN_MEMORY, estimated, budget)
+    (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = header_bounds(header_a), header_bounds(header_b)
+    bounds = (min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1))
+    return ExecutionPlan(TILED, estimated, budget, grid=tile_grid(bounds, estimated, budget, tile_buffer))
+
+def plan_raster(shape, budget, buffer_cells=0):
+    """In-memory or tiled filtering of a (rows, cols) grid, tiles overlapping by `buffer_cells`."""
+    rows, cols = shape
+    estimated = int(rows * cols * RASTER_CELL_BYTES)
+    if estimated <= budget:
+        return ExecutionPlan(IN_MEMORY, estimated, budget)
+    return ExecutionPlan(TILED, estimated, budget, grid=tile_grid((0, 0, cols, rows), estimated, budget, buffer_cells))
+
+def tile_grid(bounds, estimated, budget, tile_buffer=0.0):
+    # Near-square tiles, growing the grid until one tile and its buffer ring fit in the budget
+    xmin, ymin, xmax, ymax = bounds
+    width = max(xmax - xmin, 1e-9)
+    height = max(ymax - ymin, 1e-9)
+    num_tiles = max(2, math.ceil(estimated / budget))
+    while True:
+        cols = max(1, round(math.sqrt(num_tiles * width / height)))
+        rows = max(1, math.ceil(num_tiles / cols))
+        buffered_share = (
+            (width / cols + 2 * tile_buffer) * (height / rows + 2 * tile_buffer) / (width * height)
+        )
+        if estimated * buffered_share <= budget or cols * rows >= MAX_TILES:
+            return cols, rows
+        num_tiles = cols * rows + 1
+
+def tile_bounds(bounds, grid):
+    """(xmin, ymin, xmax, ymax) of every tile of a (columns, rows) grid over `bounds`."""
+    cols, rows = grid
+    xs = np.linspace(bounds[0], bounds[2], cols + 1)
+    ys = np.linspace(bounds[1], bounds[3], rows + 1)
+    return [(xs[c], ys[r], xs[c + 1], ys[r + 1]) for c in range(cols) for r in range(rows)]
+
+def tile_ids(x, y, bounds, grid):
+    # Index in tile_bounds() order of the tile holding each point, edge points go to the last tile
+    cols, rows = grid
+    xmin, ymin, xmax, ymax = bounds
+    col = np.clip(((x - xmin) / max(xmax - xmin, 1e-9) * cols).astype(np.int64), 0, cols - 1)
+    row = np.clip(((y - ymin) / max(ymax - ymin, 1e-9) * rows).astype(np.int64), 0, rows - 1)
+    return col * rows + row
@@ -30,6 +30,22 @@ from .overlap_removal.overlap_removal import remove_overlap
 from .building_count.building_count import count_buildings
 from .statistics_generation.statistics_generation import generate_statistics
 from .vegetation_classification.vegetation_classification import classify_vegetation
+from .profiling import export_last_profile
+from .copc_preview.copc_preview import preview_copc
+from .processing_region.processing_region import set_processing_region
+from .processing_pipeline.processing_pipeline import run_processing_pipeline
+from .output_settings.output_settings import edit_output_settings
+from .las_io import OutputOptions
+from .memory_planner import default_memory_budget
+from .ground_classification.ground_classification import classify_ground
+from .noise_classification.noise_classification import classify_noise
+from .elevation_models.elevation_models import generate_elevation_models
+from .duplicate_removal.duplicate_removal import remove_duplicates
+from .thinning.thinning import thin_points
+from .retiling.retiling import split_or_merge_tiles
+from .change_detection.change_detection import detect_changes
+from .batch_processing.batch_processing import run_batch_processing
+from .tree_count.tree_count import count_trees
 
 # -----------------------------
 # --- My LiDAR Plugin Class ---
@@ -44,6 +60,26 @@ class MyLiDARPlugin:
         self.fourth_action = None
         self.fifth_action = None
         self.sixth_action = None
+        self.seventh_action = None
+        self.eighth_action = None
+        self.ninth_action = None
+        self.tenth_action = None
+        self.eleventh_action = None
+        self.twelfth_action = None
+        self.thirteenth_action = None
+        self.fourteenth_action = None
+        self.fifteenth_action = None
+        self.sixteenth_action = None
+        self.seventeenth_action = None
+        self.eighteenth_action = None
+        self.nineteenth_action = None
+        self.twentieth_action = None
+        self.last_profiler = None   # Stage profile of the most recent command run
+        self.processing_region = None   # None, ("canvas", None) or ("polygons", layer_id)
+        self.output_options = OutputOptions()   # Size optimizations applied to every written point cloud
+        self.memory_budget = default_memory_budget()    # Above this estimated footprint commands run chunked or tiled
+        self.outlier_tuning_cache = None    # (key, las, coords, origin, tuning model) of the last tuned file
+        self.column_cache = None    # Decoded LAZ columns reused by every read, set in the output settings
 
     def tr(self, message):
         return QCoreApplication.translate('LiDAR Document Generator', message)
@@ -55,6 +91,7 @@ class MyLiDARPlugin:
         building_icon_path = os.path.join(self.plugin_dir, 'icons/building.png')
         vegetation_icon_path = os.path.join(self.plugin_dir, 'icons/vegetation.png')
         statistics_icon_path = os.path.join(self.plugin_dir, 'icons/statistics.png')
+        start_icon_path = os.path.join(self.plugin_dir, 'icons/start.png')
 
         self.menu = QMenu(self.tr("MyLiDAR"), self.iface.mainWindow().menuBar())
         self.iface.mainWindow().menuBar().insertMenu(
@@ -77,19 +114,77 @@ class MyLiDARPlugin:
         self.iface.addToolBarIcon(self.third_action)
         self.menu.addAction(self.third_action)
 
+        self.fourteenth_action = QAction(QIcon(cleanup_icon_path), self.tr('Remove duplicate points'), self.iface.mainWindow())
+        self.fourteenth_action.triggered.connect(self.duplicate_removal)
+        self.menu.addAction(self.fourteenth_action)
+
+        self.fifteenth_action = QAction(QIcon(cleanup_icon_path), self.tr('Thin point cloud'), self.iface.mainWindow())
+        self.fifteenth_action.triggered.connect(self.thinning)
+        self.menu.addAction(self.fifteenth_action)
+
+        self.sixteenth_action = QAction(QIcon(overlap_icon_path), self.tr('Split or merge tiles'), self.iface.mainWindow())
+        self.sixteenth_action.triggered.connect(self.retiling)
+        self.menu.addAction(self.sixteenth_action)
+
         # Toolbar-only actions
         self.fourth_action = QAction(QIcon(building_icon_path), self.tr('Count buildings'), self.iface.mainWindow())
         self.fourth_action.triggered.connect(self.building_count)
         self.menu.addAction(self.fourth_action)
 
+        self.twentieth_action = QAction(QIcon(vegetation_icon_path), self.tr('Count trees'), self.iface.mainWindow())
+        self.twentieth_action.triggered.connect(self.tree_count)
+        self.menu.addAction(self.twentieth_action)
+
+        self.twelfth_action = QAction(QIcon(vegetation_icon_path), self.tr('Classify ground'), self.iface.mainWindow())
+        self.twelfth_action.triggered.connect(self.ground_classification)
+        self.menu.addAction(self.twelfth_action)
+
+        self.nineteenth_action = QAction(QIcon(cleanup_icon_path), self.tr('Classify noise'), self.iface.mainWindow())
+        self.nineteenth_action.triggered.connect(self.noise_classification)
+        self.menu.addAction(self.nineteenth_action)
+
         self.fifth_action = QAction(QIcon(vegetation_icon_path), self.tr('Classify vegetation'), self.iface.mainWindow())
         self.fifth_action.triggered.connect(self.vegetation_classification)
         self.menu.addAction(self.fifth_action)
 
+        self.thirteenth_action = QAction(QIcon(vegetation_icon_path), self.tr('Generate elevation models (DTM/DSM/CHM)'), self.iface.mainWindow())
+        self.thirteenth_action.triggered.connect(self.elevation_models)
+        self.menu.addAction(self.thirteenth_action)
+
+        self.seventeenth_action = QAction(QIcon(statistics_icon_path), self.tr('Detect changes between epochs'), self.iface.mainWindow())
+        self.seventeenth_action.triggered.connect(self.change_detection)
+        self.menu.addAction(self.seventeenth_action)
+
         self.sixth_action = QAction(QIcon(statistics_icon_path), self.tr('View file statistics'), self.iface.mainWindow())
         self.sixth_action.triggered.connect(self.statistics_generation)
         self.menu.addAction(self.sixth_action)
 
+        self.eighth_action = QAction(QIcon(statistics_icon_path), self.tr('Preview COPC region'), self.iface.mainWindow())
+        self.eighth_action.triggered.connect(self.copc_preview)
+        self.menu.addAction(self.eighth_action)
+
+        self.tenth_action = QAction(QIcon(start_icon_path), self.tr('Run processing pipeline'), self.iface.mainWindow())
+        self.tenth_action.triggered.connect(self.processing_pipeline)
+        self.menu.addAction(self.tenth_action)
+
+        self.eighteenth_action = QAction(QIcon(start_icon_path), self.tr('Run batch on a folder of tiles'), self.iface.mainWindow())
+        self.eighteenth_action.triggered.connect(self.batch_processing)
+        self.menu.addAction(self.eighteenth_action)
+
+        # Menu-only actions
+        self.menu.addSeparator()
+        self.seventh_action = QAction(self.tr('Export last run profile'), self.iface.mainWindow())
+        self.seventh_action.triggered.connect(self.profile_export)
+        self.menu.addAction(self.seventh_action)
+
+        self.ninth_action = QAction(self.tr('Set processing region'), self.iface.mainWindow())
+        self.ninth_action.triggered.connect(self.processing_region_selection)
+        self.menu.addAction(self.ninth_action)
+
+        self.eleventh_action = QAction(self.tr('Output and memory settings'), self.iface.mainWindow())
+        self.eleventh_action.triggered.connect(self.output_settings)
+        self.menu.addAction(self.eleventh_action)
+
     def unload(self):
         self.menu.removeAction(self.action)
         self.menu.removeAction(self.secondary_action)
@@ -97,6 +192,20 @@ class MyLiDARPlugin:
         self.menu.removeAction(self.fourth_action)
         self.menu.removeAction(self.fifth_action)
         self.menu.removeAction(self.sixth_action)
+        self.menu.removeAction(self.seventh_action)
+        self.menu.removeAction(self.eighth_action)
+        self.menu.removeAction(self.ninth_action)
+        self.menu.removeAction(self.tenth_action)
+        self.menu.removeAction(self.eleventh_action)
+        self.menu.removeAction(self.twelfth_action)
+        self.menu.removeAction(self.thirteenth_action)
+        self.menu.removeAction(self.fourteenth_action)
+        self.menu.removeAction(self.fifteenth_action)
+        self.menu.removeAction(self.sixteenth_action)
+        self.menu.removeAction(self.seventeenth_action)
+        self.menu.removeAction(self.eighteenth_action)
+        self.menu.removeAction(self.nineteenth_action)
+        self.menu.removeAction(self.twentieth_action)
 
         self.iface.removeToolBarIcon(self.action)
         self.iface.removeToolBarIcon(self.secondary_action)
@@ -119,18 +228,74 @@ class MyLiDARPlugin:
     def overlap_removal(self):
         remove_overlap(self)
 
+    # --- Duplicate Removal ---
+    def duplicate_removal(self):
+        remove_duplicates(self)
+
+    # --- Thinning ---
+    def thinning(self):
+        thin_points(self)
+
+    # --- Retiling ---
+    def retiling(self):
+        split_or_merge_tiles(self)
+
     # --- Builing Count ---
     def building_count(self):
         count_buildings(self)
 
+    # --- Tree Count ---
+    def tree_count(self):
+        count_trees(self)
+
+    # --- Ground Classification ---
+    def ground_classification(self):
+        classify_ground(self)
+
+    # --- Noise Classification ---
+    def noise_classification(self):
+        classify_noise(self)
+
     # --- Vegetation Classification ---
     def vegetation_classification(self):
         classify_vegetation(self)
 
+    # --- Elevation Models ---
+    def elevation_models(self):
+        generate_elevation_models(self)
+
+    # --- Change Detection ---
+    def change_detection(self):
+        detect_changes(self)
+
+    # --- Batch Processing ---
+    def batch_processing(self):
+        run_batch_processing(self)
+
     # --- Statistics Generation ---
     def statistics_generation(self):
         generate_statistics(self)
 
+    # --- Processing Pipeline ---
+    def processing_pipeline(self):
+        run_processing_pipeline(self)
+
+    # --- COPC Preview ---
+    def copc_preview(self):
+        preview_copc(self)
+
+    # --- Profile Export ---
+    def profile_export(self):
+        export_last_profile(self)
+
+    # --- Processing Region ---
+    def processing_region_selection(self):
+        set_processing_region(self)
+
+    # --- Output Settings ---
+    def output_settings(self):
+        edit_output_settings(self)
+
     # --- Placeholder method ---
     def placeholder(self):
         QMessageBox.information(self.iface.mainWindow(), "Title", f"Coming soon!")
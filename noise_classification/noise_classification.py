@@ -0,0 +1,106 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    CHUNK_SIZE, OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, format_output_notes, read_header,
+    resolve_output_path
+)
+from ..memory_planner import TILED, plan_execution
+from ..processing_region.processing_region import region_for_file
+from ..raster_grid import RasterGrid
+from .noise_classification_dialog import NoiseClassificationDialog
+from .noise_functions import noise_limits, stream_noise_classification, surface_statistics
+
+# ----------------------------
+# --- Noise Classification ---
+# ----------------------------
+
+def classify_noise(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Classify Noise',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dlg = NoiseClassificationDialog(self.iface.mainWindow())
+    if dlg.exec_() != QDialog.Accepted:
+        return
+    cell_size, mad_factor, low_distance, high_distance = dlg.get_values()
+
+    output_path = _ask_output_path(self, filename)
+    if not output_path:
+        return
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Noise Classification")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        grid = RasterGrid.for_header(header, cell_size, region)
+        # Only the elevations are gathered per cell, the points themselves are always streamed
+        plan = plan_execution(header, "noise", self.memory_budget)
+        tiles = plan.grid if plan.strategy == TILED else None
+
+        with profiler.stage("Surface statistics", points=header.point_count):
+            surface, mad, used_ground = surface_statistics(filename, grid, region, CHUNK_SIZE, tiles)
+
+        with profiler.stage("Noise limits"):
+            low_limit, high_limit = noise_limits(surface, mad, mad_factor, low_distance, high_distance)
+
+        with profiler.stage("Classify noise") as stage:
+            with PointStreamWriter(output_path, header, self.output_options) as writer:
+                num_low, num_high = stream_noise_classification(
+                    filename, writer, grid, low_limit, high_limit, region, CHUNK_SIZE
+                )
+            stage.points = writer.points_written
+        num_points = writer.points_written
+
+        source = "ground points (class 2)" if used_ground else "lowest points, no ground class found"
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Noise Classification Complete",
+            f"Total points: {num_points:,}\n"
+            f"Low noise (class 7): {num_low:,} ({num_low / max(num_points, 1):.2%})\n"
+            f"High noise (class 18): {num_high:,} ({num_high / max(num_points, 1):.2%})\n"
+            f"Surface estimated from: {source}\n\n"
+            f"Updated file saved to:\n{output_path}\n\n"
+            f"{plan.describe('Surface statistics')}"
+            f"{format_output_notes(writer.notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Noise Classification",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Noise Classified File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["noise"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
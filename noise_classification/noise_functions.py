@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy import ndimage
+
+from ..elevation_models.elevation_functions import aligned_tiling
+from ..las_io import iter_chunks, scaled_axis
+from ..raster_grid import fill_nearest
+from ..tile_index import split_into_tiles, split_tile_path
+from ..vegetation_classification.vegetation_functions import GROUND_CLASS
+
+# -----------------------------------------
+# --- Noise Classification (Processing) ---
+# -----------------------------------------
+
+LOW_NOISE_CLASS = 7
+HIGH_NOISE_CLASS = 18
+MAD_TO_SIGMA = 1.4826   # Scales the median absolute deviation to a standard deviation for normal data
+# Surface of the files without ground class: a low percentile of every cell, opened to remove the buildings
+LOW_PERCENTILE = 5
+LOW_SURFACE_WINDOW = 60.0   # Widest object (m) cut out of that surface
+
+def sorted_cell_runs(cells, z):
+    # Points sorted by (cell, z), with the start and length of every cell's run
+    order = np.lexsort((z, cells))
+    sorted_cells, sorted_z = cells[order], z[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_cells)])
+    return sorted_cells, sorted_z, starts, counts
+
+def cell_median_mad(cells, z, shape):
+    """
+    Median and median absolute deviation of `z` in every cell of a (rows, cols)
+    grid, NaN for the empty cells. A single sort by (cell, z) lays every cell
+    out as a sorted run, its median is read at the middle of the run; the
+    deviations are sorted the same way for the MAD.
+    """
+    sorted_cells, sorted_z, starts, counts = sorted_cell_runs(cells, z)
+    low, high = starts + (counts - 1) // 2, starts + counts // 2     # The two middle values of even runs
+    medians = (sorted_z[low] + sorted_z[high]) / 2
+
+    deviations = np.abs(sorted_z - np.repeat(medians, counts))
+    # Stable on the already grouped cells, only the deviations within each run are reordered
+    deviations = deviations[np.lexsort((deviations, sorted_cells))]
+    mads = (deviations[low] + deviations[high]) / 2
+
+    median = np.full(shape, np.nan)
+    mad = np.full(shape, np.nan)
+    median.ravel()[sorted_cells[starts]] = medians
+    mad.ravel()[sorted_cells[starts]] = mads
+    return median, mad
+
+def cell_low_elevation(cells, z, shape):
+    # LOW_PERCENTILE elevation of every cell, NaN for the empty cells
+    sorted_cells, sorted_z, starts, counts = sorted_cell_runs(cells, z)
+    low = np.full(shape, np.nan)
+    low.ravel()[sorted_cells[starts]] = sorted_z[starts + (counts - 1) * LOW_PERCENTILE // 100]
+    return low
+
+def low_surface(low, cell_size):
+    """
+    Bare surface estimate from the low elevation grid of all the points: the
+    grid is opened with a LOW_SURFACE_WINDOW wide window, so the cells
+    covered by a roof take the elevation of the ground around the building.
+    The opening never raises a cell, the pits of low noise stay below it.
+    """
+    filled = fill_nearest(low)
+    if np.all(np.isnan(filled)):
+        return low
+    size = 2 * int(LOW_SURFACE_WINDOW / (2 * cell_size)) + 1
+    return np.where(np.isnan(low), np.nan, ndimage.grey_opening(filled, size=(size, size)))
+
+def cell_elevations(path, grid, region=None, chunk_size=1_000_000, ground_only=True):
+    # Cell index and elevation of the ground points, or of every point
+    cells, elevations = [], []
+    for points in iter_chunks(path, region, chunk_size):
+        selected = points.classification == GROUND_CLASS if ground_only else None
+        if selected is not None and not np.any(selected):
+            continue
+        x, y, z = (scaled_axis(points, axis, mask=selected) for axis in "xyz")
+        cells.append(grid.cells(x, y))
+        elevations.append(z)
+    if not cells:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return np.concatenate(cells), np.concatenate(elevations)
+
+def surface_statistics(path, grid, region=None, chunk_size=1_000_000, tiles=None):
+    """
+    Surface and MAD elevation grids of the cells. The surface is the median
+    of the ground points (class 2) when the file has some. Otherwise it is
+    the low_surface() of every point, as the median of a cell covered by a
+    roof is the roof, and the ground beside the building would be noise.
+    With a (columns, rows) `tiles` grid, the points are first spilled into
+    temporary tiles aligned on the cells and every tile is reduced alone,
+    so only one tile of elevations is in memory at once.
+    Returns the surface and MAD grids and whether ground points were used.
+    """
+    tmp_dir = None
+    try:
+        if tiles is None:
+            sources = [((slice(0, grid.rows), slice(0, grid.cols)), grid, path, region)]
+        else:
+            bounds, windows = aligned_tiling(grid, tiles)
+            tmp_dir = tempfile.mkdtemp(prefix="mylidar_tiles_")
+            split_into_tiles(path, bounds, tiles, tmp_dir, region, chunk_size)
+            sources = [
+                ((rows, cols), grid.window(rows, cols), split_tile_path(tmp_dir, tile), None)
+                for tile, (rows, cols) in enumerate(windows)
+                if rows.stop > rows.start and cols.stop > cols.start and os.path.exists(split_tile_path(tmp_dir, tile))
+            ]
+
+        # The points are only read a second time when the file has no ground class
+        for ground_only in (True, False):
+            median = np.full(grid.shape, np.nan)
+            mad = np.full(grid.shape, np.nan)
+            low = np.full(grid.shape, np.nan)
+            for window, window_grid, source, source_region in sources:
+                cells, z = cell_elevations(source, window_grid, source_region, chunk_size, ground_only)
+                if len(cells):
+                    median[window], mad[window] = cell_median_mad(cells, z, window_grid.shape)
+                    if not ground_only:
+                        low[window] = cell_low_elevation(cells, z, window_grid.shape)
+            if ground_only and not np.all(np.isnan(median)):
+                return median, mad, True
+        # The opening runs on the whole grid once the tiles are gathered
+        return low_surface(low, grid.cell_size), mad, False
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def noise_limits(surface, mad, mad_factor, low_distance, high_distance):
+    """
+    Lowest and highest elevation a point of each cell can have without being
+    noise: `mad_factor` robust standard deviations from the cell surface, and
+    at least `low_distance` below or `high_distance` above it. Cells without
+    surface points take the statistics of their nearest cell.
+    """
+    surface = fill_nearest(surface)
+    spread = mad_factor * MAD_TO_SIGMA * fill_nearest(mad)
+    return surface - np.maximum(spread, low_distance), surface + np.maximum(spread, high_distance)
+
+def classify_noise_points(points, grid, low_limit, high_limit):
+    """
+    Points below the low limit of their cell become low noise (class 7), points
+    above the high limit high noise (class 18), the others keep their class.
+    Returns the number of low and high noise points.
+    """
+    x, y, z = (scaled_axis(points, axis) for axis in "xyz")
+    cells = grid.cells(x, y)
+    is_low = z < low_limit.ravel()[cells]   # NaN limits (no surface at all) never flag a point
+    is_high = z > high_limit.ravel()[cells]
+    if np.any(is_low):
+        points.classification[is_low] = LOW_NOISE_CLASS
+    if np.any(is_high):
+        points.classification[is_high] = HIGH_NOISE_CLASS
+    return int(np.count_nonzero(is_low)), int(np.count_nonzero(is_high))
+
+def stream_noise_classification(path, writer, grid, low_limit, high_limit, region=None, chunk_size=1_000_000):
+    """Classify the points chunk by chunk and stream them to `writer`. Returns the low and high noise counts."""
+    num_low = num_high = 0
+    for points in iter_chunks(path, region, chunk_size):
+        low, high = classify_noise_points(points, grid, low_limit, high_limit)
+        num_low += low
+        num_high += high
+        writer.write(points)
+    return num_low, num_high
@@ -0,0 +1,143 @@
+import shutil
+import tempfile
+
+import laspy
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..las_io import local_coords
+from ..memory_planner import header_bounds
+from ..tile_index import TileIndex, split_into_tiles
+
+# -----------------------------------
+# --- Outlier Removal (Processing) ---
+# -----------------------------------
+
+def build_neighbor_tree(coords, buffer_coords=None):
+    # Points from adjacent tiles take part in the neighbor counts but are never filtered themselves
+    if buffer_coords is not None and len(buffer_coords) > 0:
+        coords = np.vstack((coords, buffer_coords))
+    return cKDTree(coords)
+
+def neighbor_mask(tree, coords, radius, min_neighbors):
+    # True for the points with enough neighbors (themselves included) within the radius
+    neighbor_counts = tree.query_ball_point(coords, r=radius, return_length=True)
+    return neighbor_counts >= min_neighbors
+
+def remove_outliers_tiled(path, writer, radius, min_neighbors, grid, region=None, buffer_coords=None):
+    """
+    Outlier removal for files exceeding the memory budget: the file is spilled
+    into a (columns, rows) grid of temporary tiles, and each tile is filtered
+    with the points of its neighbors within the radius, so results match the
+    in-memory run. Kept points are streamed to `writer`. Returns the number of
+    points read and kept.
+    """
+    with laspy.open(path) as reader:
+        header = reader.header
+
+    tmp_dir = tempfile.mkdtemp(prefix="mylidar_tiles_")
+    num_points = 0
+    num_kept = 0
+    try:
+        tile_paths = split_into_tiles(path, header_bounds(header), grid, tmp_dir, region)
+        index = TileIndex.from_files(tile_paths)
+        for tile_path in tile_paths:
+            tile_las = laspy.read(tile_path)
+            coords, origin = local_coords(tile_las)
+            neighbor_coords, _ = index.read_buffer_points(tile_path, radius)
+            if buffer_coords is not None and len(buffer_coords) > 0:
+                # Points of adjacent files near this tile
+                tile = index.tile_for(tile_path)
+                near = np.all(
+                    (buffer_coords[:, :2] >= tile.mins[:2] - radius) & (buffer_coords[:, :2] <= tile.maxs[:2] + radius),
+                    axis=1
+                )
+                neighbor_coords = np.vstack((neighbor_coords, buffer_coords[near]))
+
+            tree = build_neighbor_tree(coords, neighbor_coords - origin)
+            mask = neighbor_mask(tree, coords, radius, min_neighbors)
+            writer.write(tile_las.points[mask])
+            num_points += len(coords)
+            num_kept += int(np.sum(mask))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return num_points, num_kept
+
+# --- Interactive parameter tuning ---
+
+MAX_TUNING_NEIGHBORS = 50   # Upper bound of the minimum neighbors spin box
+
+class OutlierTuningModel:
+    """
+    Neighbor index built once per file for live parameter tuning.
+
+    The distances from a random sample of points to their k nearest neighbors
+    are computed up front, so the outcome of any (radius, min_neighbors) pair
+    is a single vectorized comparison: a point keeps its place when its
+    min_neighbors-th neighbor (itself included) lies within the radius.
+
+    With index_fraction < 1 only a random subset of the cells of a coarse grid
+    is indexed, at full density, and samples closer to a cell edge than the
+    radius are ignored, so the estimate is not biased by missing neighbors.
+    """
+
+    def __init__(self, coords, sample_size=100_000, index_fraction=1.0, seed=0):
+        rng = np.random.default_rng(seed)
+        self.num_points = len(coords)
+        self.index_fraction = min(max(index_fraction, 0.0), 1.0)
+
+        if self.index_fraction < 1.0:
+            index_idx, edge_distance = _sample_grid_cells(coords, self.index_fraction, rng)
+            index_coords = coords[index_idx]
+        else:
+            index_idx = None
+            index_coords = coords
+            edge_distance = None
+        self.tree = cKDTree(index_coords)
+
+        # Sampled points belong to the index, so each one counts itself like in query_ball_point
+        sample_size = min(sample_size, len(index_coords))
+        sample = np.sort(rng.choice(len(index_coords), size=sample_size, replace=False))
+        self.sample_coords = index_coords[sample]
+        self.sample_edge_distance = (
+            np.full(sample_size, np.inf) if edge_distance is None else edge_distance[sample]
+        )
+
+        k = min(MAX_TUNING_NEIGHBORS, self.tree.n)
+        distances, _ = self.tree.query(self.sample_coords, k=k, workers=-1)
+        self.kth_distances = np.asarray(distances, dtype=np.float64).reshape(sample_size, k)
+
+    @property
+    def is_full_index(self):
+        return self.index_fraction >= 1.0
+
+    def evaluate(self, radius, min_neighbors):
+        """Sampled points usable at this radius and the mask of the ones that would be removed."""
+        valid = self.sample_edge_distance >= radius
+        if min_neighbors > self.kth_distances.shape[1]:
+            return self.sample_coords[valid], np.ones(int(np.sum(valid)), dtype=bool)
+        return self.sample_coords[valid], self.kth_distances[valid, min_neighbors - 1] > radius
+
+    def estimate(self, radius, min_neighbors):
+        # Estimated fraction and number of removed points over the whole file
+        _, removed = self.evaluate(radius, min_neighbors)
+        if len(removed) == 0:
+            return None, None
+        fraction = float(np.mean(removed))
+        return fraction, int(round(fraction * self.num_points))
+
+def _sample_grid_cells(coords, fraction, rng, grid_size=8):
+    # Random cells of a grid_size x grid_size grid covering `fraction` of the tile, kept at full density
+    mins = coords[:, :2].min(axis=0)
+    cell = np.maximum((coords[:, :2].max(axis=0) - mins) / grid_size, np.finfo(np.float64).eps)
+    col_row = np.minimum(((coords[:, :2] - mins) / cell).astype(np.int64), grid_size - 1)
+    cell_ids = col_row[:, 0] * grid_size + col_row[:, 1]
+
+    num_cells = max(1, int(round(grid_size * grid_size * fraction)))
+    chosen = rng.choice(grid_size * grid_size, size=num_cells, replace=False)
+    index_idx = np.flatnonzero(np.isin(cell_ids, chosen))
+
+    # Distance to the closest edge of the point's own cell
+    local = coords[index_idx, :2] - mins - col_row[index_idx] * cell
+    edge_distance = np.minimum(local, cell - local).min(axis=1)
+    return index_idx, edge_distance
@@ -5,14 +5,21 @@ from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtTest import QTest
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
 import numpy as np
-from scipy.spatial import cKDTree
 
 from .outlier_removal_dialog import OutlierRemovalDialog
+from .outlier_tuning_dialog import OutlierTuningDialog
+from .outlier_functions import OutlierTuningModel, build_neighbor_tree, neighbor_mask, remove_outliers_tiled
 
 from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, filter_points, format_output_notes, local_coords, read_header,
+    read_las, resolve_output_path, write_las
+)
+from ..memory_planner import IN_MEMORY, plan_execution
+from ..processing_region.processing_region import region_for_file
+from ..tile_index import load_adjacent_points
 
 # -----------------------
 # --- Outlier Removal ---
@@ -33,7 +40,11 @@ def remove_outliers(self):
         return
 
     radius, min_neighbors = dialog.get_values()
+    use_adjacent_tiles = dialog.use_adjacent_tiles()
+    tuning, index_fraction = dialog.get_tuning()
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Outlier Removal")
+    self.last_profiler = profiler
 
     try:
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -42,13 +53,101 @@ def remove_outliers(self):
         QApplication.processEvents()
         QTest.qWait(100)
 
-        las = laspy.read(filename, laz_backend=LazBackend.Lazrs) # This call takes some time
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        cache_key = (
+            os.path.abspath(filename), os.path.getmtime(filename),
+            region.key if region is not None else None, index_fraction
+        )
+        if self.outlier_tuning_cache is not None and (not tuning or self.outlier_tuning_cache[0] != cache_key):
+            self.outlier_tuning_cache = None   # Release the last tuned file before reading another one
+        plan = plan_execution(header, "outliers", self.memory_budget, tile_buffer=radius)
+        if plan.strategy != IN_MEMORY:
+            # Too large for the memory budget: buffered tiles streamed straight to the output
+            buffer_coords = None
+            if use_adjacent_tiles:
+                with profiler.stage("Read adjacent tiles") as stage:
+                    buffer_coords, _ = load_adjacent_points(filename, radius)
+                    stage.points = len(buffer_coords)
+
+            loading_dialog.hide()
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+            loading_dialog.show()
+            QApplication.processEvents()
+
+            with profiler.stage("Tiled outlier removal") as stage:
+                with PointStreamWriter(output_path, header, self.output_options) as writer:
+                    num_points, num_remaining = remove_outliers_tiled(
+                        filename, writer, radius, min_neighbors, plan.grid, region, buffer_coords
+                    )
+                stage.points = num_points
+            if num_remaining == 0:
+                # The count is only known once every tile is streamed, the empty output is not kept
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                raise ValueError("All points were classified as outliers — no data would remain.")
+
+            tuning_note = "Interactive tuning needs in-memory execution and was skipped.\n" if tuning else ""
+            QMessageBox.information(
+                self.iface.mainWindow(),
+                "Outlier Removal Complete",
+                f"Removed {num_points - num_remaining:,} outlier points.\n"
+                f"Remaining: {num_remaining:,} points\n\n"
+                f"Filtered file saved to:\n{output_path}\n\n"
+                f"{tuning_note}{plan.describe()}"
+                f"{format_output_notes(writer.notes)}"
+            )
+            return
 
-        # Obtain coordinates and build a KD-tree for neighbor search
-        coords = np.vstack((las.x, las.y, las.z)).T
-        tree = cKDTree(coords)
-        neighbor_counts = tree.query_ball_point(coords, r=radius, return_length=True)
-        mask = neighbor_counts >= min_neighbors
+        cache = self.outlier_tuning_cache
+        model = None
+        if cache is not None:
+            # Same file, region and index sample as the last tuning run: nothing to read or index again
+            las, coords, origin, model = cache[1:]
+        else:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las = read_las(filename, region) # This call takes some time
+                stage.points = len(las.points)
+
+            # Local float64 coordinates straight from the integer fields, used by the KD-tree without a copy
+            coords, origin = local_coords(las)
+
+        if tuning:
+            if model is None:
+                with profiler.stage("Build tuning index") as stage:
+                    model = OutlierTuningModel(coords, index_fraction=index_fraction)
+                    stage.points = model.tree.n
+                self.outlier_tuning_cache = (cache_key, las, coords, origin, model)
+
+            loading_dialog.hide()
+            QApplication.restoreOverrideCursor()
+            tuning_dialog = OutlierTuningDialog(model, radius, min_neighbors, origin, self.iface.mainWindow())
+            accepted = tuning_dialog.exec_() == QDialog.Accepted
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            if not accepted:
+                return
+            radius, min_neighbors = tuning_dialog.get_values()
+            loading_dialog.show()
+            QApplication.processEvents()
+
+        buffer_coords = None
+        if use_adjacent_tiles:
+            # Points of neighboring tiles within the radius take part in the neighbor counts
+            with profiler.stage("Read adjacent tiles") as stage:
+                buffer_coords, _ = load_adjacent_points(filename, radius)
+                buffer_coords -= origin
+                stage.points = len(buffer_coords)
+
+        if model is not None and model.is_full_index and buffer_coords is None:
+            tree = model.tree   # The tuning index already holds every point
+        else:
+            with profiler.stage("Build KD-tree") as stage:
+                tree = build_neighbor_tree(coords, buffer_coords)
+                stage.points = tree.n
+        with profiler.stage("Query neighbors", points=len(coords)):
+            mask = neighbor_mask(tree, coords, radius, min_neighbors)
 
         # Create a mask for points with enough neighbors (min_neighbors)
         num_removed = np.sum(~mask)
@@ -57,44 +156,27 @@ def remove_outliers(self):
         if num_remaining == 0:
             raise ValueError("All points were classified as outliers — no data would remain.")
 
-        new_header = las.header.copy()
-        las_filtered = laspy.LasData(new_header)
-
-        # Filter points based on the mask
-        filtered_coords = coords[mask]
-
-        # Update header with new bounds
-        las_filtered.header.min = [
-            filtered_coords[:, 0].min(),
-            filtered_coords[:, 1].min(),
-            filtered_coords[:, 2].min()
-        ]
-        las_filtered.header.max = [
-            filtered_coords[:, 0].max(),
-            filtered_coords[:, 1].max(),
-            filtered_coords[:, 2].max()
-        ]
-        las_filtered.points = las.points[mask]
+        with profiler.stage("Filter points", points=int(num_remaining)):
+            # Boolean mask on the record buffer, header bounds come from the integer min/max
+            las_filtered = filter_points(las, mask)
 
         assert len(las_filtered.points) == np.sum(mask)
 
-        output_path, _ = QFileDialog.getSaveFileName(
-            self.iface.mainWindow(),
-            'Save Cleaned LiDAR File',
-            os.path.splitext(filename)[0] + '_cleaned.laz',
-            'LiDAR Files (*.las *.laz)'
-        )
+        output_path = _ask_output_path(self, filename)
         if not output_path:
             return
 
-        las_filtered.write(output_path)
+        with profiler.stage("Write output", points=int(num_remaining)):
+            output_notes = write_las(las_filtered, output_path, self.output_options)
 
         QMessageBox.information(
             self.iface.mainWindow(),
             "Outlier Removal Complete",
             f"Removed {num_removed:,} outlier points.\n"
             f"Remaining: {num_remaining:,} points\n\n"
-            f"Filtered file saved to:\n{output_path}"
+            f"Filtered file saved to:\n{output_path}\n\n"
+            f"{plan.describe()}"
+            f"{format_output_notes(output_notes)}"
         )
 
     except Exception as e:
@@ -107,3 +189,15 @@ def remove_outliers(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Cleaned LiDAR File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["outliers"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
@@ -10,6 +10,8 @@ class OutlierRemovalDialog(QDialog, FORM_CLASS):
         super().__init__(parent)
         self.setupUi(self)
 
+        self.checkTuning.toggled.connect(self.spinIndexPercent.setEnabled)
+
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
 
@@ -17,3 +19,10 @@ class OutlierRemovalDialog(QDialog, FORM_CLASS):
         radius = self.spinRadius.value()
         min_neighbors = self.spinMinNeighbors.value()
         return radius, min_neighbors
+
+    def use_adjacent_tiles(self):
+        return self.checkAdjacentTiles.isChecked()
+
+    def get_tuning(self):
+        # (enabled, fraction of the file indexed for the live preview)
+        return self.checkTuning.isChecked(), self.spinIndexPercent.value() / 100.0
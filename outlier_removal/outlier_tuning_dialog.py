@@ -0,0 +1,63 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './outlier_tuning_form.ui'))
+
+class OutlierTuningDialog(QDialog, FORM_CLASS):
+    def __init__(self, model, radius, min_neighbors, origin=None, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+        self.model = model
+        # The model works on local coordinates, the preview is drawn in map coordinates
+        self.origin = np.zeros(2) if origin is None else np.asarray(origin[:2], dtype=np.float64)
+
+        self.spinRadius.setValue(radius)
+        self.spinMinNeighbors.setValue(min_neighbors)
+
+        # Live preview of the sampled points, removed ones drawn on top in red
+        self.figure = Figure(figsize=(6, 5))
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.plotLayout.addWidget(self.canvas)
+        self.ax = self.figure.add_subplot(111)
+        self.kept_scatter = self.ax.scatter([], [], s=1, c="#B0B0B0", label="Kept")
+        self.removed_scatter = self.ax.scatter([], [], s=4, c="#D62728", label="Removed")
+        sample = model.sample_coords[:, :2] + self.origin
+        self.ax.set_xlim(sample[:, 0].min(), sample[:, 0].max())
+        self.ax.set_ylim(sample[:, 1].min(), sample[:, 1].max())
+        self.ax.set_aspect("equal", adjustable="datalim")
+        self.ax.legend(loc="upper right", markerscale=4)
+
+        self.spinRadius.valueChanged.connect(self.update_preview)
+        self.spinMinNeighbors.valueChanged.connect(self.update_preview)
+        self.update_preview()
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def update_preview(self):
+        radius, min_neighbors = self.get_values()
+        coords, removed = self.model.evaluate(radius, min_neighbors)
+        fraction, count = self.model.estimate(radius, min_neighbors)
+
+        if fraction is None:
+            self.labelEstimate.setText("Radius too large for the indexed sample, no estimate available.")
+        else:
+            self.labelEstimate.setText(
+                f"Estimated removed points: {count:,} of {self.model.num_points:,} ({fraction:.2%}) "
+                f"— from {len(removed):,} sampled points"
+            )
+
+        self.kept_scatter.set_offsets(coords[~removed, :2] + self.origin)
+        self.removed_scatter.set_offsets(coords[removed, :2] + self.origin)
+        self.canvas.draw_idle()
+
+    def get_values(self):
+        radius = self.spinRadius.value()
+        min_neighbors = self.spinMinNeighbors.value()
+        return radius, min_neighbors
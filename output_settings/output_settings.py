@@ -0,0 +1,18 @@
+from qgis.PyQt.QtWidgets import QDialog
+
+from ..las_io import set_column_cache
+from .output_settings_dialog import OutputSettingsDialog
+
+# -----------------------
+# --- Output Settings ---
+# -----------------------
+
+def edit_output_settings(self):
+    dialog = OutputSettingsDialog(self.output_options, self.memory_budget, self.column_cache, self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    self.output_options = dialog.get_options()
+    self.memory_budget = dialog.get_memory_budget()
+    self.column_cache = dialog.get_column_cache()
+    set_column_cache(self.column_cache)
+    self.outlier_tuning_cache = None    # Read with the former settings
@@ -0,0 +1,53 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+from ..column_cache import ColumnCache, default_cache_folder
+from ..las_io import OutputOptions
+from ..memory_planner import format_size
+
+MB = 1024 ** 2
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './output_settings_form.ui'))
+
+class OutputSettingsDialog(QDialog, FORM_CLASS):
+    def __init__(self, options, memory_budget, column_cache=None, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.checkPruneDimensions.setChecked(options.prune_dimensions)
+        self.checkParallelCompression.setChecked(options.parallel_compression)
+        self.spinMemoryBudget.setValue(int(memory_budget // MB))
+        self.groupColumnCache.setChecked(column_cache is not None)
+        self.editCacheFolder.setText(column_cache.folder if column_cache is not None else default_cache_folder())
+        self.update_cache_size()
+
+        self.editCacheFolder.editingFinished.connect(self.update_cache_size)
+        self.buttonClearCache.clicked.connect(self.clear_cache)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_options(self):
+        return OutputOptions(
+            prune_dimensions=self.checkPruneDimensions.isChecked(),
+            parallel_compression=self.checkParallelCompression.isChecked(),
+        )
+
+    def get_memory_budget(self):
+        return self.spinMemoryBudget.value() * MB
+
+    def get_column_cache(self):
+        # None when the cache is disabled
+        if not self.groupColumnCache.isChecked():
+            return None
+        return ColumnCache(self.editCacheFolder.text().strip() or default_cache_folder())
+
+    def update_cache_size(self):
+        folder = self.editCacheFolder.text().strip() or default_cache_folder()
+        self.labelCacheSize.setText(f"Cache Size: {format_size(ColumnCache(folder).size())}")
+
+    def clear_cache(self):
+        ColumnCache(self.editCacheFolder.text().strip() or default_cache_folder()).clear()
+        self.update_cache_size()
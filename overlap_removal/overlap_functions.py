@@ -0,0 +1,142 @@
+import numpy as np
+
+from ..las_io import iter_chunks, read_header
+
+# -----------------------------------
+# --- Overlap Removal (Processing) ---
+# -----------------------------------
+
+OVERLAP_CLASSES = (12, 17)  # Overlap classification codes
+
+def non_overlap_mask(classification):
+    return ~np.isin(classification, OVERLAP_CLASSES)
+
+# --- Geometric flightline overlap detection ---
+
+OVERLAP_CLASS = 12
+SOURCE_BITS = 16    # point_source_id is a uint16
+
+def abs_scan_angle(points):
+    # LAS 1.4 formats store the angle in 0.006 degree steps, older ones in whole degrees
+    if "scan_angle" in points.point_format.dimension_names:
+        return np.abs(points.scan_angle.astype(np.float32)) * 0.006
+    return np.abs(points.scan_angle_rank.astype(np.float32))
+
+class FlightlineGrid:
+    """
+    Per-cell statistics of every flightline (point_source_id) found in the cell,
+    accumulated chunk by chunk over keys packing the cell index and the source id.
+    """
+
+    def __init__(self, header, cell_size):
+        self.cell_size = cell_size
+        self.x_min = header.x_min
+        self.y_min = header.y_min
+        self.num_rows = int(np.floor((header.y_max - header.y_min) / cell_size)) + 1
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.angle_sums = np.empty(0, dtype=np.float64)
+        self.best_keys = None
+
+    def cell_ids(self, x, y):
+        col = ((x - self.x_min) / self.cell_size).astype(np.int64)
+        row = ((y - self.y_min) / self.cell_size).astype(np.int64)
+        return col * self.num_rows + row
+
+    def packed_keys(self, points):
+        cells = self.cell_ids(points.x, points.y)
+        return (cells << SOURCE_BITS) | points.point_source_id.astype(np.int64)
+
+    def accumulate(self, points):
+        keys, inverse, counts = np.unique(self.packed_keys(points), return_inverse=True, return_counts=True)
+        angle_sums = np.bincount(inverse, weights=abs_scan_angle(points), minlength=len(keys))
+
+        # Merge with the statistics of the previous chunks
+        keys = np.concatenate((self.keys, keys))
+        merged, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate((self.counts, counts)), minlength=len(merged)).astype(np.int64)
+        self.angle_sums = np.bincount(inverse, weights=np.concatenate((self.angle_sums, angle_sums)), minlength=len(merged))
+        self.keys = merged
+
+    def select_flightlines(self, criterion="count"):
+        """
+        Pick the flightline kept in every cell: the one with most points ("count")
+        or with the lowest mean absolute scan angle ("scan_angle", most nadir).
+        """
+        cells = self.keys >> SOURCE_BITS
+        if criterion == "scan_angle":
+            score = self.angle_sums / self.counts
+        else:
+            score = -self.counts.astype(np.float64)
+        # Keys are sorted by cell, so sorting by (cell, score) puts each cell's best source first
+        order = np.lexsort((score, cells))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = cells[order][1:] != cells[order][:-1]
+        self.best_keys = np.sort(self.keys[order][first])
+
+        sources_per_cell = np.bincount(np.unique(cells, return_inverse=True)[1])
+        return int(np.sum(sources_per_cell > 1))
+
+    def dominant_mask(self, points):
+        # True for the points belonging to the flightline selected for their cell
+        keys = self.packed_keys(points)
+        pos = np.searchsorted(self.best_keys, keys)
+        pos[pos == len(self.best_keys)] = 0
+        return self.best_keys[pos] == keys
+
+def flag_overlap(points, overlap_mask):
+    # LAS 1.4 formats have a dedicated overlap bit that keeps the classification intact
+    if "overlap" in points.point_format.dimension_names:
+        points.overlap[overlap_mask] = 1
+    else:
+        points.classification[overlap_mask] = OVERLAP_CLASS
+
+def detect_flightline_overlap(las, cell_size, criterion="count", chunk_size=1_000_000):
+    """
+    Boolean mask of the points lying in a cell dominated by another flightline,
+    plus the number of cells shared by several flightlines.
+    """
+    grid = FlightlineGrid(las.header, cell_size)
+    num_points = len(las.points)
+    # Slices keep the temporary key arrays bounded by the chunk size
+    for start in range(0, num_points, chunk_size):
+        grid.accumulate(las.points[start:start + chunk_size])
+    shared_cells = grid.select_flightlines(criterion)
+
+    is_overlap = np.empty(num_points, dtype=bool)
+    for start in range(0, num_points, chunk_size):
+        is_overlap[start:start + chunk_size] = ~grid.dominant_mask(las.points[start:start + chunk_size])
+    return is_overlap, shared_cells
+
+def stream_overlap_removal(path, writer, region=None, detect=False, cell_size=1.0, criterion="count",
+                           flag_only=False, chunk_size=1_000_000):
+    """
+    Chunked overlap removal for files exceeding the memory budget: points are
+    read, filtered (or flagged) and streamed to `writer` one chunk at a time.
+    Geometric detection takes a first pass to accumulate the flightline grid.
+    Returns the number of points read, of overlap points and of shared cells.
+    """
+    grid = None
+    shared_cells = 0
+    if detect:
+        grid = FlightlineGrid(read_header(path), cell_size)
+        for points in iter_chunks(path, region, chunk_size):
+            grid.accumulate(points)
+        shared_cells = grid.select_flightlines(criterion)
+
+    num_points = 0
+    num_overlap = 0
+    for points in iter_chunks(path, region, chunk_size):
+        if detect:
+            is_overlap = ~grid.dominant_mask(points)
+        else:
+            is_overlap = ~non_overlap_mask(points.classification)
+        num_points += len(points)
+        num_overlap += int(np.sum(is_overlap))
+
+        if flag_only:
+            flag_overlap(points, is_overlap)
+            writer.write(points)
+        else:
+            writer.write(points[~is_overlap])
+    return num_points, num_overlap, shared_cells
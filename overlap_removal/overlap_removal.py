@@ -1,14 +1,21 @@
 import os
 
-from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtWidgets import QApplication, QMessageBox
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
 import numpy as np
 
 from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, filter_points, format_output_notes, read_header, read_las,
+    resolve_output_path, write_las
+)
+from ..memory_planner import IN_MEMORY, plan_execution
+from ..processing_region.processing_region import region_for_file
+from .overlap_removal_dialog import OverlapRemovalDialog
+from .overlap_functions import detect_flightline_overlap, flag_overlap, non_overlap_mask, stream_overlap_removal
 
 # -----------------------
 # --- Overlap Removal ---
@@ -24,7 +31,17 @@ def remove_overlap(self):
     if not filename:
         return
 
+    dialog = OverlapRemovalDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+
+    detect_flightlines = dialog.detect_flightlines()
+    cell_size, criterion, flag_only = dialog.get_detection_values()
+    flag_only = detect_flightlines and flag_only
+
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Overlap Removal")
+    self.last_profiler = profiler
 
     try:
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -32,46 +49,86 @@ def remove_overlap(self):
         loading_dialog.show()
         QApplication.processEvents()
 
-        las = laspy.read(filename, laz_backend=LazBackend.Lazrs)
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        plan = plan_execution(header, "overlap", self.memory_budget)
+        if plan.strategy != IN_MEMORY:
+            # Too large for the memory budget: chunks are filtered and streamed straight to the output
+            loading_dialog.hide()
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+            loading_dialog.show()
+            QApplication.processEvents()
+
+            with profiler.stage("Chunked overlap removal") as stage:
+                with PointStreamWriter(output_path, header, self.output_options) as writer:
+                    num_points, num_overlap, shared_cells = stream_overlap_removal(
+                        filename, writer, region, detect_flightlines, cell_size, criterion,
+                        flag_only, plan.chunk_size
+                    )
+                stage.points = num_points
+
+            QMessageBox.information(
+                self.iface.mainWindow(),
+                "Overlap Removal Complete",
+                f"Original points: {num_points:,}\n"
+                f"{_overlap_line(num_overlap, shared_cells, detect_flightlines, flag_only)}"
+                f"Remaining points: {writer.points_written:,}\n\n"
+                f"Filtered file saved to:\n{output_path}\n\n"
+                f"{plan.describe()}"
+                f"{format_output_notes(writer.notes)}"
+            )
+            return
 
-        # Identify overlap points based on classification
-        overlap_classes = {12, 17}  # Overlap classification codes
-        classifications = las.classification
-        is_non_overlap = ~np.isin(classifications, list(overlap_classes))
+        with profiler.stage("Read LAS/LAZ") as stage:
+            las = read_las(filename, region)
+            stage.points = len(las.points)
+
+        if detect_flightlines:
+            # Identify overlap points geometrically: one flightline is kept per grid cell
+            with profiler.stage("Detect flightline overlap", points=len(las.points)):
+                is_overlap, shared_cells = detect_flightline_overlap(las, cell_size, criterion)
+                is_non_overlap = ~is_overlap
+        else:
+            # Identify overlap points based on classification
+            with profiler.stage("Classify overlap", points=len(las.points)):
+                is_non_overlap = non_overlap_mask(las.classification)
+
+        if flag_only:
+            with profiler.stage("Flag overlap", points=int(np.sum(is_overlap))):
+                flag_overlap(las.points, is_overlap)
+                is_non_overlap = np.ones(len(las.points), dtype=bool)
 
         # Filter only non-overlap points
-        non_overlap_indices = np.where(is_non_overlap)[0]
-
-        # Create a new LasData object with only non-overlap points
-        new_header = las.header.copy()
-        las_filtered = laspy.LasData(new_header)
-        las_filtered.points = las.points[non_overlap_indices]
-
-        x = las.x[non_overlap_indices]
-        y = las.y[non_overlap_indices]
-        z = las.z[non_overlap_indices]
+        num_remaining = int(np.count_nonzero(is_non_overlap))
 
-        las_filtered.header.min = [x.min(), y.min(), z.min()]
-        las_filtered.header.max = [x.max(), y.max(), z.max()]
+        if flag_only:
+            las_filtered = las     # Every point is kept, no copy needed
+        else:
+            # Boolean mask on the record buffer, header bounds come from the integer min/max
+            with profiler.stage("Filter points", points=num_remaining):
+                las_filtered = filter_points(las, is_non_overlap)
 
-        output_path, _ = QFileDialog.getSaveFileName(
-            self.iface.mainWindow(),
-            'Save Non-Overlap LiDAR File',
-            os.path.splitext(filename)[0] + '_non_overlap.laz',
-            'LiDAR Files (*.las *.laz)'
-        )
+        output_path = _ask_output_path(self, filename)
         if not output_path:
             return
 
-        las_filtered.write(output_path)
+        with profiler.stage("Write output", points=num_remaining):
+            output_notes = write_las(las_filtered, output_path, self.output_options)
+
+        num_overlap = np.sum(is_overlap) if flag_only else np.sum(~is_non_overlap)
+        overlap_line = _overlap_line(num_overlap, shared_cells if detect_flightlines else 0, detect_flightlines, flag_only)
 
         QMessageBox.information(
             self.iface.mainWindow(),
             "Overlap Removal Complete",
             f"Original points: {len(las.points):,}\n"
-            f"Overlap points removed: {np.sum(~is_non_overlap):,}\n"
-            f"Remaining points: {len(non_overlap_indices):,}\n\n"
-            f"Filtered file saved to:\n{output_path}"
+            f"{overlap_line}"
+            f"Remaining points: {num_remaining:,}\n\n"
+            f"Filtered file saved to:\n{output_path}\n\n"
+            f"{plan.describe()}"
+            f"{format_output_notes(output_notes)}"
         )
 
     except Exception as e:
@@ -84,3 +141,24 @@ def remove_overlap(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Non-Overlap LiDAR File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["overlap"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
+
+def _overlap_line(num_overlap, shared_cells, detect_flightlines, flag_only):
+    if flag_only:
+        line = f"Overlap points flagged: {num_overlap:,}\n"
+    else:
+        line = f"Overlap points removed: {num_overlap:,}\n"
+    if detect_flightlines:
+        line += f"Cells shared by several flightlines: {shared_cells:,}\n"
+    return line
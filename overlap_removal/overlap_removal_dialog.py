@@ -0,0 +1,25 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './overlap_removal_form.ui'))
+
+class OverlapRemovalDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.radioDetect.toggled.connect(self.groupDetection.setEnabled)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def detect_flightlines(self):
+        return self.radioDetect.isChecked()
+
+    def get_detection_values(self):
+        cell_size = self.spinCellSize.value()
+        criterion = "scan_angle" if self.comboCriterion.currentIndex() == 1 else "count"
+        flag_only = self.checkFlagOnly.isChecked()
+        return cell_size, criterion, flag_only
@@ -0,0 +1,80 @@
+from contextlib import nullcontext
+
+import numpy as np
+
+from ..las_io import local_coords, scaled_axis
+from ..outlier_removal.outlier_functions import build_neighbor_tree, neighbor_mask
+from ..overlap_removal.overlap_functions import non_overlap_mask
+from ..vegetation_classification.vegetation_functions import (
+    GROUND_CLASS, HIGH_VEGETATION_CLASS, LOW_VEGETATION_CLASS, MEDIUM_VEGETATION_CLASS,
+    build_ground_tree, height_above_ground, vegetation_classes
+)
+
+# ---------------------------------------
+# --- Processing Pipeline (Processing) ---
+# ---------------------------------------
+
+def _stage(profiler, name, points=None):
+    return profiler.stage(name, points=points) if profiler is not None else nullcontext()
+
+def run_pipeline(las, outliers=None, overlap=False, vegetation=None, profiler=None):
+    """
+    Run the selected stages over an in-memory LasData, in the order of the
+    standard workflow: outlier removal -> overlap removal -> vegetation reclassification.
+
+    outliers:   (radius, min_neighbors) or None to skip the stage
+    overlap:    True to drop the overlap classes
+    vegetation: (low_thresh, high_thresh) or None to skip the stage
+
+    Stages only narrow a shared boolean mask, and vegetation classes are written
+    in place, so the points are copied once at the end. Returns the mask and
+    the per-stage summary lines.
+    """
+    keep = np.ones(len(las.points), dtype=bool)
+    summary = []
+
+    if outliers is not None:
+        radius, min_neighbors = outliers
+        coords, _ = local_coords(las)
+        with _stage(profiler, "Build KD-tree", points=len(coords)):
+            tree = build_neighbor_tree(coords)
+        with _stage(profiler, "Query neighbors", points=len(coords)):
+            keep &= neighbor_mask(tree, coords, radius, min_neighbors)
+        del tree, coords
+        summary.append(f"Outliers removed: {np.sum(~keep):,}")
+
+    if overlap:
+        with _stage(profiler, "Classify overlap", points=int(np.sum(keep))):
+            before = int(np.sum(keep))
+            keep &= non_overlap_mask(las.classification)
+        summary.append(f"Overlap points removed: {before - int(np.sum(keep)):,}")
+
+    if vegetation is not None:
+        low_thresh, high_thresh = vegetation
+        classification = las.classification
+        is_ground = keep & (classification == GROUND_CLASS)
+        is_high_veg = keep & (classification == HIGH_VEGETATION_CLASS)
+        num_ground = int(np.count_nonzero(is_ground))
+        num_high_veg = int(np.count_nonzero(is_high_veg))
+
+        if num_ground == 0 or num_high_veg == 0:
+            summary.append("Vegetation reclassification skipped: no ground or high vegetation points")
+        else:
+            with _stage(profiler, "Build KD-tree", points=num_ground):
+                ground_xy, origin = local_coords(las, "xy", mask=is_ground)
+                tree = build_ground_tree(ground_xy)
+            with _stage(profiler, "Query ground height", points=num_high_veg):
+                veg_height = height_above_ground(
+                    tree, scaled_axis(las, "z", mask=is_ground),
+                    local_coords(las, "xy", mask=is_high_veg, origin=origin)[0], scaled_axis(las, "z", mask=is_high_veg)
+                )
+            new_classes = vegetation_classes(veg_height, low_thresh, high_thresh)
+            las.classification[is_high_veg] = new_classes
+            counts = np.bincount(new_classes, minlength=HIGH_VEGETATION_CLASS + 1)
+            summary.append(
+                f"Vegetation reclassified: {num_high_veg:,} "
+                f"(low {counts[LOW_VEGETATION_CLASS]:,}, medium {counts[MEDIUM_VEGETATION_CLASS]:,}, "
+                f"high {counts[HIGH_VEGETATION_CLASS]:,})"
+            )
+
+    return keep, summary
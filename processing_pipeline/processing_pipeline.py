@@ -0,0 +1,141 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtTest import QTest
+from PyQt5.QtCore import Qt
+
+import numpy as np
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, filter_points, format_output_notes, read_header, read_las, resolve_output_path,
+    write_las
+)
+from ..memory_planner import format_size, plan_pipeline
+from ..processing_region.processing_region import region_for_file
+from ..report_generation.report_functions import collect_report_data, write_report
+from ..report_generation.report_records import PARQUET_CATALOG_NAME
+from .processing_pipeline_dialog import ProcessingPipelineDialog
+from .pipeline_functions import run_pipeline
+
+# ---------------------------
+# --- Processing Pipeline ---
+# ---------------------------
+
+def run_processing_pipeline(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Process',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dialog = ProcessingPipelineDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+
+    outliers = dialog.get_outlier_params()
+    overlap = dialog.remove_overlap()
+    vegetation = dialog.get_vegetation_params()
+    report_format = dialog.get_report_format()
+
+    if outliers is None and not overlap and vegetation is None and report_format is None:
+        QMessageBox.information(self.iface.mainWindow(), "Nothing To Do", "No pipeline stage was selected.")
+        return
+
+    output_path = None
+    if outliers is not None or overlap or vegetation is not None:
+        output_path, selected_filter = QFileDialog.getSaveFileName(
+            self.iface.mainWindow(),
+            'Save Processed LiDAR File',
+            os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["pipeline"] + '.laz',
+            OUTPUT_FILTER
+        )
+        if not output_path:
+            return
+        output_path = resolve_output_path(output_path, selected_filter)
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Processing Pipeline")
+    self.last_profiler = profiler
+
+    try:
+        commands = [
+            command for command, selected in
+            (("outliers", outliers is not None), ("overlap", overlap), ("vegetation", vegetation is not None))
+            if selected
+        ]
+        plan = plan_pipeline(read_header(filename), commands, self.memory_budget)
+        if not plan.fits:
+            # The chain is never chunked or tiled, the single commands are for files past the budget
+            answer = QMessageBox.question(
+                self.iface.mainWindow(),
+                "File Exceeds Memory Budget",
+                f"The pipeline runs in memory and needs about {format_size(plan.estimated_bytes)}, "
+                f"over the {format_size(plan.budget)} memory budget.\n\n"
+                "The single commands chunk or tile large files. Run the pipeline anyway?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if answer != QMessageBox.Yes:
+                return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+        QTest.qWait(100)
+
+        # One decode for the whole chain
+        with profiler.stage("Read LAS/LAZ") as stage:
+            las = read_las(filename, region_for_file(self, filename))
+            stage.points = len(las.points)
+
+        keep, summary = run_pipeline(las, outliers=outliers, overlap=overlap, vegetation=vegetation, profiler=profiler)
+
+        num_remaining = int(np.sum(keep))
+        if num_remaining == 0:
+            raise ValueError("All points were removed by the pipeline — no data would remain.")
+
+        result = las
+        if output_path is not None:
+            with profiler.stage("Filter points", points=num_remaining):
+                result = filter_points(las, keep) if num_remaining < len(keep) else las
+            # One compression for the whole chain
+            with profiler.stage("Write output", points=num_remaining):
+                output_notes = write_las(result, output_path, self.output_options)
+            summary.append(f"\nProcessed file saved to:\n{output_path}{format_output_notes(output_notes)}")
+
+        if report_format is not None:
+            report_source = output_path or filename
+            if report_format == "parquet":
+                # One catalog per folder, every run appends its file's row
+                report_path = os.path.join(os.path.dirname(report_source), PARQUET_CATALOG_NAME)
+            else:
+                report_path = os.path.splitext(report_source.replace(".copc.laz", ".laz"))[0] + '_report.' + report_format
+            with profiler.stage("Write report", points=num_remaining):
+                data = collect_report_data(result, report_source)
+                write_report(self, report_path, data, report_format)
+            summary.append(f"\nReport saved to:\n{report_path}")
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Pipeline Complete",
+            f"Original points: {len(keep):,}\n"
+            f"Remaining points: {num_remaining:,}\n\n" + "\n".join(summary) + f"\n\n{plan.describe()}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Running Pipeline",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
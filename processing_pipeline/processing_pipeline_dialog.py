@@ -0,0 +1,41 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './processing_pipeline_form.ui'))
+
+class ProcessingPipelineDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_outlier_params(self):
+        if not self.groupOutliers.isChecked():
+            return None
+        return self.spinRadius.value(), self.spinMinNeighbors.value()
+
+    def remove_overlap(self):
+        return self.groupOverlap.isChecked()
+
+    def get_vegetation_params(self):
+        if not self.groupVegetation.isChecked():
+            return None
+        return self.spinLow.value(), self.spinHigh.value()
+
+    def get_report_format(self):
+        # None when no report is requested
+        if not self.groupReport.isChecked():
+            return None
+        if self.radioPdf.isChecked():
+            return "pdf"
+        if self.radioMarkdown.isChecked():
+            return "md"
+        if self.radioJson.isChecked():
+            return "json"
+        if self.radioParquet.isChecked():
+            return "parquet"
+        return "txt"
@@ -0,0 +1,85 @@
+from qgis.PyQt.QtWidgets import QMessageBox, QDialog
+from qgis.core import (
+    Qgis, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsGeometry,
+    QgsMessageLog, QgsProject, QgsVectorLayer, QgsWkbTypes
+)
+
+import laspy
+
+from ..utils import canvas_extent_bounds
+from ..las_io import Region, header_wkt
+from .processing_region_dialog import ProcessingRegionDialog
+
+# -------------------------
+# --- Processing Region ---
+# -------------------------
+
+def set_processing_region(self):
+    polygon_layers = [
+        layer for layer in QgsProject.instance().mapLayers().values()
+        if isinstance(layer, QgsVectorLayer) and layer.geometryType() == QgsWkbTypes.PolygonGeometry
+    ]
+
+    dialog = ProcessingRegionDialog(polygon_layers, self.processing_region, self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+
+    self.processing_region = dialog.get_region()
+    self.outlier_tuning_cache = None    # Points of the former region
+
+    if self.processing_region is None:
+        message = "Commands will process whole files."
+    elif self.processing_region[0] == "canvas":
+        message = "Commands will only process the points inside the current map canvas extent."
+    else:
+        message = "Commands will only process the points inside the selected polygons."
+    QMessageBox.information(self.iface.mainWindow(), "Processing Region", message)
+
+def region_for_file(self, filename):
+    """Resolve the processing region in the CRS of `filename`, or None to process the whole file."""
+    if self.processing_region is None:
+        return None
+
+    with laspy.open(filename) as reader:   # Header only
+        wkt = header_wkt(reader.header)
+
+    mode, layer_id = self.processing_region
+    if mode == "canvas":
+        region = Region(canvas_extent_bounds(self, wkt))
+    else:
+        region = _selected_polygons_region(layer_id, wkt)
+
+    QgsMessageLog.logMessage(
+        f"Processing restricted to {mode} region, bounds {region.bbox}", "MyLiDAR", Qgis.Info
+    )
+    return region
+
+def _selected_polygons_region(layer_id, wkt):
+    layer = QgsProject.instance().mapLayer(layer_id)
+    if layer is None:
+        raise ValueError("The polygon layer of the processing region is no longer loaded.")
+    features = layer.selectedFeatures()
+    if not features:
+        raise ValueError(f"No features are selected in the layer '{layer.name()}'.")
+
+    data_crs = QgsCoordinateReferenceSystem.fromWkt(wkt) if wkt else layer.crs()
+    transform = None
+    if data_crs.isValid() and data_crs != layer.crs():
+        transform = QgsCoordinateTransform(layer.crs(), data_crs, QgsProject.instance())
+
+    polygons = []
+    bbox = None
+    for feature in features:
+        geometry = QgsGeometry(feature.geometry())
+        if transform is not None:
+            geometry.transform(transform)
+        if bbox is None:
+            bbox = geometry.boundingBox()
+        else:
+            bbox.combineExtentWith(geometry.boundingBox())
+        # Every part keeps its own rings, holes only cut the polygon they belong to
+        parts = geometry.asMultiPolygon() if geometry.isMultipart() else [geometry.asPolygon()]
+        for part in parts:
+            polygons.append([[(point.x(), point.y()) for point in ring] for ring in part])
+
+    return Region((bbox.xMinimum(), bbox.yMinimum(), bbox.xMaximum(), bbox.yMaximum()), polygons)
@@ -0,0 +1,35 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './processing_region_form.ui'))
+
+class ProcessingRegionDialog(QDialog, FORM_CLASS):
+    def __init__(self, polygon_layers, current=None, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        for layer in polygon_layers:
+            self.comboLayer.addItem(layer.name(), layer.id())
+        self.radioSelectedPolygons.setEnabled(bool(polygon_layers))
+        self.radioSelectedPolygons.toggled.connect(self.comboLayer.setEnabled)
+
+        # Restore the region currently in use
+        if current is not None:
+            mode, layer_id = current
+            if mode == "canvas":
+                self.radioCanvasExtent.setChecked(True)
+            elif mode == "polygons" and self.comboLayer.findData(layer_id) >= 0:
+                self.radioSelectedPolygons.setChecked(True)
+                self.comboLayer.setCurrentIndex(self.comboLayer.findData(layer_id))
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_region(self):
+        if self.radioCanvasExtent.isChecked():
+            return ("canvas", None)
+        if self.radioSelectedPolygons.isChecked():
+            return ("polygons", self.comboLayer.currentData())
+        return None
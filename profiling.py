@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from qgis.core import Qgis, QgsMessageLog
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox
+
+# psutil ships with QGIS on most platforms, but memory tracking is optional
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# --------------------------------
+# --- Stage Profiling Helpers ---
+# --------------------------------
+
+LOG_TAG = "MyLiDAR"
+
+def current_rss():
+    """Resident memory of the QGIS process in bytes, or None if unavailable."""
+    if psutil is None:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+def format_bytes(num_bytes):
+    if num_bytes is None:
+        return "n/a"
+    sign = "-" if num_bytes < 0 else "+"
+    value = abs(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{sign}{value:,.1f} {unit}"
+        value /= 1024
+
+class ProfileStage:
+    def __init__(self, name, start, points=None):
+        self.name = name
+        self.start = start
+        self.duration = None
+        self.memory_delta = None
+        self.memory_after = None
+        self.points = points    # Number of points handled by the stage, filled in by the caller
+
+class StageProfiler:
+    """Records duration, memory delta and point counts for each stage of a command."""
+
+    def __init__(self, command):
+        self.command = command
+        self.stages = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, points=None):
+        record = ProfileStage(name, time.perf_counter() - self._origin, points)
+        rss_before = current_rss()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - self._origin - record.start
+            record.memory_after = current_rss()
+            if rss_before is not None and record.memory_after is not None:
+                record.memory_delta = record.memory_after - rss_before
+            self.stages.append(record)
+
+    def total_duration(self):
+        return sum(stage.duration for stage in self.stages)
+
+    def summary(self):
+        lines = [f"{self.command}: {self.total_duration():.3f} s in {len(self.stages)} stages"]
+        for stage in self.stages:
+            points = f"{stage.points:,} pts" if stage.points is not None else "-"
+            lines.append(
+                f"  - {stage.name:<24} {stage.duration:>9.3f} s   "
+                f"mem {format_bytes(stage.memory_delta):>12}   {points}"
+            )
+        return "\n".join(lines)
+
+    def log_summary(self):
+        if not self.stages:
+            return
+        QgsMessageLog.logMessage(self.summary(), LOG_TAG, Qgis.Info)
+
+    # --- Export ---
+
+    def to_dict(self):
+        return {
+            "command": self.command,
+            "total_duration_s": self.total_duration(),
+            "stages": [
+                {
+                    "name": stage.name,
+                    "start_s": stage.start,
+                    "duration_s": stage.duration,
+                    "memory_delta_bytes": stage.memory_delta,
+                    "memory_after_bytes": stage.memory_after,
+                    "points": stage.points,
+                }
+                for stage in self.stages
+            ],
+        }
+
+    def to_chrome_trace(self):
+        # Chrome trace format (chrome://tracing, Perfetto): complete events plus a memory counter track
+        pid = os.getpid()
+        events = []
+        for stage in self.stages:
+            events.append({
+                "name": stage.name,
+                "cat": self.command,
+                "ph": "X",
+                "ts": stage.start * 1e6,
+                "dur": stage.duration * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {"points": stage.points, "memory_delta_bytes": stage.memory_delta},
+            })
+            if stage.memory_after is not None:
+                events.append({
+                    "name": "RSS",
+                    "ph": "C",
+                    "ts": (stage.start + stage.duration) * 1e6,
+                    "pid": pid,
+                    "args": {"bytes": stage.memory_after},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"command": self.command}}
+
+    def dump(self, path, chrome_trace=True):
+        content = self.to_chrome_trace() if chrome_trace else self.to_dict()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f, indent=2, default=float)
+
+# --- Profile export (menu action) ---
+
+def export_last_profile(self):
+    profiler = getattr(self, "last_profiler", None)
+    if profiler is None or not profiler.stages:
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "No Profile Available",
+            "Run a command first to record its profile."
+        )
+        return
+
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Run Profile',
+        profiler.command.lower().replace(" ", "_") + '_profile.json',
+        'Chrome Trace (*.json);;Profile Summary (*.json)'
+    )
+    if not output_path:
+        return
+
+    try:
+        profiler.dump(output_path, chrome_trace=selected_filter.startswith("Chrome"))
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Profile Saved",
+            f"{profiler.summary()}\n\nProfile saved to:\n{output_path}"
+        )
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Saving Profile",
+            f"An error occurred:\n{e}"
+        )
@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+from scipy import ndimage
+
+# -------------------------
+# --- Point Cloud Grids ---
+# -------------------------
+
+class RasterGrid:
+    """
+    North-up grid of square cells over (xmin, ymin, xmax, ymax): row 0 is the
+    northern edge, matching the GeoTIFF layout. Only the geometry is stored,
+    the value arrays are (rows, cols) arrays owned by the callers.
+    """
+
+    def __init__(self, bounds, cell_size):
+        xmin, ymin, xmax, ymax = bounds
+        self.cell_size = float(cell_size)
+        self.xmin, self.ymax = float(xmin), float(ymax)
+        self.cols = max(1, math.ceil((xmax - xmin) / cell_size))
+        self.rows = max(1, math.ceil((ymax - ymin) / cell_size))
+
+    @classmethod
+    def for_header(cls, header, cell_size, region=None):
+        xmin, ymin, xmax, ymax = header.x_min, header.y_min, header.x_max, header.y_max
+        if region is not None:
+            # Only the part of the file inside the processing region is gridded
+            rxmin, rymin, rxmax, rymax = region.bbox
+            xmin, ymin = max(xmin, rxmin), max(ymin, rymin)
+            xmax, ymax = min(xmax, rxmax), min(ymax, rymax)
+        return cls((xmin, ymin, xmax, ymax), cell_size)
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    @property
+    def bounds(self):
+        return self.xmin, self.ymax - self.rows * self.cell_size, self.xmin + self.cols * self.cell_size, self.ymax
+
+    def window(self, rows, cols):
+        """RasterGrid of the (row slice, column slice) window, on the same cells as this grid."""
+        window = RasterGrid.__new__(RasterGrid)
+        window.cell_size = self.cell_size
+        window.xmin = self.xmin + cols.start * self.cell_size
+        window.ymax = self.ymax - rows.start * self.cell_size
+        window.rows, window.cols = rows.stop - rows.start, cols.stop - cols.start
+        return window
+
+    @property
+    def geotransform(self):
+        # GDAL affine transform of the north-up grid
+        return (self.xmin, self.cell_size, 0.0, self.ymax, 0.0, -self.cell_size)
+
+    def cells(self, x, y):
+        # Flat (row-major) index of the cell holding each point, edge points go to the border cells.
+        # Rows are counted from the south like tile_ids(), so points on a shared edge agree on their tile and cell.
+        ymin = self.ymax - self.rows * self.cell_size
+        col = np.clip(((x - self.xmin) / self.cell_size).astype(np.int64), 0, self.cols - 1)
+        row_from_south = np.clip(((y - ymin) / self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return (self.rows - 1 - row_from_south) * self.cols + col
+
+    def sample(self, surface, x, y):
+        """Bilinear interpolation of a (rows, cols) surface defined at the cell centers."""
+        rows = (self.ymax - y) / self.cell_size - 0.5
+        cols = (x - self.xmin) / self.cell_size - 0.5
+        return ndimage.map_coordinates(surface, [rows, cols], order=1, mode="nearest")
+
+    def windows(self, tiles, buffer_cells=0):
+        """
+        (core, buffered) slice pairs of a (columns, rows) tiling of the grid,
+        the buffered window extending `buffer_cells` beyond the core on every side.
+        """
+        tile_cols, tile_rows = tiles
+        col_edges = np.linspace(0, self.cols, tile_cols + 1).astype(np.int64)
+        row_edges = np.linspace(0, self.rows, tile_rows + 1).astype(np.int64)
+        for r0, r1 in zip(row_edges[:-1], row_edges[1:]):
+            for c0, c1 in zip(col_edges[:-1], col_edges[1:]):
+                br0, bc0 = max(r0 - buffer_cells, 0), max(c0 - buffer_cells, 0)
+                br1, bc1 = min(r1 + buffer_cells, self.rows), min(c1 + buffer_cells, self.cols)
+                buffered = (slice(br0, br1), slice(bc0, bc1))
+                core_in_buffered = (slice(r0 - br0, r1 - br0), slice(c0 - bc0, c1 - bc0))
+                yield (slice(r0, r1), slice(c0, c1)), buffered, core_in_buffered
+
+def cell_minimum(values, cells, z):
+    """Lower `values` (flat view of a grid) to the lowest `z` of every cell in `cells`."""
+    # One sort instead of np.minimum.at, which is unbuffered and much slower
+    order = np.lexsort((z, cells))
+    sorted_cells = cells[order]
+    first = np.r_[True, sorted_cells[1:] != sorted_cells[:-1]]
+    unique_cells = sorted_cells[first]
+    values[unique_cells] = np.fmin(values[unique_cells], z[order][first])
+
+def cell_maximum(values, cells, z):
+    # Raise `values` to the highest `z` of every cell
+    order = np.lexsort((-z, cells))
+    sorted_cells = cells[order]
+    first = np.r_[True, sorted_cells[1:] != sorted_cells[:-1]]
+    unique_cells = sorted_cells[first]
+    values[unique_cells] = np.fmax(values[unique_cells], z[order][first])
+
+def fill_nearest(surface):
+    """`surface` with its empty (NaN) cells set to the value of their nearest valid cell."""
+    empty = np.isnan(surface)
+    if not np.any(empty) or np.all(empty):
+        return surface
+    indices = ndimage.distance_transform_edt(empty, return_distances=False, return_indices=True)
+    return surface[tuple(indices)]
@@ -0,0 +1,62 @@
+import numpy as np
+from osgeo import gdal, osr
+
+# ----------------------
+# --- GeoTIFF Output ---
+# ----------------------
+
+GDAL_TYPES = {
+    np.dtype(np.uint8): gdal.GDT_Byte,
+    np.dtype(np.int32): gdal.GDT_Int32,
+    np.dtype(np.float32): gdal.GDT_Float32,
+    np.dtype(np.float64): gdal.GDT_Float64,
+}
+
+class GeoTiffWriter:
+    """
+    Single-band, tiled and deflate-compressed GeoTIFF written window by window,
+    so rasters larger than the memory are produced one tile at a time.
+    `geotransform` is the GDAL affine transform, `wkt` the CRS of the point
+    cloud (the raster is left without CRS when the file has none).
+    """
+
+    def __init__(self, path, shape, geotransform, wkt=None, dtype=np.float32, nodata=None):
+        rows, cols = shape
+        self.path = path
+        driver = gdal.GetDriverByName("GTiff")
+        self.dataset = driver.Create(
+            path, cols, rows, 1, GDAL_TYPES[np.dtype(dtype)],
+            options=["COMPRESS=DEFLATE", "TILED=YES", "BIGTIFF=IF_SAFER"]
+        )
+        if self.dataset is None:
+            raise IOError(f"Could not create the raster {path}.")
+        self.dataset.SetGeoTransform(geotransform)
+        if wkt:
+            srs = osr.SpatialReference()
+            srs.ImportFromWkt(wkt)
+            self.dataset.SetProjection(srs.ExportToWkt())
+        self.band = self.dataset.GetRasterBand(1)
+        if nodata is not None:
+            self.band.SetNoDataValue(nodata)
+            self.band.Fill(nodata)
+
+    def write(self, array, row_offset=0, col_offset=0):
+        self.band.WriteArray(array, col_offset, row_offset)
+
+    def close(self):
+        if self.dataset is not None:
+            self.band.FlushCache()
+            self.band = None
+            self.dataset = None     # Closing the dataset flushes it to disk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def write_geotiff(path, array, geotransform, wkt=None, nodata=None):
+    """Write a whole 2D north-up array as a GeoTIFF."""
+    with GeoTiffWriter(path, array.shape, geotransform, wkt, array.dtype, nodata) as writer:
+        writer.write(array)
+    return path
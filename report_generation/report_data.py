@@ -7,7 +7,9 @@ class ReportData:
         file_source=None, global_encoding=None, system_id=None, gen_software=None,
         creation_date=None, unique_classes=None, class_counts=None, unique_returns=None,
         return_counts=None, min_intensity=None, max_intensity=None, min_time=None,
-        max_time=None, area=None, density=None
+        max_time=None, area=None, density=None, intensity_percentiles=None, intensity_histogram=None,
+        time_percentiles=None, time_histogram=None, time_coverage=None, effective_density=None,
+        density_percentiles=None, gap_percentage=None, density_cell_size=None, flightline_passes=None
     ):
         # -- Metadata --
         self.file_name = file_name
@@ -22,11 +24,17 @@ class ReportData:
         # -- Intensity --
         self.min_intensity = min_intensity
         self.max_intensity = max_intensity
+        self.intensity_percentiles = intensity_percentiles  # {percentile: intensity}
+        self.intensity_histogram = intensity_histogram      # (bin edges, counts)
 
         # -- Spatial Measures --
         self.num_points = num_points
         self.area = area
         self.density = density
+        self.effective_density = effective_density      # Points per unit area over the occupied grid cells
+        self.density_percentiles = density_percentiles  # {percentile: points per unit area} of the occupied cells
+        self.gap_percentage = gap_percentage            # Percentage of empty grid cells
+        self.density_cell_size = density_cell_size
         self.bounds = bounds
         self.x_axis_bounds = x_axis_bounds
         self.y_axis_bounds = y_axis_bounds
@@ -35,6 +43,10 @@ class ReportData:
         # -- GPS Time --
         self.min_time = min_time
         self.max_time = max_time
+        self.time_percentiles = time_percentiles    # {percentile: ISO datetime}
+        self.time_histogram = time_histogram        # (bin edges in GPS seconds, counts)
+        self.time_coverage = time_coverage          # Share of the acquisition span holding points
+        self.flightline_passes = flightline_passes  # [{source_id, pass_number, num_points, start, end, start_time, ...}]
 
         # -- Classifications and Returns --
         self.unique_classes = unique_classes
@@ -34,11 +34,16 @@ class ReportDialog(QDialog, form_class):
             # Intensity checkboxes
             self.checkMinIntensity,
             self.checkMaxIntensity,
+            self.checkIntensityPercentiles,
+            self.checkIntensityHistogram,
 
             # Spatial bounds checkboxes
             self.checkNumPoints,
             self.checkArea,
             self.checkDensity,
+            self.checkEffectiveDensity,
+            self.checkDensityPercentiles,
+            self.checkGapPercentage,
             self.checkBounds,
             self.checkXAxisBounds,
             self.checkYAxisBounds,
@@ -47,10 +52,16 @@ class ReportDialog(QDialog, form_class):
             # GPS time checkboxes
             self.checkMinTime,
             self.checkMaxTime,
+            self.checkTimePercentiles,
+            self.checkTimeHistogram,
+            self.checkFlightlines,
 
             # Point metrics checkboxes
             self.checkClassCounts,
             self.checkReturnCounts,
+
+            # Export options
+            self.checkDensityRaster,
         ]
 
         self.ok_button = self.buttonBox.button(QDialogButtonBox.Ok)
@@ -63,6 +74,45 @@ class ReportDialog(QDialog, form_class):
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
 
+    def selected_fields(self):
+        # ReportData fields whose checkbox is ticked
+        fields = {
+            "file_name": self.checkFileName,
+            "file_source": self.checkFileSource,
+            "global_encoding": self.checkGlobalEncoding,
+            "system_id": self.checkSystemId,
+            "gen_software": self.checkGenSoftware,
+            "version": self.checkVersion,
+            "point_format": self.checkPointFormat,
+            "creation_date": self.checkCreationDate,
+            "min_intensity": self.checkMinIntensity,
+            "max_intensity": self.checkMaxIntensity,
+            "intensity_percentiles": self.checkIntensityPercentiles,
+            "intensity_histogram": self.checkIntensityHistogram,
+            "num_points": self.checkNumPoints,
+            "area": self.checkArea,
+            "density": self.checkDensity,
+            "effective_density": self.checkEffectiveDensity,
+            "density_percentiles": self.checkDensityPercentiles,
+            "gap_percentage": self.checkGapPercentage,
+            "bounds": self.checkBounds,
+            "x_axis_bounds": self.checkXAxisBounds,
+            "y_axis_bounds": self.checkYAxisBounds,
+            "z_axis_bounds": self.checkZAxisBounds,
+            "min_time": self.checkMinTime,
+            "max_time": self.checkMaxTime,
+            "time_percentiles": self.checkTimePercentiles,
+            "time_histogram": self.checkTimeHistogram,
+            "flightline_passes": self.checkFlightlines,
+            "class_counts": self.checkClassCounts,
+            "return_counts": self.checkReturnCounts,
+        }
+        return {name for name, checkbox in fields.items() if checkbox.isChecked()}
+
+    def get_density_options(self):
+        # Density grid cell size and whether the grid is exported as a GeoTIFF
+        return self.spinDensityCellSize.value(), self.checkDensityRaster.isChecked()
+
     def update_ok_button(self):
         any_checked = any(cb.isChecked() for cb in self.checkboxes)
         self.ok_button.setEnabled(any_checked)
@@ -71,26 +121,41 @@ class ReportDialog(QDialog, form_class):
     def on_group_time_toggled(self, checked):
         self.checkMinTime.setEnabled(checked)
         self.checkMaxTime.setEnabled(checked)
+        self.checkTimePercentiles.setEnabled(checked)
+        self.checkTimeHistogram.setEnabled(checked)
+        self.checkFlightlines.setEnabled(checked)
 
         if checked:
             self.checkMinTime.setChecked(True)
             self.checkMaxTime.setChecked(True)
+            self.checkTimePercentiles.setChecked(True)
+            self.checkTimeHistogram.setChecked(True)
+            self.checkFlightlines.setChecked(True)
         else:
             self.checkMinTime.setChecked(False)
             self.checkMaxTime.setChecked(False)
+            self.checkTimePercentiles.setChecked(False)
+            self.checkTimeHistogram.setChecked(False)
+            self.checkFlightlines.setChecked(False)
 
         self.update_ok_button()
 
     def on_group_intensity_toggled(self, checked):
         self.checkMinIntensity.setEnabled(checked)
         self.checkMaxIntensity.setEnabled(checked)
+        self.checkIntensityPercentiles.setEnabled(checked)
+        self.checkIntensityHistogram.setEnabled(checked)
 
         if checked:
             self.checkMinIntensity.setChecked(True)
             self.checkMaxIntensity.setChecked(True)
+            self.checkIntensityPercentiles.setChecked(True)
+            self.checkIntensityHistogram.setChecked(True)
         else:
             self.checkMinIntensity.setChecked(False)
             self.checkMaxIntensity.setChecked(False)
+            self.checkIntensityPercentiles.setChecked(False)
+            self.checkIntensityHistogram.setChecked(False)
 
         self.update_ok_button()
 
@@ -98,6 +163,9 @@ class ReportDialog(QDialog, form_class):
         self.checkNumPoints.setEnabled(checked)
         self.checkArea.setEnabled(checked)
         self.checkDensity.setEnabled(checked)
+        self.checkEffectiveDensity.setEnabled(checked)
+        self.checkDensityPercentiles.setEnabled(checked)
+        self.checkGapPercentage.setEnabled(checked)
         self.checkBounds.setEnabled(checked)
         self.checkXAxisBounds.setEnabled(checked)
         self.checkYAxisBounds.setEnabled(checked)
@@ -107,6 +175,9 @@ class ReportDialog(QDialog, form_class):
             self.checkNumPoints.setChecked(True)
             self.checkArea.setChecked(True)
             self.checkDensity.setChecked(True)
+            self.checkEffectiveDensity.setChecked(True)
+            self.checkDensityPercentiles.setChecked(True)
+            self.checkGapPercentage.setChecked(True)
             self.checkBounds.setChecked(True)
             self.checkXAxisBounds.setChecked(True)
             self.checkYAxisBounds.setChecked(True)
@@ -115,6 +186,9 @@ class ReportDialog(QDialog, form_class):
             self.checkNumPoints.setChecked(False)
             self.checkArea.setChecked(False)
             self.checkDensity.setChecked(False)
+            self.checkEffectiveDensity.setChecked(False)
+            self.checkDensityPercentiles.setChecked(False)
+            self.checkGapPercentage.setChecked(False)
             self.checkBounds.setChecked(False)
             self.checkXAxisBounds.setChecked(False)
             self.checkYAxisBounds.setChecked(False)
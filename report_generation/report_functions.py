@@ -1,4 +1,8 @@
+import os
+
 from .report_data import ReportData
+from .report_records import generate_json_report, generate_parquet_report
+from .report_statistics import DENSITY_CELL_SIZE, DensityGrid, FlightlinePasses, ReportAccumulator
 from datetime import datetime
 
 # PDF generation imports
@@ -7,7 +11,151 @@ from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 
-from ..utils import generate_pie_chart_from_counts, generate_return_bar_chart
+from ..las_io import CHUNK_SIZE, iter_chunks, read_header
+from ..utils import generate_histogram_chart, generate_pie_chart_from_counts, generate_return_bar_chart
+from ..utils import format_global_encoding, format_point_format, gps_time_to_datetime
+
+# --- Report Data Collection ---
+
+REPORT_FIELDS = {
+    "file_name", "file_source", "global_encoding", "system_id", "gen_software", "version",
+    "point_format", "creation_date", "min_intensity", "max_intensity", "num_points", "area",
+    "density", "bounds", "x_axis_bounds", "y_axis_bounds", "z_axis_bounds", "min_time",
+    "max_time", "class_counts", "return_counts", "intensity_percentiles", "intensity_histogram",
+    "time_percentiles", "time_histogram", "effective_density", "density_percentiles", "gap_percentage",
+    "flightline_passes",
+}
+DENSITY_FIELDS = {"effective_density", "density_percentiles", "gap_percentage"}
+
+def has_gps_time(las):
+    return "gps_time" in las.point_format.dimension_names
+
+def collect_report_data(las, filename, fields=REPORT_FIELDS, density_grid=None):
+    # In-memory data goes through the same accumulator as the streamed files, as a single chunk
+    if density_grid is None and fields & DENSITY_FIELDS:
+        density_grid = DensityGrid.for_header(las.header)
+    stats = ReportAccumulator(density_grid, FlightlinePasses() if "flightline_passes" in fields else None)
+    stats.update(las.points)
+    return report_data_from_stats(las.header, stats, filename, fields)
+
+def collect_report_data_streaming(path, region=None, fields=REPORT_FIELDS, chunk_size=CHUNK_SIZE, density_grid=None):
+    """
+    Report data from a single streaming pass, for files of any size. The
+    density fields need a `density_grid`, a default one is made when none is
+    given; pass one to keep it (e.g. to export it as a raster).
+    """
+    header = read_header(path)
+    if density_grid is None and fields & DENSITY_FIELDS:
+        density_grid = DensityGrid.for_header(header, DENSITY_CELL_SIZE, region)
+    stats = ReportAccumulator(density_grid, FlightlinePasses() if "flightline_passes" in fields else None)
+    for points in iter_chunks(path, region, chunk_size):
+        stats.update(points)
+    if stats.num_points == 0:
+        raise ValueError("No points were found inside the processing region.")
+    return report_data_from_stats(header, stats, path, fields)
+
+def report_data_from_stats(header, stats, filename, fields=REPORT_FIELDS):
+    unique_classes, class_counts = stats.class_histogram()  # Classification values and their counts
+    unique_returns, ret_counts = stats.return_histogram()   # Return number values and their counts
+
+    if stats.has_gps_time:   # This should, in theory, always be true for LAS files.
+        dt_min = gps_time_to_datetime(stats.time_sketch.minimum).isoformat()
+        dt_max = gps_time_to_datetime(stats.time_sketch.maximum).isoformat()
+        time_percentiles = {
+            p: gps_time_to_datetime(t).isoformat() for p, t in stats.time_sketch.quantiles().items()
+        }
+        time_histogram = stats.time_coverage.histogram()
+        time_coverage = stats.time_coverage.coverage()
+        flightline_passes = None
+        if stats.flightlines is not None:
+            # ISO start and end times next to the GPS seconds, like the other time fields
+            flightline_passes = [
+                dict(p, start_time=gps_time_to_datetime(p["start"]).isoformat(), end_time=gps_time_to_datetime(p["end"]).isoformat())
+                for p in stats.flightlines.passes()
+            ]
+    else:
+        dt_min = dt_max = time_percentiles = time_histogram = time_coverage = flightline_passes = None
+
+    grid = stats.density_grid
+    if grid is not None:
+        effective_density = grid.effective_density()
+        density_percentiles = grid.density_percentiles()
+        gap_percentage = grid.gap_percentage()
+    else:
+        effective_density = density_percentiles = gap_percentage = None
+
+    # Bounds of the points actually read, which differ from the header's inside a processing region
+    mins, maxs = stats.mins, stats.maxs
+    area = (maxs[0] - mins[0]) * (maxs[1] - mins[1])    # Area covered by the point cloud (width * height)
+
+    return ReportData(
+        # -- Metadata --
+        file_name=os.path.basename(filename) if "file_name" in fields else None,
+        file_source=header.file_source_id if "file_source" in fields else None,
+        global_encoding=format_global_encoding(header.global_encoding) if "global_encoding" in fields else None,
+        system_id=header.system_identifier if "system_id" in fields else None,         # Note: System ID only incluided in generated LAZ files
+        gen_software=header.generating_software if "gen_software" in fields else None, # Generating software (e.g., LAStools, PDAL)
+        version=header.version if "version" in fields else None,                       # LAS version (e.g., 1.4)
+        point_format=format_point_format(header.point_format) if "point_format" in fields else None,
+        creation_date=str(header.creation_date) if "creation_date" in fields else None,
+
+        # -- Intensity --
+        min_intensity=stats.intensity.min() if "min_intensity" in fields else None,
+        max_intensity=stats.intensity.max() if "max_intensity" in fields else None,
+        intensity_percentiles=stats.intensity.percentiles() if "intensity_percentiles" in fields else None,
+        intensity_histogram=stats.intensity.histogram() if "intensity_histogram" in fields else None,
+
+        # -- Spatial --
+        num_points=stats.num_points if "num_points" in fields else None,
+        area=area if "area" in fields else None,
+        density=stats.num_points / area if "density" in fields else None,        # Density of points (points per square unit)
+        bounds=(mins, maxs) if "bounds" in fields else None,
+        x_axis_bounds=(mins[0], maxs[0]) if "x_axis_bounds" in fields else None,
+        y_axis_bounds=(mins[1], maxs[1]) if "y_axis_bounds" in fields else None,
+        z_axis_bounds=(mins[2], maxs[2]) if "z_axis_bounds" in fields else None,
+        effective_density=effective_density if "effective_density" in fields else None,
+        density_percentiles=density_percentiles if "density_percentiles" in fields else None,
+        gap_percentage=gap_percentage if "gap_percentage" in fields else None,
+        density_cell_size=grid.cell_size if grid is not None else None,
+
+        # -- GPS Time --
+        min_time=dt_min if "min_time" in fields else None,
+        max_time=dt_max if "max_time" in fields else None,
+        time_percentiles=time_percentiles if "time_percentiles" in fields else None,
+        time_histogram=time_histogram if "time_histogram" in fields else None,
+        time_coverage=time_coverage if "time_histogram" in fields else None,
+        flightline_passes=flightline_passes if "flightline_passes" in fields else None,
+
+        # -- Classifications and Returns --
+        unique_classes=unique_classes if "class_counts" in fields else None,
+        class_counts=class_counts if "class_counts" in fields else None,
+        unique_returns=unique_returns if "return_counts" in fields else None,
+        return_counts=ret_counts if "return_counts" in fields else None,
+    )
+
+def write_report(self, path, data: ReportData, report_format=None):
+    # Without an explicit format ("txt", "md", "pdf", "json" or "parquet") the file extension decides
+    if report_format is None:
+        report_format = os.path.splitext(path)[1].lower().lstrip(".")
+    if report_format == "pdf":
+        generate_pdf_report(self, path, data)
+    elif report_format == "json":
+        generate_json_report(self, path, data)
+    elif report_format == "parquet":
+        generate_parquet_report(self, path, data)   # One more part file in the catalog folder
+    elif report_format == "md":
+        generate_markdown_report(self, path, data)
+    else:
+        generate_txt_report(self, path, data)
+
+def histogram_bins(edges, counts):
+    return zip(edges[:-1], edges[1:], counts)
+
+def time_bin_label(gps_time):
+    return gps_time_to_datetime(gps_time).isoformat(timespec="seconds")
+
+def passes_summary(passes):
+    return f"{len({p['source_id'] for p in passes})} flightlines, {len(passes)} passes"
 
 # --- Text Report Generation ---
 
@@ -46,17 +194,27 @@ def generate_txt_report(self, path, data: ReportData):
             f.write("\n")
 
         # -- Intensity --
-        if (data.min_intensity or data.max_intensity):
+        if (data.min_intensity or data.max_intensity or data.intensity_percentiles or
+            data.intensity_histogram is not None):
             f.write("Intensity:\n")
             if data.min_intensity:
                 f.write(f"Min Intensity: {data.min_intensity}\n")
             if data.max_intensity:
                 f.write(f"Max Intensity: {data.max_intensity}\n")
+            if data.intensity_percentiles:
+                f.write("Intensity Percentiles:\n")
+                for p, value in data.intensity_percentiles.items():
+                    f.write(f" - P{p}: {value}\n")
+            if data.intensity_histogram is not None:
+                f.write("Intensity Histogram:\n")
+                for low, high, count in histogram_bins(*data.intensity_histogram):
+                    f.write(f" - {low:.0f} to {high:.0f}: {count}\n")
             f.write("\n")
 
         # -- Spatial Measures --
         if (data.num_points or data.area or data.density or
-            data.bounds or data.x_axis_bounds or data.y_axis_bounds):
+            data.bounds or data.x_axis_bounds or data.y_axis_bounds or data.effective_density is not None or
+            data.density_percentiles or data.gap_percentage is not None):
             f.write("Spatial Measures:\n")
             if data.num_points:
                 f.write(f"Number of Points: {data.num_points}\n")
@@ -64,6 +222,14 @@ def generate_txt_report(self, path, data: ReportData):
                 f.write(f"Area: {data.area}\n")
             if data.density:
                 f.write(f"Density: {data.density}\n")
+            if data.effective_density is not None:
+                f.write(f"Effective Density: {data.effective_density} (grid cells of {data.density_cell_size:g} x {data.density_cell_size:g})\n")
+            if data.density_percentiles:
+                f.write("Density Percentiles (occupied cells):\n")
+                for p, value in data.density_percentiles.items():
+                    f.write(f" - P{p}: {value}\n")
+            if data.gap_percentage is not None:
+                f.write(f"Gap Percentage: {data.gap_percentage:.2f}% of the cells\n")
             if data.bounds:
                 f.write(f"Bounds Min: {data.bounds[0]}\n")
                 f.write(f"Bounds Max: {data.bounds[1]}\n")
@@ -76,12 +242,32 @@ def generate_txt_report(self, path, data: ReportData):
             f.write("\n")
 
         # -- GPS Time --
-        if (data.min_time or data.max_time):
+        if (data.min_time or data.max_time or data.time_percentiles or data.time_histogram is not None or
+            data.flightline_passes):
             f.write("GPS Time:\n")
             if data.min_time:
                 f.write(f"Min GPS Time: {data.min_time}\n")
             if data.max_time:
                 f.write(f"Max GPS Time: {data.max_time}\n")
+            if data.time_percentiles:
+                f.write("GPS Time Percentiles:\n")
+                for p, value in data.time_percentiles.items():
+                    f.write(f" - P{p}: {value}\n")
+            if data.time_coverage is not None:
+                f.write(f"Time Coverage: {data.time_coverage:.1%}\n")
+            if data.time_histogram is not None:
+                f.write("GPS Time Histogram:\n")
+                for start, _, count in histogram_bins(*data.time_histogram):
+                    f.write(f" - {time_bin_label(start)}: {count}\n")
+            if data.flightline_passes:
+                f.write(f"Flightline Passes ({passes_summary(data.flightline_passes)}):\n")
+                for p in data.flightline_passes:
+                    xmin, ymin, xmax, ymax = p["bounds"]
+                    f.write(
+                        f" - Source {p['source_id']} pass {p['pass_number']}: {p['num_points']} points, "
+                        f"{time_bin_label(p['start'])} to {time_bin_label(p['end'])} ({p['duration']:.1f} s, "
+                        f"{p['coverage']:.1%} coverage), X {xmin:.2f} to {xmax:.2f}, Y {ymin:.2f} to {ymax:.2f}\n"
+                    )
             f.write("\n")
 
         # -- Classifications --
@@ -132,17 +318,27 @@ def generate_markdown_report(self, path, data: ReportData):
             f.write("\n")
 
         # -- Intensity --
-        if data.min_intensity or data.max_intensity:
+        if (data.min_intensity or data.max_intensity or data.intensity_percentiles or
+            data.intensity_histogram is not None):
             f.write("## Intensity\n")
             if data.min_intensity:
                 f.write(f"- **Min Intensity:** `{data.min_intensity}`\n")
             if data.max_intensity:
                 f.write(f"- **Max Intensity:** `{data.max_intensity}`\n")
+            if data.intensity_percentiles:
+                f.write("- **Percentiles:** " + ", ".join(
+                    f"P{p} `{value}`" for p, value in data.intensity_percentiles.items()
+                ) + "\n")
+            if data.intensity_histogram is not None:
+                f.write("\n| Intensity | Points |\n|---|---|\n")
+                for low, high, count in histogram_bins(*data.intensity_histogram):
+                    f.write(f"| {low:.0f} to {high:.0f} | {count} |\n")
             f.write("\n")
 
         # -- Spatial Measures --
         if (data.num_points or data.area or data.density or
-            data.bounds or data.x_axis_bounds or data.y_axis_bounds):
+            data.bounds or data.x_axis_bounds or data.y_axis_bounds or data.effective_density is not None or
+            data.density_percentiles or data.gap_percentage is not None):
             f.write("## Spatial Measures\n")
             if data.num_points:
                 f.write(f"- **Number of Points:** `{data.num_points}`\n")
@@ -150,6 +346,14 @@ def generate_markdown_report(self, path, data: ReportData):
                 f.write(f"- **Area:** `{data.area}`\n")
             if data.density:
                 f.write(f"- **Density:** `{data.density}`\n")
+            if data.effective_density is not None:
+                f.write(f"- **Effective Density:** `{data.effective_density}` (grid cells of {data.density_cell_size:g} x {data.density_cell_size:g})\n")
+            if data.density_percentiles:
+                f.write("- **Density Percentiles:** " + ", ".join(
+                    f"P{p} `{value:.2f}`" for p, value in data.density_percentiles.items()
+                ) + "\n")
+            if data.gap_percentage is not None:
+                f.write(f"- **Gap Percentage:** `{data.gap_percentage:.2f}%`\n")
             if data.bounds:
                 f.write(f"- **Bounds Min:** `{data.bounds[0]}`\n")
                 f.write(f"- **Bounds Max:** `{data.bounds[1]}`\n")
@@ -162,12 +366,33 @@ def generate_markdown_report(self, path, data: ReportData):
             f.write("\n")
 
         # -- GPS Time --
-        if (data.min_time or data.max_time):
+        if (data.min_time or data.max_time or data.time_percentiles or data.time_histogram is not None or
+            data.flightline_passes):
             f.write("## GPS Time\n")
             if data.min_time:
                 f.write(f"- **Min GPS Time:** `{data.min_time}`\n")
             if data.max_time:
                 f.write(f"- **Max GPS Time:** `{data.max_time}`\n")
+            if data.time_percentiles:
+                for p, value in data.time_percentiles.items():
+                    f.write(f"- **P{p}:** `{value}`\n")
+            if data.time_coverage is not None:
+                f.write(f"- **Time Coverage:** `{data.time_coverage:.1%}`\n")
+            if data.time_histogram is not None:
+                f.write("\n| Bin Start | Points |\n|---|---|\n")
+                for start, _, count in histogram_bins(*data.time_histogram):
+                    f.write(f"| {time_bin_label(start)} | {count} |\n")
+            if data.flightline_passes:
+                f.write(f"\n**Flightline Passes:** {passes_summary(data.flightline_passes)}\n")
+                f.write("\n| Source | Pass | Points | Start | End | Duration (s) | Coverage | X Range | Y Range |\n")
+                f.write("|---|---|---|---|---|---|---|---|---|\n")
+                for p in data.flightline_passes:
+                    xmin, ymin, xmax, ymax = p["bounds"]
+                    f.write(
+                        f"| {p['source_id']} | {p['pass_number']} | {p['num_points']} | {time_bin_label(p['start'])} | "
+                        f"{time_bin_label(p['end'])} | {p['duration']:.1f} | {p['coverage']:.1%} | "
+                        f"{xmin:.2f} to {xmax:.2f} | {ymin:.2f} to {ymax:.2f} |\n"
+                    )
             f.write("\n")
 
         # -- Classifications --
@@ -230,6 +455,17 @@ def generate_pdf_report(self, path, data: ReportData):
         y -= 0.6 * cm
         check_page_space()
 
+    def draw_chart(chart_buf, chart_height=7 * cm):
+        nonlocal y
+        chart_width = 12 * cm
+        if y - chart_height < 2 * cm:
+            draw_page_number()
+            canvas.showPage()
+            y = height - 2 * cm
+        canvas.drawImage(ImageReader(chart_buf), (width - chart_width) / 2, y - chart_height, width=chart_width, height=chart_height)
+        y -= chart_height + 0.5 * cm
+        check_page_space()
+
     write_heading("LiDAR File Report", level=1)
 
     current_time = datetime.now()
@@ -273,16 +509,23 @@ def generate_pdf_report(self, path, data: ReportData):
             write_item("Creation Date", data.creation_date)
 
     # -- Intensity --
-    if data.min_intensity or data.max_intensity:
+    if (data.min_intensity or data.max_intensity or data.intensity_percentiles or
+        data.intensity_histogram is not None):
         write_heading("Intensity", level=2)
         if data.min_intensity:
             write_item("Min Intensity", data.min_intensity)
         if data.max_intensity:
             write_item("Max Intensity", data.max_intensity)
+        if data.intensity_percentiles:
+            for p, value in data.intensity_percentiles.items():
+                write_item(f"P{p} Intensity", value)
+        if data.intensity_histogram is not None:
+            draw_chart(generate_histogram_chart(*data.intensity_histogram, "Intensity"))
 
     # -- Spatial Measures --
     if (data.num_points or data.area or data.density or
-        data.bounds or data.x_axis_bounds or data.y_axis_bounds):
+        data.bounds or data.x_axis_bounds or data.y_axis_bounds or data.effective_density is not None or
+        data.density_percentiles or data.gap_percentage is not None):
         write_heading("Spatial Measures", level=2)
         if data.num_points:
             write_item("Number of Points", data.num_points)
@@ -290,6 +533,13 @@ def generate_pdf_report(self, path, data: ReportData):
             write_item("Area", data.area)
         if data.density:
             write_item("Density", data.density)
+        if data.effective_density is not None:
+            write_item("Effective Density", f"{data.effective_density:.3f}")
+        if data.density_percentiles:
+            for p, value in data.density_percentiles.items():
+                write_item(f"P{p} Density", f"{value:.3f}")
+        if data.gap_percentage is not None:
+            write_item("Gap Percentage", f"{data.gap_percentage:.2f}%")
         if data.bounds:
             write_item("Bounds Min", data.bounds[0])
             write_item("Bounds Max", data.bounds[1])
@@ -301,12 +551,28 @@ def generate_pdf_report(self, path, data: ReportData):
             write_item("Z-Axis Bounds", data.z_axis_bounds)
 
     # -- GPS Time --
-    if (data.min_time or data.max_time):
+    if (data.min_time or data.max_time or data.time_percentiles or data.time_histogram is not None or
+        data.flightline_passes):
         write_heading("GPS Time", level=2)
         if data.min_time:
             write_item("Min GPS Time", data.min_time)
         if data.max_time:
             write_item("Max GPS Time", data.max_time)
+        if data.time_percentiles:
+            for p, value in data.time_percentiles.items():
+                write_item(f"P{p} GPS Time", value)
+        if data.time_coverage is not None:
+            write_item("Time Coverage", f"{data.time_coverage:.1%}")
+        if data.time_histogram is not None:
+            edges, counts = data.time_histogram
+            draw_chart(generate_histogram_chart(edges - edges[0], counts, "Seconds since first point", color="darkorange"))
+        if data.flightline_passes:
+            write_item("Flightline Passes", passes_summary(data.flightline_passes))
+            for p in data.flightline_passes:
+                write_item(
+                    f"Source {p['source_id']} pass {p['pass_number']}",
+                    f"{p['num_points']} pts, {p['duration']:.0f} s, {p['coverage']:.0%}"
+                )
 
     draw_page_number()
     canvas.showPage()
@@ -4,17 +4,17 @@ from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
 from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
-import numpy as np
-
 from .report_dialog import ReportDialog
-from .report_data import ReportData
 
-from ..utils import format_global_encoding, format_point_format
-from ..utils import gps_time_to_datetime, create_loading_dialog
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import header_wkt, read_header
+from ..raster_io import write_geotiff
+from ..processing_region.processing_region import region_for_file
 
-from .report_functions import generate_txt_report, generate_markdown_report, generate_pdf_report
+from .report_functions import DENSITY_FIELDS, collect_report_data_streaming, has_gps_time, write_report
+from .report_records import PARQUET_CATALOG_NAME
+from .report_statistics import DensityGrid
 
 # -------------------------
 # --- Report Generation ---
@@ -31,34 +31,20 @@ def generate_report(self):
         return
 
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Report Generation")
+    self.last_profiler = profiler
 
     try:
-        try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-
-            loading_dialog.show()
-            QApplication.processEvents()
-
-            las = laspy.read(filename, laz_backend=LazBackend.Lazrs)
-
-            unique_classes, class_counts = np.unique(las.classification, return_counts=True)  # Classification values and their counts
-            unique_returns, ret_counts = np.unique(las.return_number, return_counts=True)   # Return number values and their counts
+        # Only the header is needed up front, the points are streamed once the contents are chosen
+        header = read_header(filename)
 
-            if hasattr(las, "gps_time"):    # Check if GPS time is present. This should, in theory, always be true for LAS files.
-                    dt_min = gps_time_to_datetime(las.gps_time.min()).isoformat()
-                    dt_max = gps_time_to_datetime(las.gps_time.max()).isoformat()
-            else:
-                dt_min = dt_max = None
-                QMessageBox.warning(self.iface.mainWindow(), "Warning", "GPS Time not found in the file. This may affect the report.")
-
-        finally:
-            loading_dialog.close()
-            QApplication.restoreOverrideCursor()
+        if not has_gps_time(header):   # Check if GPS time is present. This should, in theory, always be true for LAS files.
+            QMessageBox.warning(self.iface.mainWindow(), "Warning", "GPS Time not found in the file. This may affect the report.")
 
         QMessageBox.information(self.iface.mainWindow(), "File Info",
             f"File Name: {os.path.basename(filename)}\n"
-            f"File Source ID: {las.header.file_source_id}\n"
-            f"System ID: {las.header.system_identifier}\n"
+            f"File Source ID: {header.file_source_id}\n"
+            f"System ID: {header.system_identifier}\n"
         )
 
         dialog = ReportDialog(self.iface.mainWindow())
@@ -68,10 +54,18 @@ def generate_report(self):
         # is_txt = dialog.radioTxt.isChecked()
         is_md = dialog.radioMarkdown.isChecked()
         is_pdf = dialog.radioPdf.isChecked()
+        is_json = dialog.radioJson.isChecked()
+        is_parquet = dialog.radioParquet.isChecked()
 
         if is_pdf:
             ext = ".pdf"
             filter_str = "PDF Files (*.pdf)"
+        elif is_json:
+            ext = ".json"
+            filter_str = "JSON Files (*.json)"
+        elif is_parquet:
+            ext = ".parquet"
+            filter_str = None
         elif is_md:
             ext = ".md"
             filter_str = "Markdown Files (*.md)"
@@ -79,60 +73,53 @@ def generate_report(self):
             ext = ".txt"
             filter_str = "Text Files (*.txt)"
 
-        report_path, _ = QFileDialog.getSaveFileName(
-            self.iface.mainWindow(),
-            'Save Report',
-            os.path.splitext(filename)[0] + '_report' + ext,
-            filter_str
-        )
+        if is_parquet:
+            # The catalog is a folder: the folder picked is the catalog itself, or the one it is created in
+            folder = QFileDialog.getExistingDirectory(
+                self.iface.mainWindow(),
+                'Select Parquet Catalog or Its Parent Folder',
+                os.path.dirname(filename)
+            )
+            report_path = None
+            if folder:
+                report_path = folder if folder.lower().endswith(ext) else os.path.join(folder, PARQUET_CATALOG_NAME)
+        else:
+            report_path, _ = QFileDialog.getSaveFileName(
+                self.iface.mainWindow(),
+                'Save Report',
+                os.path.splitext(filename)[0] + '_report' + ext,
+                filter_str
+            )
         if not report_path:
             return
 
-        data = ReportData(
-            # -- Metadata --
-            file_name=os.path.basename(filename) if dialog.checkFileName.isChecked() else None,             # File name
-            file_source=las.header.file_source_id if dialog.checkFileSource.isChecked() else None,          # File source
-            global_encoding=format_global_encoding(las.header.global_encoding) if dialog.checkGlobalEncoding.isChecked() else None,     # Global encoding details
-            system_id=las.header.system_identifier if dialog.checkSystemId.isChecked() else None,           # Note: System ID only incluided in generated LAZ files
-            gen_software=las.header.generating_software if dialog.checkGenSoftware.isChecked() else None,   # Generating software (e.g., LAStools, PDAL)
-            version=las.header.version if dialog.checkVersion.isChecked() else None,                        # LAS version (e.g., 1.4)
-            point_format=format_point_format(las.header.point_format) if dialog.checkPointFormat.isChecked() else None,                 # Point format details
-            creation_date=str(las.header.creation_date) if dialog.checkCreationDate.isChecked() else None,  # Creation date of the file
-
-            # -- Intensity --
-            min_intensity=las.intensity.min() if dialog.checkMinIntensity.isChecked() else None,            # Minimum intensity value
-            max_intensity=las.intensity.max() if dialog.checkMaxIntensity.isChecked() else None,            # Maximum intensity value
-
-            # -- Spatial --
-            num_points=las.header.point_count if dialog.checkNumPoints.isChecked() else None,               # Total number of points in the file
-            area=(las.header.x_max - las.header.x_min) * (las.header.y_max - las.header.y_min) if dialog.checkArea.isChecked() else None, # Area covered by the point cloud (width * height)
-            density=las.header.point_count / (
-                (las.header.x_max - las.header.x_min) * (las.header.y_max - las.header.y_min)
-            ) if dialog.checkDensity.isChecked() else None,                                                 # Density of points (points per square unit)
-            bounds=(las.header.mins, las.header.maxs) if dialog.checkBounds.isChecked() else None,                  # Bounds of the point cloud (min, max)
-            x_axis_bounds=(las.header.x_min, las.header.x_max) if dialog.checkXAxisBounds.isChecked() else None,    # Bounds for X-axis
-            y_axis_bounds=(las.header.y_min, las.header.y_max) if dialog.checkYAxisBounds.isChecked() else None,    # Bounds for Y-axis
-            z_axis_bounds=(las.header.z_min, las.header.z_max) if dialog.checkZAxisBounds.isChecked() else None,    # Bounds for Z-axis
-
-            # -- GPS Time --
-            min_time=dt_min if dialog.checkMinTime.isChecked() else None,                                   # Minimum GPS time
-            max_time=dt_max if dialog.checkMaxTime.isChecked() else None,                                   # Maximum GPS time
-
-            # -- Classifications and Returns --
-            unique_classes=unique_classes if dialog.checkClassCounts.isChecked() else None,                 # Unique classification values
-            class_counts=class_counts if dialog.checkClassCounts.isChecked() else None,
-            unique_returns=unique_returns if dialog.checkReturnCounts.isChecked() else None,                # Unique return number values
-            return_counts=ret_counts if dialog.checkReturnCounts.isChecked() else None,
-        )
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
 
-        if is_pdf:
-            generate_pdf_report(self, report_path, data)
-        elif is_md:
-            generate_markdown_report(self, report_path, data)
-        else:
-            generate_txt_report(self, report_path, data)
+        fields = dialog.selected_fields()
+        cell_size, export_density = dialog.get_density_options()
+        region = region_for_file(self, filename)
+        density_grid = None
+        if export_density or fields & DENSITY_FIELDS:
+            density_grid = DensityGrid.for_header(header, cell_size, region)
+
+        # One streaming pass: fixed-size histograms and sketches instead of the whole file in memory
+        with profiler.stage("Compute statistics", points=header.point_count):
+            data = collect_report_data_streaming(filename, region, fields, density_grid=density_grid)
+
+        with profiler.stage("Write report"):
+            write_report(self, report_path, data, ext.lstrip("."))
+
+        message = f"Report {'appended to' if is_parquet else 'created at'} {report_path}"
+        if export_density:
+            raster_path = os.path.splitext(report_path)[0] + "_density.tif"
+            with profiler.stage("Write density raster"):
+                write_geotiff(raster_path, density_grid.density(), density_grid.geotransform, header_wkt(header))
+            self.iface.addRasterLayer(raster_path, f"{os.path.splitext(os.path.basename(filename))[0]} density")
+            message += f"\nDensity raster ({density_grid.cell_size:g} cells) created at {raster_path}"
 
-        QMessageBox.information(self.iface.mainWindow(), "Success", f"Report created at {report_path}")
+        QMessageBox.information(self.iface.mainWindow(), "Success", message)
 
     except Exception as e:
         QMessageBox.critical(self.iface.mainWindow(), "Error", f"Failed to process file:\n{e}")
@@ -140,3 +127,4 @@ def generate_report(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
@@ -0,0 +1,201 @@
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+from .report_data import ReportData
+from .report_statistics import PERCENTILES
+
+# pyarrow is optional: without it the Parquet output is unavailable, JSON still works
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ds = None
+    pq = None
+
+# --------------------------------------
+# --- Machine-Readable Report Output ---
+# --------------------------------------
+
+# Fixed class and return columns, so the records of every file share one schema
+CLASS_CODES = range(0, 19)      # ASPRS standard classes, other codes are summed in class_other_count
+RETURN_NUMBERS = range(0, 16)   # Every value of the 4-bit return number field
+PARQUET_CATALOG_NAME = "mylidar_reports.parquet"   # Dataset folder, one part file per append
+PART_PREFIX = "part-"
+
+def _column_types():
+    # (name, type) of every record column, types named after their pyarrow constructors
+    columns = [
+        ("report_date", "timestamp"), ("file_name", "string"), ("file_source", "int32"),
+        ("global_encoding", "string"), ("system_id", "string"), ("gen_software", "string"),
+        ("version", "string"), ("point_format", "string"), ("creation_date", "string"),
+        ("min_intensity", "int32"), ("max_intensity", "int32"),
+    ]
+    columns += [(f"intensity_p{p}", "int32") for p in PERCENTILES]
+    columns += [("intensity_histogram_edges", "list_float64"), ("intensity_histogram_counts", "list_int64")]
+    columns += [
+        ("num_points", "int64"), ("area", "float64"), ("density", "float64"),
+        ("effective_density", "float64"), ("gap_percentage", "float64"), ("density_cell_size", "float64"),
+    ]
+    columns += [(f"density_p{p}", "float64") for p in PERCENTILES]
+    columns += [(f"{bound}_{axis}", "float64") for bound in ("min", "max") for axis in "xyz"]
+    columns += [("min_time", "timestamp"), ("max_time", "timestamp"), ("time_coverage", "float64")]
+    columns += [(f"time_p{p}", "timestamp") for p in PERCENTILES]
+    columns += [("time_histogram_edges", "list_float64"), ("time_histogram_counts", "list_int64")]
+    # One list entry per flightline pass, in source then time order
+    columns += [("num_flightlines", "int32"), ("num_passes", "int32")]
+    columns += [
+        ("pass_source_ids", "list_int64"), ("pass_numbers", "list_int64"), ("pass_point_counts", "list_int64"),
+        ("pass_start_times", "list_timestamp"), ("pass_end_times", "list_timestamp"),
+        ("pass_time_coverages", "list_float64"),
+    ]
+    columns += [(f"pass_{bound}_{axis}", "list_float64") for bound in ("min", "max") for axis in "xy"]
+    columns += [(f"class_{code}_count", "int64") for code in CLASS_CODES]
+    columns += [("class_other_count", "int64")]
+    columns += [(f"return_{number}_count", "int64") for number in RETURN_NUMBERS]
+    return columns
+
+REPORT_COLUMNS = _column_types()
+
+def report_schema():
+    types = {
+        "string": pa.string(), "int32": pa.int32(), "int64": pa.int64(), "float64": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "list_float64": pa.list_(pa.float64()), "list_int64": pa.list_(pa.int64()),
+        "list_timestamp": pa.list_(pa.timestamp("us", tz="UTC")),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in REPORT_COLUMNS])
+
+def _timestamp(iso):
+    return None if iso is None else datetime.fromisoformat(iso)
+
+def _percentile_columns(prefix, percentiles, convert):
+    percentiles = percentiles or {}
+    return {f"{prefix}_p{p}": convert(percentiles[p]) if p in percentiles else None for p in PERCENTILES}
+
+def _histogram_columns(prefix, histogram):
+    if histogram is None:
+        return {f"{prefix}_edges": None, f"{prefix}_counts": None}
+    edges, counts = histogram
+    return {f"{prefix}_edges": [float(e) for e in edges], f"{prefix}_counts": [int(c) for c in counts]}
+
+def _pass_columns(passes):
+    names = [name for name, _ in REPORT_COLUMNS if name.startswith(("pass_", "num_flightlines", "num_passes"))]
+    if passes is None:
+        return dict.fromkeys(names)
+    return {
+        "num_flightlines": len({p["source_id"] for p in passes}),
+        "num_passes": len(passes),
+        "pass_source_ids": [p["source_id"] for p in passes],
+        "pass_numbers": [p["pass_number"] for p in passes],
+        "pass_point_counts": [p["num_points"] for p in passes],
+        "pass_start_times": [_timestamp(p["start_time"]) for p in passes],
+        "pass_end_times": [_timestamp(p["end_time"]) for p in passes],
+        "pass_time_coverages": [p["coverage"] for p in passes],
+        "pass_min_x": [p["bounds"][0] for p in passes],
+        "pass_min_y": [p["bounds"][1] for p in passes],
+        "pass_max_x": [p["bounds"][2] for p in passes],
+        "pass_max_y": [p["bounds"][3] for p in passes],
+    }
+
+def _count_columns(prefix, codes, values, counts):
+    # Zero for the codes absent from the file, null for every column when the counts were not collected
+    if values is None or counts is None:
+        return {f"{prefix}_{code}_count": None for code in codes}, None
+    by_code = {int(v): int(c) for v, c in zip(values, counts)}
+    columns = {f"{prefix}_{code}_count": by_code.pop(code, 0) for code in codes}
+    return columns, sum(by_code.values())   # Counts of the codes without a column of their own
+
+def report_record(data: ReportData):
+    """Flat record of typed values, one per REPORT_COLUMNS column (None for the fields not collected)."""
+    record = {
+        "report_date": datetime.now(timezone.utc),
+        "file_name": data.file_name,
+        "file_source": data.file_source,
+        "global_encoding": data.global_encoding,
+        "system_id": data.system_id,
+        "gen_software": data.gen_software,
+        "version": None if data.version is None else str(data.version),
+        "point_format": data.point_format,
+        "creation_date": data.creation_date,
+        "min_intensity": data.min_intensity,
+        "max_intensity": data.max_intensity,
+        "num_points": data.num_points,
+        "area": None if data.area is None else float(data.area),
+        "density": None if data.density is None else float(data.density),
+        "effective_density": data.effective_density,
+        "gap_percentage": data.gap_percentage,
+        "density_cell_size": data.density_cell_size,
+        "min_time": _timestamp(data.min_time),
+        "max_time": _timestamp(data.max_time),
+        "time_coverage": data.time_coverage,
+    }
+    record.update(_percentile_columns("intensity", data.intensity_percentiles, int))
+    record.update(_percentile_columns("density", data.density_percentiles, float))
+    record.update(_percentile_columns("time", data.time_percentiles, _timestamp))
+    record.update(_histogram_columns("intensity_histogram", data.intensity_histogram))
+    record.update(_histogram_columns("time_histogram", data.time_histogram))
+    record.update(_pass_columns(data.flightline_passes))
+
+    # Bounds from whichever of the bounds or axis bounds fields were collected
+    bounds = {}
+    if data.bounds is not None:
+        for i, axis in enumerate("xyz"):
+            bounds[axis] = (data.bounds[0][i], data.bounds[1][i])
+    for axis, axis_bounds in zip("xyz", (data.x_axis_bounds, data.y_axis_bounds, data.z_axis_bounds)):
+        if axis_bounds is not None:
+            bounds[axis] = axis_bounds
+    for axis in "xyz":
+        low, high = bounds.get(axis, (None, None))
+        record[f"min_{axis}"] = None if low is None else float(low)
+        record[f"max_{axis}"] = None if high is None else float(high)
+
+    class_columns, class_other = _count_columns("class", CLASS_CODES, data.unique_classes, data.class_counts)
+    record.update(class_columns)
+    record["class_other_count"] = class_other
+    record.update(_count_columns("return", RETURN_NUMBERS, data.unique_returns, data.return_counts)[0])
+    return record
+
+# --- JSON ---
+
+def generate_json_report(self, path, data: ReportData):
+    record = report_record(data)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2, default=lambda value: value.isoformat())
+
+# --- Parquet ---
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet reports need the pyarrow package, install it in the QGIS Python environment.")
+
+def append_parquet_reports(path, reports):
+    """
+    Add the records of `reports` (ReportData) to the Parquet catalog at `path`:
+    a dataset folder holding one part file per call, created if needed. The
+    rows already in the catalog are never read nor rewritten, so an append
+    costs the same however many files the catalog holds. Every part shares
+    the fixed REPORT_COLUMNS schema, read_parquet_reports() loads them as one
+    table.
+    """
+    _require_pyarrow()
+    os.makedirs(path, exist_ok=True)
+
+    table = pa.Table.from_pylist([report_record(data) for data in reports], schema=report_schema())
+    name = f"{PART_PREFIX}{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+    # Hidden while written, pyarrow datasets skip the files starting with a dot
+    temp_path = os.path.join(path, f".{name}.tmp")
+    pq.write_table(table, temp_path, compression="zstd")
+    os.replace(temp_path, os.path.join(path, name))
+    return table.num_rows
+
+def read_parquet_reports(path):
+    """Every record of the Parquet catalog at `path` as one table, with nulls for the columns older parts lack."""
+    _require_pyarrow()
+    return ds.dataset(path, format="parquet", schema=report_schema()).to_table()
+
+def generate_parquet_report(self, path, data: ReportData):
+    append_parquet_reports(path, [data])
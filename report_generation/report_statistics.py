@@ -0,0 +1,376 @@
+import math
+
+import numpy as np
+
+# -----------------------------------
+# --- Streaming Report Statistics ---
+# -----------------------------------
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+HISTOGRAM_BINS = 32
+INTENSITY_LEVELS = 65536    # intensity is a uint16, one exact bin per value
+TIME_BIN_WIDTH = 1.0        # GPS time coverage resolution in seconds
+DENSITY_CELL_SIZE = 1.0
+MAX_DENSITY_CELLS = 25_000_000  # 100 MB of int32 counts, coarser cells beyond
+PASS_GAP = 10.0             # GPS time gap in seconds splitting a flightline into separate passes
+SOURCE_SHIFT = 47           # Packed (point_source_id, time bin) keys, time bins offset to stay positive
+BIN_OFFSET = 1 << 46
+
+class IntensityHistogram:
+    """Exact intensity distribution: one bin per possible uint16 value, 512 KB whatever the file size."""
+
+    def __init__(self):
+        self.counts = np.zeros(INTENSITY_LEVELS, dtype=np.int64)
+
+    def update(self, intensity):
+        self.counts += np.bincount(intensity, minlength=INTENSITY_LEVELS)
+
+    def merge(self, other):
+        self.counts += other.counts
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def min(self):
+        return int(np.flatnonzero(self.counts)[0])
+
+    def max(self):
+        return int(np.flatnonzero(self.counts)[-1])
+
+    def percentiles(self, percentiles=PERCENTILES):
+        # Exact (lower) percentiles from the cumulative counts
+        cumulative = np.cumsum(self.counts)
+        ranks = np.ceil(np.asarray(percentiles) / 100 * cumulative[-1]).astype(np.int64)
+        values = np.searchsorted(cumulative, np.maximum(ranks, 1))
+        return {p: int(v) for p, v in zip(percentiles, values)}
+
+    def histogram(self, num_bins=HISTOGRAM_BINS):
+        # Display bins over the occupied intensity range
+        low, high = self.min(), self.max()
+        edges = np.linspace(low, high + 1, num_bins + 1)
+        bin_of_value = np.clip(np.searchsorted(edges, np.arange(low, high + 1), side="right") - 1, 0, num_bins - 1)
+        counts = np.bincount(bin_of_value, weights=self.counts[low:high + 1], minlength=num_bins).astype(np.int64)
+        return edges, counts
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch: a bounded set of (mean, weight) centroids over
+    the sorted values. Each update or merge re-compresses into at most `size`
+    centroids of equal weight, so the rank error stays around 1/size and
+    sketches from chunks, files or processes combine in any order.
+    """
+
+    def __init__(self, size=2048):
+        self.size = size
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        values = np.sort(values)
+        self._absorb(*self._compress(values, np.ones(len(values))))
+
+    def merge(self, other):
+        if len(other.means) == 0:
+            return
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._absorb(other.means, other.weights)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def _absorb(self, means, weights):
+        means = np.concatenate((self.means, means))
+        weights = np.concatenate((self.weights, weights))
+        order = np.argsort(means, kind="stable")
+        self.means, self.weights = self._compress(means[order], weights[order])
+
+    def _compress(self, sorted_means, weights):
+        if len(sorted_means) <= self.size:
+            return sorted_means, weights
+        # Group consecutive centroids into `size` slices of equal cumulative weight
+        cumulative = np.cumsum(weights)
+        groups = np.minimum((cumulative - weights / 2) / cumulative[-1] * self.size, self.size - 1).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        group_weights = np.add.reduceat(weights, starts)
+        group_means = np.add.reduceat(sorted_means * weights, starts) / group_weights
+        return group_means, group_weights
+
+    def quantiles(self, percentiles=PERCENTILES):
+        if len(self.means) == 0:
+            return {}
+        # Interpolate between centroid midpoints, anchored on the exact extremes
+        cumulative = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, cumulative, self.count]
+        values = np.r_[self.minimum, self.means, self.maximum]
+        ranks = np.asarray(percentiles, dtype=np.float64) / 100 * self.count
+        return {p: float(v) for p, v in zip(percentiles, np.interp(ranks, positions, values))}
+
+class TimeCoverage:
+    """
+    GPS time occupancy in fixed-width bins, stored sparsely so the memory
+    follows the acquisition duration rather than the number of points.
+    """
+
+    def __init__(self, bin_width=TIME_BIN_WIDTH):
+        self.bin_width = bin_width
+        self.bins = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, gps_time):
+        bins, counts = np.unique(np.floor(np.asarray(gps_time) / self.bin_width).astype(np.int64), return_counts=True)
+        self._merge_bins(bins, counts)
+
+    def merge(self, other):
+        self._merge_bins(other.bins, other.counts)
+
+    def _merge_bins(self, bins, counts):
+        merged, inverse = np.unique(np.concatenate((self.bins, bins)), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate((self.counts, counts)), minlength=len(merged)).astype(np.int64)
+        self.bins = merged
+
+    def coverage(self):
+        # Share of the acquisition span holding at least one point
+        if len(self.bins) == 0:
+            return None
+        return len(self.bins) / (self.bins[-1] - self.bins[0] + 1)
+
+    def histogram(self, num_bins=HISTOGRAM_BINS):
+        start = self.bins[0] * self.bin_width
+        end = (self.bins[-1] + 1) * self.bin_width
+        edges = np.linspace(start, end, num_bins + 1)
+        display_bin = np.clip(np.searchsorted(edges, self.bins * self.bin_width, side="right") - 1, 0, num_bins - 1)
+        counts = np.bincount(display_bin, weights=self.counts, minlength=num_bins).astype(np.int64)
+        return edges, counts
+
+class FlightlinePasses:
+    """
+    Passes of every flightline: runs of points of one point_source_id without
+    a GPS time gap above `gap` seconds. The points are summarized per (source,
+    time bin) with their count and their time and XY ranges. Bins are never
+    wider than the gap, so no gap can hide inside a bin: the passes are exact,
+    the memory follows the acquisition duration rather than the number of
+    points, and chunks or files can be merged.
+    """
+
+    def __init__(self, gap=PASS_GAP, bin_width=TIME_BIN_WIDTH):
+        self.gap = gap
+        self.bin_width = min(bin_width, gap)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.mins = np.empty((0, 3))    # GPS time, x, y
+        self.maxs = np.empty((0, 3))
+
+    def update(self, point_source_id, gps_time, x, y):
+        gps_time = np.asarray(gps_time, dtype=np.float64)
+        bins = np.floor(gps_time / self.bin_width).astype(np.int64) + BIN_OFFSET
+        keys = (np.asarray(point_source_id).astype(np.int64) << SOURCE_SHIFT) | bins
+        values = np.column_stack((gps_time, x, y))
+        self._merge_bins(keys, np.ones(len(keys), dtype=np.int64), values, values)
+
+    def merge(self, other):
+        self._merge_bins(other.keys, other.counts, other.mins, other.maxs)
+
+    def _merge_bins(self, keys, counts, mins, maxs):
+        keys = np.concatenate((self.keys, keys))
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        self.keys = keys[starts]
+        self.counts = np.add.reduceat(np.concatenate((self.counts, counts))[order], starts)
+        self.mins = np.minimum.reduceat(np.concatenate((self.mins, mins))[order], starts, axis=0)
+        self.maxs = np.maximum.reduceat(np.concatenate((self.maxs, maxs))[order], starts, axis=0)
+
+    def passes(self):
+        """
+        One dict per pass, ordered by source and time: source id, pass number
+        within the source, point count, start and end GPS time, duration,
+        time coverage (share of the pass's time bins holding points) and
+        (xmin, ymin, xmax, ymax) bounds.
+        """
+        if len(self.keys) == 0:
+            return []
+        sources = self.keys >> SOURCE_SHIFT
+        bins = self.keys & ((1 << SOURCE_SHIFT) - 1)
+        # Keys are sorted by source then time, a pass ends where the source changes or the time jumps
+        new_pass = np.r_[True, (sources[1:] != sources[:-1]) | (self.mins[1:, 0] - self.maxs[:-1, 0] > self.gap)]
+        starts = np.flatnonzero(new_pass)
+        ends = np.r_[starts[1:], len(self.keys)] - 1
+        counts = np.add.reduceat(self.counts, starts)
+        mins = np.minimum.reduceat(self.mins, starts, axis=0)
+        maxs = np.maximum.reduceat(self.maxs, starts, axis=0)
+        coverage = (ends - starts + 1) / (bins[ends] - bins[starts] + 1)
+
+        pass_sources = sources[starts]
+        first = np.r_[True, pass_sources[1:] != pass_sources[:-1]]
+        index = np.arange(len(starts))
+        numbers = index - np.maximum.accumulate(np.where(first, index, 0)) + 1
+        return [
+            {
+                "source_id": int(pass_sources[i]),
+                "pass_number": int(numbers[i]),
+                "num_points": int(counts[i]),
+                "start": float(mins[i, 0]),
+                "end": float(maxs[i, 0]),
+                "duration": float(maxs[i, 0] - mins[i, 0]),
+                "coverage": float(coverage[i]),
+                "bounds": (float(mins[i, 1]), float(mins[i, 2]), float(maxs[i, 1]), float(maxs[i, 2])),
+            }
+            for i in range(len(starts))
+        ]
+
+class DensityGrid:
+    """
+    Point counts on a north-up grid of square cells over `bounds`, filled chunk
+    by chunk. Only the cells inside `region` (when given) count towards the
+    gap percentage, so polygon regions are not reported as gaps.
+    """
+
+    def __init__(self, bounds, cell_size=DENSITY_CELL_SIZE, region=None):
+        xmin, ymin, xmax, ymax = bounds
+        width, height = max(xmax - xmin, cell_size), max(ymax - ymin, cell_size)
+        # The cells are enlarged rather than letting a fine grid over a large extent exhaust the memory
+        cell_size = max(cell_size, math.sqrt(width * height / MAX_DENSITY_CELLS))
+        self.cell_size = cell_size
+        self.xmin, self.ymax = xmin, ymax
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.counts = np.zeros((self.rows, self.cols), dtype=np.int32)
+        self.valid = None if region is None or not region.polygons else self._cells_inside(region)
+
+    @classmethod
+    def for_header(cls, header, cell_size=DENSITY_CELL_SIZE, region=None):
+        xmin, ymin, xmax, ymax = header.x_min, header.y_min, header.x_max, header.y_max
+        if region is not None:
+            # Only the part of the file inside the processing region is gridded
+            rxmin, rymin, rxmax, rymax = region.bbox
+            xmin, ymin = max(xmin, rxmin), max(ymin, rymin)
+            xmax, ymax = min(xmax, rxmax), min(ymax, rymax)
+        return cls((xmin, ymin, xmax, ymax), cell_size, region)
+
+    def _cells_inside(self, region):
+        cols, rows = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        x = self.xmin + (cols.ravel() + 0.5) * self.cell_size
+        y = self.ymax - (rows.ravel() + 0.5) * self.cell_size
+        return region.contains(x, y).reshape(self.rows, self.cols)
+
+    def update(self, x, y):
+        col = np.clip(((x - self.xmin) / self.cell_size).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(((self.ymax - y) / self.cell_size).astype(np.int64), 0, self.rows - 1)
+        # Sorting the chunk's cell ids is cheaper than a grid-sized bincount per chunk
+        cells, counts = np.unique(row * self.cols + col, return_counts=True)
+        self.counts.ravel()[cells] += counts.astype(np.int32)
+
+    def merge(self, other):
+        self.counts += other.counts
+
+    @property
+    def cell_area(self):
+        return self.cell_size * self.cell_size
+
+    @property
+    def geotransform(self):
+        # GDAL affine transform of the north-up grid
+        return (self.xmin, self.cell_size, 0.0, self.ymax, 0.0, -self.cell_size)
+
+    def density(self):
+        return (self.counts / self.cell_area).astype(np.float32)
+
+    def effective_density(self):
+        # Points per unit area over the occupied cells only
+        occupied = np.count_nonzero(self.counts)
+        if occupied == 0:
+            return 0.0
+        return float(self.counts.sum()) / (occupied * self.cell_area)
+
+    def density_percentiles(self, percentiles=PERCENTILES):
+        occupied = self.counts[self.counts > 0]
+        if len(occupied) == 0:
+            return {}
+        values = np.percentile(occupied / self.cell_area, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values)}
+
+    def gap_percentage(self):
+        counts = self.counts if self.valid is None else self.counts[self.valid]
+        if counts.size == 0:
+            return 0.0
+        return 100.0 * np.count_nonzero(counts == 0) / counts.size
+
+class ReportAccumulator:
+    """
+    Everything the report needs from the points, gathered chunk by chunk in a
+    single pass: bounds from the integer coordinates, class and return counts,
+    the intensity distribution and the GPS time distribution and coverage.
+    Accumulators of separate chunks or files can be merged. A `density_grid`
+    and `flightlines` passes are filled as well when they are given.
+    """
+
+    def __init__(self, density_grid=None, flightlines=None):
+        self.num_points = 0
+        self.mins = np.full(3, np.inf)
+        self.maxs = np.full(3, -np.inf)
+        self.class_counts = np.zeros(256, dtype=np.int64)
+        self.return_counts = np.zeros(16, dtype=np.int64)
+        self.intensity = IntensityHistogram()
+        self.time_sketch = QuantileSketch()
+        self.time_coverage = TimeCoverage()
+        self.density_grid = density_grid
+        self.flightlines = flightlines
+
+    def update(self, points):
+        if len(points) == 0:
+            return
+        self.num_points += len(points)
+        scales, offsets = np.asarray(points.scales), np.asarray(points.offsets)
+        for i, name in enumerate(("X", "Y", "Z")):
+            raw = points.array[name]
+            self.mins[i] = min(self.mins[i], raw.min() * scales[i] + offsets[i])
+            self.maxs[i] = max(self.maxs[i], raw.max() * scales[i] + offsets[i])
+
+        self.class_counts += np.bincount(points.classification, minlength=256)
+        self.return_counts += np.bincount(points.return_number, minlength=16)
+        self.intensity.update(points.intensity)
+        if "gps_time" in points.point_format.dimension_names:
+            self.time_sketch.update(points.gps_time)
+            self.time_coverage.update(points.gps_time)
+            if self.flightlines is not None:
+                x, y = (points.array[name] * scales[i] + offsets[i] for i, name in enumerate(("X", "Y")))
+                self.flightlines.update(points.point_source_id, points.gps_time, x, y)
+        if self.density_grid is not None:
+            self.density_grid.update(points.x, points.y)
+
+    def merge(self, other):
+        self.num_points += other.num_points
+        self.mins = np.minimum(self.mins, other.mins)
+        self.maxs = np.maximum(self.maxs, other.maxs)
+        self.class_counts += other.class_counts
+        self.return_counts += other.return_counts
+        self.intensity.merge(other.intensity)
+        self.time_sketch.merge(other.time_sketch)
+        self.time_coverage.merge(other.time_coverage)
+        if self.density_grid is not None and other.density_grid is not None:
+            self.density_grid.merge(other.density_grid)
+        if self.flightlines is not None and other.flightlines is not None:
+            self.flightlines.merge(other.flightlines)
+
+    @property
+    def has_gps_time(self):
+        return self.time_sketch.count > 0
+
+    def class_histogram(self):
+        # Same (values, counts) pair as np.unique(..., return_counts=True)
+        classes = np.flatnonzero(self.class_counts)
+        return classes, self.class_counts[classes]
+
+    def return_histogram(self):
+        returns = np.flatnonzero(self.return_counts)
+        return returns, self.return_counts[returns]
@@ -0,0 +1,145 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    CHUNK_SIZE, LIDAR_FILTER, OUTPUT_FILTER, PointStreamWriter, format_output_notes, read_header,
+    resolve_output_path
+)
+from ..processing_region.processing_region import region_for_file
+from .retiling_dialog import RetilingDialog
+from .retiling_functions import merge_files, retile
+
+# ----------------
+# --- Retiling ---
+# ----------------
+
+def split_or_merge_tiles(self):
+    dialog = RetilingDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    if dialog.is_split():
+        _split_tiles(self, *dialog.get_split_values())
+    else:
+        _merge_tiles(self, dialog.drop_withheld())
+
+def _split_tiles(self, tile_size, buffer, max_open, flag_buffer, compress):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Split into Tiles',
+        '',
+        LIDAR_FILTER
+    )
+    if not filename:
+        return
+
+    output_dir = QFileDialog.getExistingDirectory(
+        self.iface.mainWindow(),
+        'Select Output Folder for the Tiles',
+        os.path.dirname(filename)
+    )
+    if not output_dir:
+        return
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Split Tiles")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        num_points = read_header(filename).point_count
+        with profiler.stage("Split into tiles", points=num_points):
+            tiles = retile(
+                filename, output_dir, tile_size, buffer, region, CHUNK_SIZE, max_open, compress, flag_buffer
+            )
+        num_written = sum(tiles.values())
+
+        buffer_line = ""
+        if buffer > 0:
+            flag_note = ", flagged as withheld" if flag_buffer else ""
+            buffer_line = f"Points written (with {buffer:g} unit buffers{flag_note}): {num_written:,}\n"
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Split Complete",
+            f"Tiles written: {len(tiles):,} of {tile_size:g} units\n"
+            f"Points in the input: {num_points:,}\n"
+            f"{buffer_line}\n"
+            f"Tiles saved to:\n{output_dir}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Splitting Tiles",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _merge_tiles(self, drop_withheld):
+    filenames, _ = QFileDialog.getOpenFileNames(
+        self.iface.mainWindow(),
+        'Select LiDAR Files to Merge',
+        '',
+        LIDAR_FILTER
+    )
+    if not filenames:
+        return
+
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Merged LiDAR File',
+        os.path.join(os.path.dirname(filenames[0]), 'merged.laz'),
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return
+    output_path = resolve_output_path(output_path, selected_filter)
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Merge Tiles")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        # The first file gives the point format, scales, offsets and CRS of the output
+        with profiler.stage("Merge files") as stage:
+            with PointStreamWriter(output_path, read_header(filenames[0]), self.output_options) as writer:
+                num_points = merge_files(filenames, writer, drop_withheld, CHUNK_SIZE)
+            stage.points = num_points
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Merge Complete",
+            f"Files merged: {len(filenames):,}\n"
+            f"Points read: {num_points:,}\n"
+            f"Points written: {writer.points_written:,}\n\n"
+            f"Merged file saved to:\n{output_path}"
+            f"{format_output_notes(writer.notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Merging Files",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
@@ -0,0 +1,31 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './retiling_form.ui'))
+
+class RetilingDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.radioSplit.toggled.connect(self.groupSplit.setEnabled)
+        self.radioMerge.toggled.connect(self.groupMerge.setEnabled)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def is_split(self):
+        return self.radioSplit.isChecked()
+
+    def get_split_values(self):
+        tile_size = self.spinTileSize.value()
+        buffer = self.spinBuffer.value()
+        max_open = self.spinMaxOpen.value()
+        flag_buffer = self.checkFlagBuffer.isChecked() and buffer > 0
+        compress = self.checkCompress.isChecked()
+        return tile_size, buffer, max_open, flag_buffer, compress
+
+    def drop_withheld(self):
+        return self.checkDropWithheld.isChecked()
@@ -0,0 +1,136 @@
+import math
+import os
+
+import laspy
+from laspy import LazBackend
+import numpy as np
+
+from ..tile_index import MAX_OPEN_WRITERS, TileWriterPool
+
+# -----------------------------
+# --- Retiling (Processing) ---
+# -----------------------------
+
+class TileScheme:
+    """
+    Square tiles of `tile_size` aligned on multiples of the size, covering
+    `bounds`. Tile ids follow memory_planner.tile_ids(): column * rows + row,
+    rows counted from the south.
+    """
+
+    def __init__(self, bounds, tile_size, buffer=0.0):
+        xmin, ymin, xmax, ymax = bounds
+        self.tile_size = tile_size
+        self.buffer = buffer
+        self.x0 = math.floor(xmin / tile_size) * tile_size
+        self.y0 = math.floor(ymin / tile_size) * tile_size
+        self.cols = max(1, math.floor((xmax - self.x0) / tile_size) + 1)
+        self.rows = max(1, math.floor((ymax - self.y0) / tile_size) + 1)
+
+    def _col_row(self, x, y):
+        col = np.clip(np.floor((x - self.x0) / self.tile_size).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(np.floor((y - self.y0) / self.tile_size).astype(np.int64), 0, self.rows - 1)
+        return col, row
+
+    def assign(self, x, y):
+        """
+        (point index, tile id, is buffer) of every tile a point is written to:
+        its own tile, plus the tiles whose buffer ring holds it.
+        """
+        col, row = self._col_row(x, y)
+        if self.buffer <= 0:
+            return np.arange(len(x)), col * self.rows + row, np.zeros(len(x), dtype=bool)
+
+        col_lo, row_lo = self._col_row(x - self.buffer, y - self.buffer)
+        col_hi, row_hi = self._col_row(x + self.buffer, y + self.buffer)
+        span = math.ceil(2 * self.buffer / self.tile_size) + 1
+        indices, tiles, buffered = [], [], []
+        for dc in range(span):
+            for dr in range(span):
+                c, r = col_lo + dc, row_lo + dr
+                valid = np.flatnonzero((c <= col_hi) & (r <= row_hi))
+                indices.append(valid)
+                tiles.append(c[valid] * self.rows + r[valid])
+                buffered.append((c[valid] != col[valid]) | (r[valid] != row[valid]))
+        return np.concatenate(indices), np.concatenate(tiles), np.concatenate(buffered)
+
+    def tile_origin(self, tile):
+        col, row = divmod(int(tile), self.rows)
+        return self.x0 + col * self.tile_size, self.y0 + row * self.tile_size
+
+    def tile_path(self, folder, stem, tile, extension=".laz"):
+        # Named after the lower-left corner, like most tiled deliveries
+        return os.path.join(folder, f"{stem}_{'_'.join(_coord_label(v) for v in self.tile_origin(tile))}{extension}")
+
+def _coord_label(value):
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.2f}"
+
+def write_tiles(path, scheme, tile_path, region=None, chunk_size=1_000_000,
+                max_open=MAX_OPEN_WRITERS, compress=False, flag_buffer=False):
+    """
+    Distribute the points of `path` into the tiles of `scheme` in a single
+    streaming pass, `tile_path(tile)` naming the file of every tile. Points
+    within the scheme buffer of a neighboring tile are copied into it as well,
+    with the withheld flag set when `flag_buffer` is given so they can be told
+    apart (and dropped on merge). Returns {tile: (path, points written)}.
+    """
+    with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+        with TileWriterPool(reader.header, max_open, compress) as pool:
+            for points in reader.chunk_iterator(chunk_size):
+                if region is not None:
+                    points = points[region.contains(points.x, points.y)]
+                if len(points) == 0:
+                    continue
+                indices, tiles, buffered = scheme.assign(points.x, points.y)
+                # One sort per chunk groups the copies by tile
+                order = np.argsort(tiles, kind="stable")
+                tile_list, starts = np.unique(tiles[order], return_index=True)
+                ends = np.append(starts[1:], len(order))
+                for tile, start, end in zip(tile_list, starts, ends):
+                    selected = order[start:end]
+                    tile_points = points[indices[selected]]
+                    if flag_buffer and np.any(buffered[selected]):
+                        tile_points.withheld[buffered[selected]] = 1
+                    pool.write(tile, tile_path(tile), tile_points)
+    return {tile: (pool.paths[tile], pool.counts[tile]) for tile in sorted(pool.paths)}
+
+def retile(path, folder, tile_size, buffer=0.0, region=None, chunk_size=1_000_000,
+           max_open=MAX_OPEN_WRITERS, compress=True, flag_buffer=False):
+    """Split `path` into square tiles of `tile_size` in `folder`. Returns {tile path: points written}."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    extension = ".laz" if compress else ".las"
+    with laspy.open(path) as reader:   # Header only
+        header = reader.header
+    scheme = TileScheme((header.x_min, header.y_min, header.x_max, header.y_max), tile_size, buffer)
+    tiles = write_tiles(
+        path, scheme, lambda tile: scheme.tile_path(folder, stem, tile, extension),
+        region, chunk_size, max_open, compress, flag_buffer
+    )
+    return dict(tiles.values())
+
+def merge_files(paths, writer, drop_withheld=False, chunk_size=1_000_000):
+    """
+    Stream every file of `paths` into `writer`, whose header (point format,
+    scales and offsets) comes from the first file. laspy re-quantizes the
+    points of files with other scales or offsets as they are written.
+    Returns the number of points read.
+    """
+    target = None
+    num_points = 0
+    for path in paths:
+        with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+            header = reader.header
+            if target is None:
+                target = header
+            elif header.point_format != target.point_format:
+                raise ValueError(
+                    f"{os.path.basename(path)} has point format {header.point_format.id} "
+                    f"(or other extra dimensions), the output uses {target.point_format.id}."
+                )
+
+            for points in reader.chunk_iterator(chunk_size):
+                num_points += len(points)
+                if drop_withheld:
+                    points = points[points.withheld == 0]
+                writer.write(points)
+    return num_points
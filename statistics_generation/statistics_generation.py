@@ -2,12 +2,13 @@ from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
 import matplotlib.pyplot as plt
 import numpy as np
 
 from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import read_dimensions
+from ..processing_region.processing_region import region_for_file
 
 # -----------------------------
 # --- Statistics Generation ---
@@ -24,6 +25,8 @@ def generate_statistics(self):
         return
 
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Statistics Generation")
+    self.last_profiler = profiler
 
     try:
         QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -31,11 +34,18 @@ def generate_statistics(self):
         loading_dialog.show()
         QApplication.processEvents()
 
-        las = laspy.read(filename, laz_backend=LazBackend.Lazrs)
+        # Only the four plotted dimensions, straight from their columns when the file is cached
+        with profiler.stage("Read LAS/LAZ") as stage:
+            dimensions = read_dimensions(
+                filename, ("classification", "return_number", "x", "y"), region_for_file(self, filename)
+            )
+            stage.points = len(dimensions["x"])
 
         # Classification values
-        classifications = las.classification
-        unique_classes, class_counts = np.unique(classifications, return_counts=True)
+        with profiler.stage("Count classes and returns", points=len(dimensions["x"])):
+            classifications = dimensions["classification"]
+            unique_classes, class_counts = np.unique(classifications, return_counts=True)
+            unique_returns, return_counts = np.unique(dimensions["return_number"], return_counts=True)
         classification_info = {
             0: ("Created, Never Classified", "#A0A0A0"), 1: ("Unclassified", "#B0B0B0"),
             2: ("Ground", "#8B4513"), 3: ("Low Vegetation", "#ADFF2F"),
@@ -65,8 +75,6 @@ def generate_statistics(self):
         plt.show()
 
         # Return Number
-        return_numbers = las.return_number
-        unique_returns, return_counts = np.unique(return_numbers, return_counts=True)
         return_labels = [f"Return {r}" for r in unique_returns]
 
         plt.figure(figsize=(6, 4))
@@ -79,8 +87,8 @@ def generate_statistics(self):
         plt.show()
 
         # Point Density
-        x = las.x
-        y = las.y
+        x = dimensions["x"]
+        y = dimensions["y"]
 
         plt.figure(figsize=(6, 5))
         plt.hist2d(x, y, bins=100, cmap='viridis')
@@ -102,3 +110,4 @@ def generate_statistics(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
@@ -0,0 +1,15 @@
+import importlib.util
+import os
+import sys
+
+# The plugin folder is imported as the "mylidar" package, whatever its checkout name,
+# so the QGIS-free processing modules can be tested without QGIS
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "mylidar" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "mylidar", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["mylidar"] = package
+    spec.loader.exec_module(package)
@@ -0,0 +1,63 @@
+import laspy
+import numpy as np
+
+from mylidar.las_io import read_header
+from mylidar.duplicate_removal.duplicate_functions import (
+    DuplicateKeys, RecentKeys, duplicate_mask, stream_duplicate_removal
+)
+
+class CollectingWriter:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, points):
+        self.parts.append(points)
+
+def write_points(path, xyz):
+    header = laspy.LasHeader(point_format=1, version="1.2")
+    header.scales = [0.01, 0.01, 0.01]
+    header.offsets = [0.0, 0.0, 0.0]
+    las = laspy.LasData(header)
+    las.x, las.y, las.z = xyz.T
+    las.write(path)
+    return laspy.read(path)
+
+def random_xyz(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.round(rng.uniform(0, 100, (n, 3)), 2)
+
+def test_all_duplicate_chunks(tmp_path):
+    # The same points written twice: every chunk of the second copy is fully duplicated
+    xyz = random_xyz(20_000)
+    path = str(tmp_path / "twice.las")
+    write_points(path, np.vstack((xyz, xyz)))
+
+    writer = CollectingWriter()
+    num_points, num_duplicates = stream_duplicate_removal(
+        path, writer, DuplicateKeys(read_header(path)), chunk_size=5000
+    )
+    assert num_points == 40_000
+    assert num_duplicates == 20_000
+    assert sum(len(points) for points in writer.parts) == 20_000
+
+def test_recent_keys_ignore_empty_chunks():
+    recent = RecentKeys()
+    recent.add(np.empty(0, dtype=np.int64))
+    assert not recent.chunks
+    assert not np.any(recent.seen(np.arange(3, dtype=np.int64)))
+
+def test_stale_header_falls_back(tmp_path):
+    xyz = random_xyz(10_000, seed=1)
+    path = str(tmp_path / "points.las")
+    las = write_points(path, np.vstack((xyz, xyz[:2000])))
+    expected = duplicate_mask(las.points, DuplicateKeys(las.header))
+
+    # Header bounds covering only part of the points, as left by a tool that did not update them
+    stale = las.header.copy()
+    stale.mins = np.array([0.0, 0.0, 0.0])
+    stale.maxs = np.array([50.0, 50.0, 50.0])
+    assert np.array_equal(duplicate_mask(las.points, DuplicateKeys(stale), chunk_size=3000), expected)
+
+    writer = CollectingWriter()
+    num_points, num_duplicates = stream_duplicate_removal(path, writer, DuplicateKeys(stale), chunk_size=3000)
+    assert (num_points, num_duplicates) == (12_000, 2000)
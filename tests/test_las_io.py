@@ -0,0 +1,32 @@
+import laspy
+import numpy as np
+
+from mylidar.las_io import OutputOptions, prune_dimensions, write_las
+
+def las_with_empty_dimensions(num_points=100):
+    # Point format 3 without RGB values, and an all-zero extra dimension
+    header = laspy.LasHeader(point_format=3, version="1.2")
+    header.add_extra_dim(laspy.ExtraBytesParams(name="empty", type=np.float32))
+    las = laspy.LasData(header)
+    las.x = las.y = las.z = np.arange(num_points, dtype=np.float64)
+    las.intensity = np.arange(num_points, dtype=np.uint16)
+    las.gps_time = np.arange(num_points, dtype=np.float64)
+    return las
+
+def test_prune_leaves_the_input_as_it_is():
+    las = las_with_empty_dimensions()
+    pruned, notes = prune_dimensions(las)
+    assert len(notes) == 2
+    assert pruned.point_format.id == 1
+    assert list(pruned.point_format.extra_dimension_names) == []
+    assert las.point_format.id == 3
+    assert list(las.point_format.extra_dimension_names) == ["empty"]
+    assert np.array_equal(pruned.intensity, las.intensity)
+
+def test_pruned_write_keeps_the_written_object(tmp_path):
+    las = las_with_empty_dimensions()
+    path = str(tmp_path / "pruned.las")
+    write_las(las, path, OutputOptions(prune_dimensions=True))
+    assert laspy.read(path).point_format.id == 1
+    assert list(las.point_format.extra_dimension_names) == ["empty"]
+    assert np.array_equal(las.empty, np.zeros(len(las.points)))
@@ -0,0 +1,43 @@
+import laspy
+import numpy as np
+
+from mylidar.las_io import read_header
+from mylidar.raster_grid import RasterGrid
+from mylidar.noise_classification.noise_functions import (
+    HIGH_NOISE_CLASS, LOW_NOISE_CLASS, classify_noise_points, noise_limits, surface_statistics
+)
+
+def building_on_flat_ground(path, num_points=100_000, seed=0):
+    # Unclassified flat ground with an 8 m high building, 20 low and 20 high noise points away from it
+    rng = np.random.default_rng(seed)
+    x, y = rng.uniform(0, 200, num_points), rng.uniform(0, 200, num_points)
+    z = 100 + rng.normal(0, 0.05, num_points)
+    roof = (x > 83) & (x < 117) & (y > 83) & (y < 117)
+    z[roof] += 8
+    noise = rng.choice(np.flatnonzero(~roof), 40, replace=False)
+    z[noise[:20]] -= 10
+    z[noise[20:]] += 120
+
+    header = laspy.LasHeader(point_format=1, version="1.2")
+    header.scales = [0.01, 0.01, 0.01]
+    header.offsets = [0.0, 0.0, 0.0]
+    las = laspy.LasData(header)
+    las.x, las.y, las.z = x, y, z
+    las.classification[:] = 1
+    las.write(path)
+    return noise
+
+def test_building_without_ground_class_is_not_noise(tmp_path):
+    path = str(tmp_path / "building.las")
+    noise = building_on_flat_ground(path)
+    grid = RasterGrid.for_header(read_header(path), 10.0)
+
+    for tiles in (None, (2, 2)):
+        surface, mad, used_ground = surface_statistics(path, grid, tiles=tiles)
+        low_limit, high_limit = noise_limits(surface, mad, 3.0, 1.5, 50.0)
+        points = laspy.read(path).points
+        assert not used_ground
+        assert classify_noise_points(points, grid, low_limit, high_limit) == (20, 20)
+        classes = np.asarray(points.classification)
+        assert np.all(classes[noise[:20]] == LOW_NOISE_CLASS)
+        assert np.all(classes[noise[20:]] == HIGH_NOISE_CLASS)
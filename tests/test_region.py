@@ -0,0 +1,29 @@
+import numpy as np
+
+from mylidar.las_io import Region
+
+def square(xmin, ymin, xmax, ymax):
+    return [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)]
+
+def test_overlapping_polygons_keep_their_shared_area():
+    region = Region((0, 0, 15, 15), [[square(0, 0, 10, 10)], [square(5, 5, 15, 15)]])
+    x = np.array([2.0, 7.0, 12.0, 12.0])
+    y = np.array([2.0, 7.0, 12.0, 2.0])
+    assert region.contains(x, y).tolist() == [True, True, True, False]
+
+def test_polygon_hole_is_outside():
+    region = Region((0, 0, 10, 10), [[square(0, 0, 10, 10), square(4, 4, 6, 6)]])
+    x = np.array([2.0, 5.0, 8.0])
+    y = np.array([2.0, 5.0, 8.0])
+    assert region.contains(x, y).tolist() == [True, False, True]
+
+def test_hole_of_one_polygon_does_not_cut_another():
+    # The second polygon covers the hole of the first one
+    region = Region((0, 0, 10, 10), [[square(0, 0, 10, 10), square(4, 4, 6, 6)], [square(3, 3, 7, 7)]])
+    assert region.contains(np.array([5.0]), np.array([5.0])).tolist() == [True]
+
+def test_key_tells_polygons_with_the_same_bbox_apart():
+    whole = Region((0, 0, 10, 10), [[square(0, 0, 10, 10)]])
+    split = Region((0, 0, 10, 10), [[square(0, 0, 10, 5)], [square(0, 5, 10, 10)]])
+    assert whole.key != split.key
+    assert whole.key == Region((0, 0, 10, 10), [[square(0, 0, 10, 10)]]).key
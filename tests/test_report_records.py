@@ -0,0 +1,22 @@
+import os
+
+from mylidar.report_generation.report_data import ReportData
+from mylidar.report_generation.report_records import (
+    PART_PREFIX, append_parquet_reports, read_parquet_reports, report_schema
+)
+
+def report(name, num_points=1000):
+    return ReportData(name, "1.2", "1", num_points, None, (0.0, 10.0), (0.0, 10.0), (0.0, 1.0))
+
+def part_files(path):
+    return sorted(name for name in os.listdir(path) if name.startswith(PART_PREFIX))
+
+def test_appends_add_part_files(tmp_path):
+    path = str(tmp_path / "catalog.parquet")
+    for i in range(3):
+        assert append_parquet_reports(path, [report(f"tile_{i}.laz", 1000 + i)]) == 1
+    assert len(part_files(path)) == 3
+
+    table = read_parquet_reports(path)
+    assert table.schema.equals(report_schema())
+    assert sorted(table.column("file_name").to_pylist()) == ["tile_0.laz", "tile_1.laz", "tile_2.laz"]
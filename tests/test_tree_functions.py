@@ -0,0 +1,37 @@
+import numpy as np
+
+from mylidar.raster_grid import RasterGrid
+from mylidar.tree_count.tree_functions import find_trees
+
+PARAMS = dict(min_height=2.0, base_window=2.0, window_growth=0.15)
+
+def gaussian_canopy(size=200, num_trees=60, seed=0):
+    rng = np.random.default_rng(seed)
+    rows, cols = np.mgrid[0:size, 0:size]
+    chm = np.zeros((size, size))
+    for (row, col), height, sigma in zip(
+        rng.uniform(5, size - 5, (num_trees, 2)), rng.uniform(8, 30, num_trees), rng.uniform(1.5, 4, num_trees)
+    ):
+        chm = np.maximum(chm, height * np.exp(-((rows - row) ** 2 + (cols - col) ** 2) / (2 * sigma ** 2)))
+    return chm.astype(np.float32), RasterGrid((0, 0, size, size), 1.0)
+
+def sorted_trees(trees):
+    x, y, heights, areas = trees
+    order = np.lexsort((y, x))
+    return x[order], y[order], heights[order], areas[order]
+
+def test_isolated_crown_is_complete():
+    rows, cols = np.mgrid[0:200, 0:200]
+    chm = (20 * np.exp(-((rows - 100.3) ** 2 + (cols - 80.6) ** 2) / (2 * 3.0 ** 2))).astype(np.float32)
+    x, y, heights, areas = find_trees(chm, RasterGrid((0, 0, 200, 200), 1.0), **PARAMS)
+    assert len(x) == 1
+    assert areas[0] == np.count_nonzero(chm >= heights[0] / 2)
+
+def test_tiled_trees_match_whole_grid():
+    for seed in range(3):
+        chm, grid = gaussian_canopy(seed=seed)
+        whole = sorted_trees(find_trees(chm, grid, **PARAMS))
+        for tiles in ((2, 2), (3, 3), (4, 3)):
+            tiled = sorted_trees(find_trees(chm, grid, tiles=tiles, **PARAMS))
+            for expected, values in zip(whole, tiled):
+                assert np.array_equal(expected, values)
@@ -0,0 +1,99 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    CHUNK_SIZE, OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, format_output_notes, read_header, resolve_output_path
+)
+from ..processing_region.processing_region import region_for_file
+from .thinning_dialog import ThinningDialog
+from .thinning_functions import make_thinning, stream_thinning
+
+# ----------------
+# --- Thinning ---
+# ----------------
+
+MODE_NAMES = {
+    "voxel": "voxel grid of {:g} units, first point",
+    "voxel_centroid": "voxel grid of {:g} units, centroid",
+    "nth": "one point every {:d}",
+    "random": "random fraction of {:g}",
+    "spacing": "minimum spacing of {:g} units",
+}
+
+def thin_points(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select LiDAR File to Thin',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dialog = ThinningDialog(self.iface.mainWindow())
+    if dialog.exec_() != QDialog.Accepted:
+        return
+    mode, value = dialog.get_values()
+
+    output_path = _ask_output_path(self, filename)
+    if not output_path:
+        return
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Thinning")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        thinning = make_thinning(mode, header, value)
+
+        # Every mode only keeps per-voxel or per-chunk state: the points are always streamed
+        with profiler.stage("Thin points") as stage:
+            with PointStreamWriter(output_path, header, self.output_options) as writer:
+                num_points = stream_thinning(filename, writer, thinning, region, CHUNK_SIZE)
+            stage.points = num_points
+        num_kept = writer.points_written
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Thinning Complete",
+            f"Method: {MODE_NAMES[mode].format(value)}\n"
+            f"Original points: {num_points:,}\n"
+            f"Kept points: {num_kept:,} ({num_kept / max(num_points, 1):.2%})\n"
+            f"Reduction ratio: {num_points / max(num_kept, 1):.1f} : 1\n\n"
+            f"Thinned file saved to:\n{output_path}"
+            f"{format_output_notes(writer.notes)}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error During Thinning",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Thinned LiDAR File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["thinning"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
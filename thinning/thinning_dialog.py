@@ -0,0 +1,43 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+from .thinning_functions import MODES
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './thinning_form.ui'))
+
+# Label, minimum, maximum, step, decimals and default of the value of every mode
+MODE_VALUES = {
+    "voxel": ("Voxel Size (units):", 0.01, 100.0, 0.1, 2, 1.0),
+    "voxel_centroid": ("Voxel Size (units):", 0.01, 100.0, 0.1, 2, 1.0),
+    "nth": ("Keep One Point Every:", 2, 10000, 1, 0, 10),
+    "random": ("Fraction Kept:", 0.001, 1.0, 0.05, 3, 0.1),
+    "spacing": ("Minimum Spacing (units):", 0.01, 100.0, 0.1, 2, 1.0),
+}
+
+class ThinningDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.comboMode.currentIndexChanged.connect(self.update_value_field)
+        self.update_value_field()
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def update_value_field(self):
+        label, minimum, maximum, step, decimals, default = MODE_VALUES[MODES[self.comboMode.currentIndex()]]
+        self.labelValue.setText(label)
+        self.spinValue.setDecimals(decimals)
+        self.spinValue.setRange(minimum, maximum)
+        self.spinValue.setSingleStep(step)
+        self.spinValue.setValue(default)
+
+    def get_values(self):
+        mode = MODES[self.comboMode.currentIndex()]
+        value = self.spinValue.value()
+        if mode == "nth":
+            value = int(value)
+        return mode, value
@@ -0,0 +1,189 @@
+from collections import deque
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..las_io import iter_chunks, local_coords
+from ..duplicate_removal.duplicate_functions import DuplicateKeys, first_occurrence_mask
+
+# ----------------------------
+# --- Thinning (Processing) ---
+# ----------------------------
+
+MODES = ("voxel", "voxel_centroid", "nth", "random", "spacing")
+RECENT_POINTS = 2_000_000   # Kept points of the previous chunks checked by the minimum spacing mode
+
+class VoxelThinning:
+    """
+    One point per voxel of `size` (CRS units), the first one in file order.
+    Voxel keys are the packed integer coordinates of DuplicateKeys, the keys
+    of every voxel already holding a point are kept across chunks.
+    With `centroid`, a first pass averages the integer coordinates of every
+    voxel and the kept point is moved to the centroid, its other attributes
+    unchanged.
+    """
+
+    def __init__(self, header, size, centroid=False):
+        self.key_builder = DuplicateKeys(header, size)
+        self.centroid = centroid
+        self.needs_scan = centroid
+        self.seen = None
+        self.keys = None
+        self.sums = None
+        self.counts = None
+
+    def scan(self, points):
+        keys, inverse = np.unique(self.key_builder.keys(points), return_inverse=True)
+        sums = np.column_stack([
+            np.bincount(inverse, weights=points.array[dim], minlength=len(keys)) for dim in "XYZ"
+        ])
+        counts = np.bincount(inverse, minlength=len(keys))
+        if self.keys is not None:
+            # Merge with the voxels of the previous chunks
+            merged = np.concatenate((self.key_builder.normalize(self.keys), keys))
+            keys, inverse = np.unique(merged, return_inverse=True)
+            sums = np.column_stack([
+                np.bincount(inverse, weights=column, minlength=len(keys))
+                for column in np.vstack((self.sums, sums)).T
+            ])
+            counts = np.bincount(inverse, weights=np.concatenate((self.counts, counts)), minlength=len(keys))
+        self.keys, self.sums, self.counts = keys, sums, counts.astype(np.int64)
+
+    def select(self, points):
+        keys = self.key_builder.keys(points)
+        keep = first_occurrence_mask(keys)
+        if self.seen is not None:
+            self.seen = self.key_builder.normalize(self.seen)
+            keep[keep] = ~np.isin(keys[keep], self.seen, assume_unique=True)
+        self.seen = keys[keep] if self.seen is None else np.union1d(self.seen, keys[keep])
+
+        if self.centroid and np.any(keep):
+            pos = np.searchsorted(self.keys, keys[keep])
+            centroids = self.sums[pos] / self.counts[pos, None]
+            selected = np.flatnonzero(keep)
+            for i, dim in enumerate("XYZ"):
+                # Centroid of the raw integers, rounded back to the record resolution
+                points.array[dim][selected] = np.round(centroids[:, i])
+        return keep
+
+class NthThinning:
+    """Every `n`-th point of the file, counted across chunks."""
+
+    needs_scan = False
+
+    def __init__(self, n):
+        self.n = max(int(n), 1)
+        self.position = 0
+
+    def select(self, points):
+        keep = (self.position + np.arange(len(points))) % self.n == 0
+        self.position += len(points)
+        return keep
+
+class RandomThinning:
+    """A random `fraction` of the points, reproducible for a given seed."""
+
+    needs_scan = False
+
+    def __init__(self, fraction, seed=0):
+        self.fraction = fraction
+        self.rng = np.random.default_rng(seed)
+
+    def select(self, points):
+        return self.rng.random(len(points)) < self.fraction
+
+class SpacingThinning:
+    """
+    Points at least `spacing` apart in 3D, chosen greedily in file order: a
+    point is kept when no earlier kept point lies within the spacing.
+
+    Each chunk is thinned to one candidate per cell of spacing / sqrt(3) (two
+    points of a cell are always too close), candidates close to the recently
+    kept points of the previous chunks are dropped, and the remaining conflicts
+    are resolved in rounds: a candidate with no earlier undecided neighbor is
+    kept and its later neighbors dropped, the greedy choice over the candidates
+    in vectorized steps. Chunk edges only see the last `history` kept points,
+    which is enough for spatially sorted files.
+    """
+
+    needs_scan = False
+
+    def __init__(self, header, spacing, history=RECENT_POINTS):
+        self.spacing = spacing
+        self.cells = DuplicateKeys(header, spacing / np.sqrt(3))
+        self.history = history
+        self.recent = deque()
+        self.recent_size = 0
+        self.origin = None
+
+    def select(self, points):
+        keep = first_occurrence_mask(self.cells.keys(points))
+        candidates = np.flatnonzero(keep)
+        coords, self.origin = local_coords(points, "xyz", mask=keep, origin=self.origin)
+
+        if self.recent:
+            tree = cKDTree(np.concatenate(self.recent))
+            distances, _ = tree.query(coords, k=1, distance_upper_bound=self.spacing, workers=-1)
+            close = distances < self.spacing
+            keep[candidates[close]] = False
+            candidates, coords = candidates[~close], coords[~close]
+
+        accepted = _greedy_spacing(coords, self.spacing)
+        keep[candidates[~accepted]] = False
+
+        self.recent.append(coords[accepted])
+        self.recent_size += int(np.sum(accepted))
+        while self.recent_size > self.history and len(self.recent) > 1:
+            self.recent_size -= len(self.recent.popleft())
+        return keep
+
+def _greedy_spacing(coords, spacing):
+    # Points kept by a file-order greedy pass, resolved in parallel rounds over the conflict pairs
+    pairs = cKDTree(coords).query_pairs(spacing, output_type="ndarray")
+    if len(pairs):
+        pairs = pairs[np.linalg.norm(coords[pairs[:, 0]] - coords[pairs[:, 1]], axis=1) < spacing]
+    pairs = np.sort(pairs, axis=1)     # (earlier, later)
+
+    state = np.zeros(len(coords), dtype=np.int8)     # 0 undecided, 1 kept, -1 dropped
+    while len(pairs):
+        # An undecided point waiting for no earlier undecided neighbor is kept
+        blocked = np.zeros(len(coords), dtype=bool)
+        blocked[pairs[:, 1]] = True
+        accepted = (state == 0) & ~blocked
+        state[accepted] = 1
+        # Later neighbors of kept points are dropped
+        dropped = pairs[accepted[pairs[:, 0]], 1]
+        state[dropped] = -1
+        undecided = state == 0
+        pairs = pairs[undecided[pairs[:, 0]] & undecided[pairs[:, 1]]]
+    state[state == 0] = 1
+    return state == 1
+
+def make_thinning(mode, header, value, seed=0):
+    """Thinning strategy of `mode`: a voxel size, n, fraction or spacing depending on the mode."""
+    if mode == "voxel":
+        return VoxelThinning(header, value)
+    if mode == "voxel_centroid":
+        return VoxelThinning(header, value, centroid=True)
+    if mode == "nth":
+        return NthThinning(value)
+    if mode == "random":
+        return RandomThinning(value, seed)
+    if mode == "spacing":
+        return SpacingThinning(header, value)
+    raise ValueError(f"Unknown thinning mode: {mode}")
+
+def stream_thinning(path, writer, thinning, region=None, chunk_size=1_000_000):
+    """
+    Thin a file chunk by chunk into `writer`, with a first scan when the
+    strategy needs one. Returns the number of points read.
+    """
+    if thinning.needs_scan:
+        for points in iter_chunks(path, region, chunk_size):
+            thinning.scan(points)
+
+    num_points = 0
+    for points in iter_chunks(path, region, chunk_size):
+        num_points += len(points)
+        writer.write(points[thinning.select(points)])
+    return num_points
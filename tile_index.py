@@ -0,0 +1,223 @@
+import os
+from collections import OrderedDict
+
+import laspy
+from laspy import LazBackend
+import numpy as np
+
+from .las_io import is_derived_output
+from .memory_planner import tile_ids
+
+# ----------------------------------
+# --- Virtual Mosaic (Tile Index) ---
+# ----------------------------------
+
+LIDAR_EXTENSIONS = (".las", ".laz")
+CHUNK_SIZE = 1_000_000
+MAX_OPEN_WRITERS = 64   # Tile files kept open at once while splitting
+
+class TileInfo:
+    def __init__(self, path, header):
+        self.path = path
+        self.mins = np.asarray(header.mins, dtype=np.float64)
+        self.maxs = np.asarray(header.maxs, dtype=np.float64)
+        self.point_count = header.point_count
+        self.point_format_id = header.point_format.id
+        self.scales = np.asarray(header.scales, dtype=np.float64)
+        self.offsets = np.asarray(header.offsets, dtype=np.float64)
+
+    def contains_xy(self, x, y):
+        return (x >= self.mins[0]) & (x <= self.maxs[0]) & (y >= self.mins[1]) & (y <= self.maxs[1])
+
+class TileIndex:
+    """Virtual mosaic of adjacent tiles, built from the LAS headers only (no point decoding)."""
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        # 2D bounds of every tile, kept as arrays so box queries are a single vectorized comparison
+        self._mins = np.array([t.mins[:2] for t in tiles], dtype=np.float64).reshape(-1, 2)
+        self._maxs = np.array([t.maxs[:2] for t in tiles], dtype=np.float64).reshape(-1, 2)
+        self._by_path = {os.path.normcase(os.path.abspath(t.path)): i for i, t in enumerate(tiles)}
+
+    @classmethod
+    def from_files(cls, paths):
+        tiles = []
+        for path in paths:
+            with laspy.open(path) as reader:   # Only the header and VLRs are read
+                tiles.append(TileInfo(path, reader.header))
+        return cls(tiles)
+
+    @classmethod
+    def from_folder(cls, folder):
+        # Outputs saved beside the tiles hold copies of their points, they are not tiles of the mosaic
+        paths = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(LIDAR_EXTENSIONS) and not is_derived_output(name)
+        )
+        return cls.from_files(paths)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def tile_for(self, path):
+        return self.tiles[self._by_path[os.path.normcase(os.path.abspath(path))]]
+
+    def bounds(self):
+        if not self.tiles:
+            return None
+        return self._mins.min(axis=0), self._maxs.max(axis=0)
+
+    def query_bbox(self, xmin, ymin, xmax, ymax):
+        hits = (
+            (self._mins[:, 0] <= xmax) & (self._maxs[:, 0] >= xmin) &
+            (self._mins[:, 1] <= ymax) & (self._maxs[:, 1] >= ymin)
+        )
+        return [self.tiles[i] for i in np.flatnonzero(hits)]
+
+    def neighbors(self, tile, buffer):
+        xmin, ymin = tile.mins[:2] - buffer
+        xmax, ymax = tile.maxs[:2] + buffer
+        return [t for t in self.query_bbox(xmin, ymin, xmax, ymax) if t is not tile]
+
+    def read_buffer_points(self, path, buffer, classes=None):
+        """
+        Return the XYZ coordinates (n, 3) and classification of the points of
+        neighboring tiles lying within `buffer` of the tile's bounding box.
+        """
+        tile = self.tile_for(path)
+        xmin, ymin = tile.mins[:2] - buffer
+        xmax, ymax = tile.maxs[:2] + buffer
+
+        coords_parts = []
+        class_parts = []
+        for neighbor in self.neighbors(tile, buffer):
+            with laspy.open(neighbor.path, laz_backend=LazBackend.Lazrs) as reader:
+                for points in reader.chunk_iterator(CHUNK_SIZE):
+                    x, y = points.x, points.y
+                    keep = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+                    # Points inside the tile itself come from the tile, not from overlapping neighbors
+                    keep &= ~tile.contains_xy(x, y)
+                    if classes is not None:
+                        keep &= np.isin(points.classification, list(classes))
+                    if not np.any(keep):
+                        continue
+                    coords_parts.append(np.column_stack((x[keep], y[keep], points.z[keep])))
+                    class_parts.append(np.asarray(points.classification[keep], dtype=np.uint8))
+
+        if not coords_parts:
+            return np.empty((0, 3), dtype=np.float64), np.empty(0, dtype=np.uint8)
+        return np.concatenate(coords_parts), np.concatenate(class_parts)
+
+def load_adjacent_points(path, buffer, classes=None):
+    """
+    Index the folder containing `path` and read the buffer ring from its
+    neighboring tiles. The input itself is indexed even when it is an output
+    of another command.
+    """
+    index = TileIndex.from_folder(os.path.dirname(os.path.abspath(path)))
+    if not any(os.path.samefile(tile.path, path) for tile in index.tiles):
+        index = TileIndex(index.tiles + TileIndex.from_files([path]).tiles)
+    return index.read_buffer_points(path, buffer, classes=classes)
+
+def split_tile_path(folder, tile):
+    return os.path.join(folder, f"tile_{tile:04d}.las")
+
+class TileWriterPool:
+    """
+    Writers of many tile files with at most `max_open` of them open at once.
+    When another tile needs a file the least recently used writer is closed,
+    and it is reopened in append mode if more of its points arrive later, so
+    file handles and buffers stay bounded whatever the tile count. laspy
+    updates the bounds and point count of every header as points arrive.
+
+    Appending to LAZ is not reliable in laspy, so with `compress` the tiles
+    are staged as uncompressed LAS next to their final path and compressed
+    one at a time when the pool is closed.
+    """
+
+    def __init__(self, header, max_open=MAX_OPEN_WRITERS, compress=False):
+        self.header = header.copy()
+        self.header.point_count = 0
+        self.max_open = max(int(max_open), 1)
+        self.compress = compress
+        self.paths = {}                     # Final path of every tile written so far
+        self.counts = {}                    # Points written to every tile
+        self._staged = {}                   # Path the points of every tile are appended to
+        self._open = OrderedDict()          # tile -> writer, least recently used first
+
+    def write(self, tile, path, points):
+        if len(points) == 0:
+            return
+        writer = self._open.pop(tile, None)
+        if writer is None:
+            if len(self._open) >= self.max_open:
+                _, oldest = self._open.popitem(last=False)
+                oldest.close()
+            if tile in self._staged:
+                writer = laspy.open(self._staged[tile], mode="a")
+            else:
+                staged = path + ".part" if self.compress else path
+                writer = laspy.open(staged, mode="w", header=self.header, do_compress=False)
+                self.paths[tile] = path
+                self._staged[tile] = staged
+                self.counts[tile] = 0
+        self._open[tile] = writer
+        if hasattr(writer, "append_points"):   # Reopened tile
+            writer.append_points(points)
+        else:
+            writer.write_points(points)
+        self.counts[tile] += len(points)
+
+    def _close_writers(self):
+        while self._open:
+            _, writer = self._open.popitem(last=False)
+            writer.close()
+
+    def close(self):
+        self._close_writers()
+        if self.compress:
+            for tile, staged in self._staged.items():
+                _compress_las(staged, self.paths[tile])
+        self._staged = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_writers()
+            if self.compress:
+                for staged in self._staged.values():
+                    if os.path.exists(staged):
+                        os.remove(staged)
+
+def _compress_las(staged, path):
+    with laspy.open(staged) as reader:
+        header = reader.header.copy()
+        header.point_count = 0
+        with laspy.open(path, mode="w", header=header, do_compress=True, laz_backend=LazBackend.Lazrs) as writer:
+            for points in reader.chunk_iterator(CHUNK_SIZE):
+                writer.write_points(points)
+    os.remove(staged)
+
+def split_into_tiles(path, bounds, grid, folder, region=None, chunk_size=CHUNK_SIZE):
+    """
+    Spill the points of `path` into one uncompressed LAS per tile of a
+    (columns, rows) grid over `bounds`, in a single streaming pass.
+    Returns the paths of the tiles holding at least one point.
+    """
+    with laspy.open(path, laz_backend=LazBackend.Lazrs) as reader:
+        with TileWriterPool(reader.header) as pool:
+            for points in reader.chunk_iterator(chunk_size):
+                if region is not None:
+                    points = points[region.contains(points.x, points.y)]
+                ids = tile_ids(points.x, points.y, bounds, grid)
+                # One sort per chunk groups the points by tile without a mask per tile
+                order = np.argsort(ids, kind="stable")
+                tiles, starts = np.unique(ids[order], return_index=True)
+                ends = np.append(starts[1:], len(order))
+                for tile, start, end in zip(tiles, starts, ends):
+                    pool.write(tile, split_tile_path(folder, tile), points[order[start:end]])
+    return [pool.paths[tile] for tile in sorted(pool.paths)]
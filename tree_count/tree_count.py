@@ -0,0 +1,121 @@
+import os
+
+from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
+from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
+from PyQt5.QtCore import Qt
+
+import numpy as np
+
+from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import CHUNK_SIZE, header_wkt, read_header
+from ..memory_planner import TILED, plan_raster
+from ..processing_region.processing_region import region_for_file
+from ..raster_grid import RasterGrid
+from ..vector_io import write_point_layer
+from .tree_count_dialog import TreeCountDialog
+from .tree_functions import canopy_height_model, find_trees, search_buffer
+
+# ------------------
+# --- Tree Count ---
+# ------------------
+
+def count_trees(self):
+    filename, _ = QFileDialog.getOpenFileName(
+        self.iface.mainWindow(),
+        'Select Vegetation Classified LiDAR File',
+        '',
+        'LiDAR Files (*.las *.laz)'
+    )
+    if not filename:
+        return
+
+    dlg = TreeCountDialog(self.iface.mainWindow())
+    if dlg.exec_() != QDialog.Accepted:
+        return
+    cell_size, min_height, base_window, window_growth = dlg.get_values()
+
+    output_path, _ = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Tree Layer',
+        os.path.splitext(filename)[0] + '_trees.gpkg',
+        'GeoPackage (*.gpkg)'
+    )
+    if not output_path:
+        return
+    if not output_path.lower().endswith('.gpkg'):
+        output_path += '.gpkg'
+
+    loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Tree Count")
+    self.last_profiler = profiler
+
+    try:
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        loading_dialog.show()
+        QApplication.processEvents()
+
+        region = region_for_file(self, filename)
+        header = read_header(filename)
+        grid = RasterGrid.for_header(header, cell_size, region)
+
+        with profiler.stage("Canopy height model", points=header.point_count):
+            chm = canopy_height_model(filename, grid, region, CHUNK_SIZE)
+
+        if chm is None:
+            QMessageBox.warning(
+                self.iface.mainWindow(),
+                "No Canopy Found",
+                "The file needs ground (class 2) and high vegetation (class 5) points, "
+                "classify its vegetation first."
+            )
+            return
+
+        # Tiles overlap by the largest search window, so the tops and crowns on their edges are kept whole
+        buffer_cells = search_buffer(np.nanmax(chm), cell_size, base_window, window_growth)
+        plan = plan_raster(grid.shape, self.memory_budget, buffer_cells)
+        tiles = plan.grid if plan.strategy == TILED else None
+
+        with profiler.stage("Detect trees"):
+            x, y, heights, areas = find_trees(chm, grid, min_height, base_window, window_growth, tiles)
+
+        if len(x) == 0:
+            QMessageBox.information(
+                self.iface.mainWindow(),
+                "No Trees Found",
+                f"No tree taller than {min_height:g} m was found in this file."
+            )
+            return
+
+        with profiler.stage("Write tree layer"):
+            write_point_layer(output_path, "trees", x, y, {
+                "tree_id": np.arange(1, len(x) + 1),
+                "height": np.round(heights, 2),
+                "crown_area": np.round(areas, 2),
+                "crown_diameter": np.round(2 * np.sqrt(areas / np.pi), 2),
+            }, header_wkt(header))
+
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        self.iface.addVectorLayer(output_path, f"{stem} trees", "ogr")
+
+        QMessageBox.information(
+            self.iface.mainWindow(),
+            "Tree Detection Complete",
+            f"Trees detected: {len(x):,}\n"
+            f"Height: {np.median(heights):.1f} m median, {heights.max():.1f} m max\n"
+            f"Crown area: {np.median(areas):.1f} m² median\n\n"
+            f"Tree layer saved to:\n{output_path}\n\n"
+            f"{plan.describe('Canopy grid')}"
+        )
+
+    except Exception as e:
+        QMessageBox.critical(
+            self.iface.mainWindow(),
+            "Error Detecting Trees",
+            f"An error occurred:\n{e}"
+        )
+
+    finally:
+        loading_dialog.close()
+        QApplication.restoreOverrideCursor()
+        profiler.log_summary()
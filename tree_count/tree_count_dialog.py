@@ -0,0 +1,22 @@
+from PyQt5.QtWidgets import QDialog
+from PyQt5 import uic
+import os
+
+FORM_CLASS, _ = uic.loadUiType(os.path.join(
+    os.path.dirname(__file__), './tree_count_form.ui'))
+
+class TreeCountDialog(QDialog, FORM_CLASS):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+    def get_values(self):
+        return (
+            self.spinCellSize.value(),
+            self.spinMinHeight.value(),
+            self.spinBaseWindow.value(),
+            self.spinWindowGrowth.value(),
+        )
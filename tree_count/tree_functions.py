@@ -0,0 +1,213 @@
+import numpy as np
+from scipy import ndimage
+
+from ..las_io import iter_chunks, scaled_axis
+from ..raster_grid import cell_maximum, cell_minimum, fill_nearest
+from ..vegetation_classification.vegetation_functions import GROUND_CLASS, HIGH_VEGETATION_CLASS
+
+# -------------------------------
+# --- Tree Count (Processing) ---
+# -------------------------------
+
+CROWN_HEIGHT_RATIO = 0.5    # Crown cells are at least this fraction of their tree height
+# 8-connected neighbor offsets, the last four are the forward half used to list each touching pair once
+NEIGHBORS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+def canopy_height_model(path, grid, region=None, chunk_size=1_000_000):
+    """
+    Height of the highest high vegetation point (class 5) of every cell above
+    the lowest ground point (class 2), whose gaps are filled from the nearest
+    ground cell. Cells without high vegetation are NaN.
+    Returns a float32 grid, None when the file has no ground or no high vegetation.
+    """
+    ground = np.full(grid.shape, np.nan)
+    canopy = np.full(grid.shape, np.nan)
+    for points in iter_chunks(path, region, chunk_size):
+        for values, selected, reduce in (
+            (ground, points.classification == GROUND_CLASS, cell_minimum),
+            (canopy, points.classification == HIGH_VEGETATION_CLASS, cell_maximum),
+        ):
+            if np.any(selected):
+                x, y, z = (scaled_axis(points, axis, mask=selected) for axis in "xyz")
+                reduce(values.ravel(), grid.cells(x, y), z)
+    if np.all(np.isnan(ground)) or np.all(np.isnan(canopy)):
+        return None
+    return np.maximum(canopy - fill_nearest(ground), 0.0).astype(np.float32)
+
+def window_cells(height, cell_size, base_window, window_growth):
+    """Odd side, in cells, of the tree top search window of each height: `base_window` + `window_growth` per meter."""
+    diameter = base_window + window_growth * np.nan_to_num(height)
+    return 2 * np.floor(diameter / (2 * cell_size)).astype(np.int64) + 1
+
+def disk(size):
+    radius = size // 2
+    rows, cols = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    return rows ** 2 + cols ** 2 <= radius ** 2
+
+def tree_tops(chm, min_height, cell_size, base_window, window_growth):
+    """
+    Labels of the tree tops: cells of at least `min_height` that are the highest
+    of the circular window their own height calls for. One maximum filter runs
+    per window size in use instead of one window per cell. Touching top cells
+    (flat tops) form a single tree. Returns the label grid and the tree count.
+    """
+    canopy = np.nan_to_num(chm, nan=0.0)
+    sizes = window_cells(canopy, cell_size, base_window, window_growth)
+    candidates = canopy >= min_height
+    is_top = np.zeros(chm.shape, dtype=bool)
+    for size in np.unique(sizes[candidates]):
+        selected = candidates & (sizes == size)
+        window_max = ndimage.maximum_filter(canopy, footprint=disk(size), mode="constant", cval=0.0)
+        is_top[selected] = canopy[selected] >= window_max[selected]
+    return ndimage.label(is_top, structure=np.ones((3, 3)))
+
+def shifted(values, d_row, d_col, fill):
+    # values[row + d_row, col + d_col] at every (row, col), `fill` beyond the grid edges
+    rows, cols = values.shape
+    result = np.full_like(values, fill)
+    result[max(-d_row, 0):rows - max(d_row, 0), max(-d_col, 0):cols - max(d_col, 0)] = (
+        values[max(d_row, 0):rows - max(-d_row, 0), max(d_col, 0):cols - max(-d_col, 0)]
+    )
+    return result
+
+def drainage_roots(canopy, valid):
+    """
+    Cell every valid cell drains to when it keeps stepping to its highest
+    valid neighbor, and the rank of every cell in the (height, row, column)
+    order, -1 for invalid cells. Ties only depend on the relative position
+    of the cells, so overlapping windows drain their shared cells alike.
+    """
+    order = np.lexsort((np.arange(canopy.size), canopy.ravel()))
+    rank = np.empty(canopy.size, dtype=np.int64)
+    rank[order] = np.arange(canopy.size)
+    rank = np.where(valid, rank.reshape(canopy.shape), -1)
+
+    index = np.arange(canopy.size).reshape(canopy.shape)
+    parent = index.copy()
+    best = rank.copy()
+    for d_row, d_col in NEIGHBORS:
+        neighbor = shifted(rank, d_row, d_col, -1)
+        higher = valid & (neighbor > best)
+        best = np.where(higher, neighbor, best)
+        parent = np.where(higher, index + d_row * canopy.shape[1] + d_col, parent)
+
+    # Pointer jumping: every cell reaches its root in a logarithmic number of steps
+    parent = parent.ravel()
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent.reshape(canopy.shape), rank
+        parent = grandparent
+
+def basin_passes(roots, rank, valid):
+    """
+    Pairs of neighboring drainage basins (root cells) and the highest pass
+    between them: the rank of the lower cell of their highest touching pair.
+    """
+    firsts, seconds, passes = [], [], []
+    for d_row, d_col in NEIGHBORS[4:]:
+        neighbor_root = shifted(roots, d_row, d_col, -1)
+        touching = valid & shifted(valid, d_row, d_col, False) & (neighbor_root != roots)
+        firsts.append(roots[touching])
+        seconds.append(neighbor_root[touching])
+        passes.append(np.minimum(rank, shifted(rank, d_row, d_col, -1))[touching])
+    firsts, seconds, passes = (np.concatenate(values) for values in (firsts, seconds, passes))
+    low, high = np.minimum(firsts, seconds), np.maximum(firsts, seconds)
+    # Highest pass first, one edge per pair of basins
+    order = np.lexsort((-passes, high, low))
+    low_sorted, high_sorted = low[order], high[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (low_sorted[1:] != low_sorted[:-1]) | (high_sorted[1:] != high_sorted[:-1])
+    edges = order[first]
+    edges = edges[np.argsort(-passes[edges], kind="stable")]
+    return low[edges], high[edges]
+
+def tree_crowns(chm, tops, heights, min_height):
+    """
+    Watershed of the canopy from the tree tops. Every canopy cell drains to
+    a local maximum through its highest neighbors, and the basins of the
+    maxima that are not tree tops join a tree over their highest pass, as a
+    flood from the tops would. The result does not depend on the processing
+    order, so tiles and whole grids agree. Cells under `min_height` are
+    background, cells under CROWN_HEIGHT_RATIO of their tree height are left
+    out of its crown. `heights` are the tree heights in label order.
+    Returns the crown labels (0 outside the crowns).
+    """
+    canopy = np.nan_to_num(chm, nan=0.0)
+    valid = canopy >= min_height
+    roots, rank = drainage_roots(canopy, valid)
+
+    basins, basin_index = np.unique(roots[valid], return_inverse=True)
+    trees = tops.ravel()[basins].tolist()
+    parent = list(range(len(basins)))
+
+    def find(basin):
+        while parent[basin] != basin:
+            parent[basin] = parent[parent[basin]]
+            basin = parent[basin]
+        return basin
+
+    # Kruskal merge from the highest pass down, two different trees are never merged
+    for a, b in zip(*(np.searchsorted(basins, ends).tolist() for ends in basin_passes(roots, rank, valid))):
+        a, b = find(a), find(b)
+        if a == b or (trees[a] and trees[b] and trees[a] != trees[b]):
+            continue
+        parent[b] = a
+        trees[a] = trees[a] or trees[b]
+
+    basin_trees = np.array([trees[find(basin)] for basin in range(len(basins))], dtype=np.int64)
+    crowns = np.zeros(canopy.shape, dtype=np.int64)
+    crowns[valid] = basin_trees[basin_index]
+    crowns[canopy < CROWN_HEIGHT_RATIO * np.r_[0.0, heights][crowns]] = 0
+    return crowns
+
+def detect_trees(chm, min_height, cell_size, base_window, window_growth):
+    """
+    Tree tops and crowns of a canopy height model. Returns the tree top
+    (row, col) positions, which may fall between cells for flat tops, and the
+    tree heights and crown areas, in label order.
+    """
+    tops, num_trees = tree_tops(chm, min_height, cell_size, base_window, window_growth)
+    if num_trees == 0:
+        return np.empty((0, 2)), np.empty(0), np.empty(0)
+    index = np.arange(1, num_trees + 1)
+    positions = np.asarray(ndimage.center_of_mass(np.ones(chm.shape), tops, index), dtype=np.float64)
+    heights = np.asarray(ndimage.maximum(np.nan_to_num(chm, nan=0.0), tops, index), dtype=np.float64)
+    crowns = tree_crowns(chm, tops, heights, min_height)
+    areas = np.bincount(crowns.ravel(), minlength=num_trees + 1)[1:] * cell_size ** 2
+    return positions.reshape(-1, 2), heights, areas.astype(np.float64)
+
+def search_buffer(max_height, cell_size, base_window, window_growth):
+    # Cells around a tile so its tops see their whole search window and their crowns fit in the buffer
+    return int(window_cells(max_height, cell_size, base_window, window_growth)) + 1
+
+def find_trees(chm, grid, min_height, base_window, window_growth, tiles=None):
+    """
+    Trees of the whole grid, detected at once or over a (columns, rows) tiling
+    whose tiles overlap by the largest crown. Every tree belongs to the tile
+    holding its top, so trees on the tile edges are counted once.
+    Returns the tree top x and y, heights and crown areas.
+    """
+    cell_size = grid.cell_size
+    if tiles is None:
+        whole = (slice(0, grid.rows), slice(0, grid.cols))
+        windows = [(whole, whole, whole)]
+    else:
+        buffer_cells = search_buffer(np.nanmax(chm), cell_size, base_window, window_growth)
+        windows = grid.windows(tiles, buffer_cells)
+
+    parts = []
+    for core, buffered, core_in_buffered in windows:
+        positions, heights, areas = detect_trees(chm[buffered], min_height, cell_size, base_window, window_growth)
+        rows = positions[:, 0] + buffered[0].start
+        cols = positions[:, 1] + buffered[1].start
+        in_core = (
+            (rows >= core[0].start - 0.5) & (rows < core[0].stop - 0.5)
+            & (cols >= core[1].start - 0.5) & (cols < core[1].stop - 0.5)
+        )
+        parts.append((rows[in_core], cols[in_core], heights[in_core], areas[in_core]))
+
+    rows, cols, heights, areas = (np.concatenate(values) for values in zip(*parts))
+    x = grid.xmin + (cols + 0.5) * cell_size
+    y = grid.ymax - (rows + 0.5) * cell_size
+    return x, y, heights, areas
@@ -3,6 +3,8 @@ from PyQt5.QtWidgets import QDialog, QLabel, QVBoxLayout, QApplication
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
+from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+
 from io import BytesIO
 from matplotlib import pyplot as plt
 import numpy as np
@@ -101,6 +103,20 @@ def generate_return_bar_chart(unique_returns, return_counts):
     buf.seek(0)
     return buf
 
+def generate_histogram_chart(edges, counts, xlabel, color='steelblue'):
+    fig, ax = plt.subplots(figsize=(6, 3.5))
+    widths = np.diff(edges)
+    ax.bar(edges[:-1], counts, width=widths, align='edge', color=color, edgecolor='white', linewidth=0.5)
+    ax.set_xlabel(xlabel, fontname='Arial')
+    ax.set_ylabel("Count", fontname='Arial')
+    ax.set_xlim(edges[0], edges[-1])
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    buf.seek(0)
+    return buf
+
 # --- Dialog creation for loading LiDAR files ---
 
 def create_loading_dialog(self):
@@ -129,3 +145,17 @@ def create_loading_dialog(self):
     loading_dialog.setLayout(layout)
     loading_dialog.setFixedSize(300, 100)
     return loading_dialog
+
+# --- Map canvas helpers ---
+
+def canvas_extent_bounds(self, wkt=None):
+    """Current map canvas extent as (xmin, ymin, xmax, ymax) in the CRS given by `wkt`."""
+    canvas = self.iface.mapCanvas()
+    extent = canvas.extent()
+    canvas_crs = canvas.mapSettings().destinationCrs()
+    if wkt:
+        data_crs = QgsCoordinateReferenceSystem.fromWkt(wkt)
+        if data_crs.isValid() and data_crs != canvas_crs:
+            transform = QgsCoordinateTransform(canvas_crs, data_crs, QgsProject.instance())
+            extent = transform.transformBoundingBox(extent)
+    return extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum()
@@ -0,0 +1,44 @@
+import numpy as np
+from osgeo import ogr, osr
+
+# -------------------------
+# --- GeoPackage Output ---
+# -------------------------
+
+OGR_TYPES = {"i": ogr.OFTInteger64, "u": ogr.OFTInteger64, "f": ogr.OFTReal}
+
+def write_point_layer(path, layer_name, x, y, fields, wkt=None):
+    """
+    Write one point per (x, y) to a new GeoPackage with an attribute per
+    `fields` entry (name: numeric array of the same length). The layer is
+    left without CRS when the point cloud has none.
+    """
+    driver = ogr.GetDriverByName("GPKG")
+    if driver.Open(path) is not None:
+        driver.DeleteDataSource(path)
+    dataset = driver.CreateDataSource(path)
+    if dataset is None:
+        raise IOError(f"Could not create the layer {path}.")
+    srs = None
+    if wkt:
+        srs = osr.SpatialReference()
+        srs.ImportFromWkt(wkt)
+    layer = dataset.CreateLayer(layer_name, srs, ogr.wkbPoint)
+    for name, values in fields.items():
+        layer.CreateField(ogr.FieldDefn(name, OGR_TYPES[np.asarray(values).dtype.kind]))
+
+    # A single transaction, GeoPackage commits per feature otherwise
+    layer.StartTransaction()
+    definition = layer.GetLayerDefn()
+    columns = [(name, np.asarray(values).tolist()) for name, values in fields.items()]
+    for i, (px, py) in enumerate(zip(np.asarray(x).tolist(), np.asarray(y).tolist())):
+        feature = ogr.Feature(definition)
+        point = ogr.Geometry(ogr.wkbPoint)
+        point.AddPoint_2D(px, py)
+        feature.SetGeometry(point)
+        for name, values in columns:
+            feature.SetField(name, values[i])
+        layer.CreateFeature(feature)
+    layer.CommitTransaction()
+    dataset = None      # Closing the dataset flushes it to disk
+    return path
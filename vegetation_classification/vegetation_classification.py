@@ -4,13 +4,23 @@ from qgis.PyQt.QtWidgets import QFileDialog, QMessageBox, QDialog
 from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtCore import Qt
 
-import laspy
-from laspy import LazBackend
 import numpy as np
-from scipy.spatial import cKDTree
 
 from ..utils import create_loading_dialog
+from ..profiling import StageProfiler
+from ..las_io import (
+    OUTPUT_FILTER, OUTPUT_SUFFIXES, PointStreamWriter, format_output_notes, local_coords, read_header, read_las,
+    resolve_output_path, scaled_axis, write_las
+)
+from ..memory_planner import IN_MEMORY, plan_execution
+from ..processing_region.processing_region import region_for_file
+from ..tile_index import load_adjacent_points
 from .vegetation_classification_dialog import VegetationClassificationDialog
+from .vegetation_functions import (
+    GROUND_CLASS, HIGH_VEGETATION_CLASS, LOW_VEGETATION_CLASS, MEDIUM_VEGETATION_CLASS,
+    build_ground_tree, height_above_ground, scan_ground_points, stream_vegetation_classification,
+    vegetation_classes
+)
 
 # ---------------------------------
 # --- Vegetation Classification ---
@@ -26,38 +36,67 @@ def classify_vegetation(self):
     if not filename:
         return
 
+    # Ask user for thresholds
+    dlg = VegetationClassificationDialog(self.iface.mainWindow())
+    if dlg.exec_() != QDialog.Accepted:
+        return
+    low_thresh, high_thresh = dlg.get_values()
+    tile_buffer = dlg.get_tile_buffer()
+
     loading_dialog = create_loading_dialog(self)
+    profiler = StageProfiler("Vegetation Classification")
+    self.last_profiler = profiler
 
     try:
         QApplication.setOverrideCursor(Qt.WaitCursor)
         loading_dialog.show()
         QApplication.processEvents()
 
-        las = laspy.read(filename, laz_backend=LazBackend.Lazrs)
-
-        # Standard ASPRS classes
-        ground_class = 2
-        low_class = 3
-        medium_class = 4
-        high_class = 5
-        classifications = las.classification
-
-        # Ground points
-        ground_idx = np.where(classifications == ground_class)[0]
-        if len(ground_idx) == 0:
+        region = region_for_file(self, filename)
+        plan = plan_execution(read_header(filename), "vegetation", self.memory_budget)
+        chunked = plan.strategy != IN_MEMORY
+
+        if chunked:
+            # Too large for the memory budget: only the ground is kept, the rest is streamed twice
+            with profiler.stage("Scan ground points") as stage:
+                ground_xy, ground_z, origin, num_high_veg = scan_ground_points(filename, region, plan.chunk_size)
+                stage.points = len(ground_xy)
+        else:
+            with profiler.stage("Read LAS/LAZ") as stage:
+                las = read_las(filename, region)
+                stage.points = len(las.points)
+
+            classifications = las.classification
+
+            # Ground points, local XY and absolute Z scaled from the selected integers only
+            is_ground = classifications == GROUND_CLASS
+            ground_xy, origin = local_coords(las, "xy", mask=is_ground)
+            ground_z = scaled_axis(las, "z", mask=is_ground)
+
+            # Tree points originally marked as high vegetation
+            is_high_veg = classifications == HIGH_VEGETATION_CLASS
+            num_high_veg = int(np.count_nonzero(is_high_veg))
+
+        if tile_buffer is not None:
+            # Ground points of neighboring tiles, so edge vegetation is measured against its closest ground
+            with profiler.stage("Read adjacent tiles") as stage:
+                buffer_coords, _ = load_adjacent_points(filename, tile_buffer, classes={GROUND_CLASS})
+                stage.points = len(buffer_coords)
+            ground_xy = np.vstack((ground_xy, buffer_coords[:, :2] - origin))
+            ground_z = np.concatenate((ground_z, buffer_coords[:, 2]))
+
+        # Checked after the merge: a tile without ground can use the ground of its neighbors
+        if len(ground_xy) == 0:
             QMessageBox.warning(
                 self.iface.mainWindow(),
                 "No Ground Points",
-                "No ground points (class 2) found in the file. Cannot calculate vegetation height."
+                "No ground points (class 2) found in the file or its adjacent tiles. "
+                "Cannot calculate vegetation height.\n"
+                "Run 'Classify ground' on raw data first."
             )
             return
 
-        ground_xy = np.vstack((las.x[ground_idx], las.y[ground_idx])).T
-        ground_z = las.z[ground_idx]
-
-        # Tree points originally marked as high vegetation
-        high_veg_idx = np.where(classifications == high_class)[0]
-        if len(high_veg_idx) == 0:
+        if num_high_veg == 0:
             QMessageBox.information(
                 self.iface.mainWindow(),
                 "No High Vegetation Points",
@@ -65,52 +104,57 @@ def classify_vegetation(self):
             )
             return
 
-        veg_xy = np.vstack((las.x[high_veg_idx], las.y[high_veg_idx])).T
-        veg_z = las.z[high_veg_idx]
-
         # Interpolate local ground height using nearest neighbor
-        tree = cKDTree(ground_xy)
-        dist, nearest_ground_idx = tree.query(veg_xy, k=1)
-        local_ground_z = ground_z[nearest_ground_idx]
-
-        # Vegetation height above ground
-        veg_height = veg_z - local_ground_z
-
-        # Ask user for thresholds
-        dlg = VegetationClassificationDialog(self.iface.mainWindow())
-        if dlg.exec_() != QDialog.Accepted:
-            return
-        low_thresh, high_thresh = dlg.get_values()
-
-
-        low_mask = veg_height < low_thresh
-        medium_mask = (veg_height >= low_thresh) & (veg_height <= high_thresh)
-        high_mask = veg_height > high_thresh
-
-        # Reclassify vegetation
-        las.classification[high_veg_idx[low_mask]] = low_class
-        las.classification[high_veg_idx[medium_mask]] = medium_class
-        las.classification[high_veg_idx[high_mask]] = high_class
-
-        output_path, _ = QFileDialog.getSaveFileName(
-            self.iface.mainWindow(),
-            'Save Reclassified Vegetation File',
-            os.path.splitext(filename)[0] + '_classified_vegetation.laz',
-            'LiDAR Files (*.las *.laz)'
-        )
-        if not output_path:
-            return
-
-        las.write(output_path)
+        with profiler.stage("Build KD-tree", points=len(ground_xy)):
+            tree = build_ground_tree(ground_xy)
+
+        if chunked:
+            loading_dialog.hide()
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+            loading_dialog.show()
+            QApplication.processEvents()
+
+            with profiler.stage("Chunked classification") as stage:
+                with PointStreamWriter(output_path, read_header(filename), self.output_options) as writer:
+                    _, num_low, num_medium, num_high = stream_vegetation_classification(
+                        filename, writer, tree, ground_z, origin, low_thresh, high_thresh, region, plan.chunk_size
+                    )
+                stage.points = writer.points_written
+            output_notes = writer.notes
+        else:
+            veg_xy, _ = local_coords(las, "xy", mask=is_high_veg, origin=origin)
+            veg_z = scaled_axis(las, "z", mask=is_high_veg)
+
+            with profiler.stage("Query ground height", points=num_high_veg):
+                # Vegetation height above ground
+                veg_height = height_above_ground(tree, ground_z, veg_xy, veg_z)
+
+            # Reclassify vegetation
+            new_classes = vegetation_classes(veg_height, low_thresh, high_thresh)
+            las.classification[is_high_veg] = new_classes
+            num_low = np.sum(new_classes == LOW_VEGETATION_CLASS)
+            num_medium = np.sum(new_classes == MEDIUM_VEGETATION_CLASS)
+            num_high = np.sum(new_classes == HIGH_VEGETATION_CLASS)
+
+            output_path = _ask_output_path(self, filename)
+            if not output_path:
+                return
+
+            with profiler.stage("Write output", points=len(las.points)):
+                output_notes = write_las(las, output_path, self.output_options)
 
         QMessageBox.information(
             self.iface.mainWindow(),
             "Vegetation Reclassification Complete",
-            f"Original high veg points: {len(high_veg_idx):,}\n"
-            f"Low vegetation (<{low_thresh} m): {np.sum(low_mask):,}\n"
-            f"Medium vegetation ({low_thresh}-{high_thresh} m): {np.sum(medium_mask):,}\n"
-            f"High vegetation (>{high_thresh} m): {np.sum(high_mask):,}\n\n"
-            f"Updated file saved to:\n{output_path}"
+            f"Original high veg points: {num_high_veg:,}\n"
+            f"Low vegetation (<{low_thresh} m): {num_low:,}\n"
+            f"Medium vegetation ({low_thresh}-{high_thresh} m): {num_medium:,}\n"
+            f"High vegetation (>{high_thresh} m): {num_high:,}\n\n"
+            f"Updated file saved to:\n{output_path}\n\n"
+            f"{plan.describe()}"
+            f"{format_output_notes(output_notes)}"
         )
 
     except Exception as e:
@@ -123,3 +167,15 @@ def classify_vegetation(self):
     finally:
         loading_dialog.close()
         QApplication.restoreOverrideCursor()
+        profiler.log_summary()
+
+def _ask_output_path(self, filename):
+    output_path, selected_filter = QFileDialog.getSaveFileName(
+        self.iface.mainWindow(),
+        'Save Reclassified Vegetation File',
+        os.path.splitext(filename)[0] + OUTPUT_SUFFIXES["vegetation"] + '.laz',
+        OUTPUT_FILTER
+    )
+    if not output_path:
+        return None
+    return resolve_output_path(output_path, selected_filter)
@@ -12,8 +12,15 @@ class VegetationClassificationDialog(QDialog, FORM_CLASS):
 
         self.buttonBox.accepted.connect(self.accept)
         self.buttonBox.rejected.connect(self.reject)
+        self.checkAdjacentTiles.toggled.connect(self.spinBuffer.setEnabled)
 
     def get_values(self):
         low_thresh = self.spinLow.value()
         high_thresh = self.spinHigh.value()
         return low_thresh, high_thresh
+
+    def get_tile_buffer(self):
+        # None when adjacent tiles should not be read
+        if not self.checkAdjacentTiles.isChecked():
+            return None
+        return self.spinBuffer.value()
@@ -0,0 +1,71 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ..las_io import iter_chunks, local_coords, scaled_axis
+
+# ---------------------------------------------
+# --- Vegetation Classification (Processing) ---
+# ---------------------------------------------
+
+# Standard ASPRS classes
+GROUND_CLASS = 2
+LOW_VEGETATION_CLASS = 3
+MEDIUM_VEGETATION_CLASS = 4
+HIGH_VEGETATION_CLASS = 5
+
+def build_ground_tree(ground_xy):
+    return cKDTree(ground_xy)
+
+def height_above_ground(ground_tree, ground_z, veg_xy, veg_z):
+    # Local ground height is taken from the nearest ground point
+    _, nearest_ground_idx = ground_tree.query(veg_xy, k=1)
+    return veg_z - ground_z[nearest_ground_idx]
+
+def vegetation_classes(veg_height, low_thresh, high_thresh):
+    classes = np.full(len(veg_height), MEDIUM_VEGETATION_CLASS, dtype=np.uint8)
+    classes[veg_height < low_thresh] = LOW_VEGETATION_CLASS
+    classes[veg_height > high_thresh] = HIGH_VEGETATION_CLASS
+    return classes
+
+# --- Chunked execution ---
+
+def scan_ground_points(path, region=None, chunk_size=1_000_000):
+    """
+    First pass of the chunked classification: local ground XY, absolute ground Z,
+    the XY origin and the number of high vegetation points. The other points are
+    never held in memory.
+    """
+    xy_parts = []
+    z_parts = []
+    origin = None
+    num_high_veg = 0
+    for points in iter_chunks(path, region, chunk_size):
+        ground = points.classification == GROUND_CLASS
+        if np.any(ground):
+            ground_xy, origin = local_coords(points, "xy", mask=ground, origin=origin)
+            xy_parts.append(ground_xy)
+            z_parts.append(scaled_axis(points, "z", mask=ground))
+        num_high_veg += int(np.count_nonzero(points.classification == HIGH_VEGETATION_CLASS))
+    if not xy_parts:
+        return np.empty((0, 2), dtype=np.float64), np.empty(0, dtype=np.float64), np.zeros(2), num_high_veg
+    return np.concatenate(xy_parts), np.concatenate(z_parts), origin, num_high_veg
+
+def stream_vegetation_classification(path, writer, ground_tree, ground_z, origin, low_thresh, high_thresh,
+                                     region=None, chunk_size=1_000_000):
+    """
+    Reclassify the high vegetation points chunk by chunk against the ground
+    index (local XY around `origin`) and stream every point to `writer`.
+    Returns the number of original high vegetation points and the counts of
+    the low, medium and high classes.
+    """
+    counts = np.zeros(3, dtype=np.int64)
+    for points in iter_chunks(path, region, chunk_size):
+        high_veg = points.classification == HIGH_VEGETATION_CLASS
+        if np.any(high_veg):
+            veg_xy, _ = local_coords(points, "xy", mask=high_veg, origin=origin)
+            veg_height = height_above_ground(ground_tree, ground_z, veg_xy, scaled_axis(points, "z", mask=high_veg))
+            new_classes = vegetation_classes(veg_height, low_thresh, high_thresh)
+            points.classification[high_veg] = new_classes
+            counts += np.bincount(new_classes - LOW_VEGETATION_CLASS, minlength=3)
+        writer.write(points)
+    return int(counts.sum()), int(counts[0]), int(counts[1]), int(counts[2])